@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Tasks per benchmark run; CI uses the default, HARNESS_BENCH_TASKS=1000 gives a quick local check.
+BENCH_TASKS = int(os.environ.get("HARNESS_BENCH_TASKS", "10000"))
+
+_results: dict[str, dict[str, Any]] = {}
+
+
+def write_pack(path: Path, count: int) -> Path:
+    tasks = [
+        {"id": f"t{n}", "type": "exact_match", "prompt": f"Reply with exactly: {n}", "expected": str(n)}
+        for n in range(count)
+    ]
+    path.write_text(json.dumps({"name": "bench", "tasks": tasks}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def mock_server(tmp_path: Path) -> Iterator[Any]:
+    """Start ``harness mock-server`` in its own process (so it does not share the harness's GIL); yields a starter."""
+    procs = []
+
+    def start(pack: Path, *options: str) -> str:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "harness", "mock-server", "--port", "0", "--pack", str(pack), *options],
+            stdout=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+        )
+        procs.append(proc)
+        return proc.stdout.readline().split(" at ")[1].split()[0]
+
+    yield start
+    for proc in procs:
+        proc.terminate()
+        proc.wait()
+
+
+@pytest.fixture
+def record() -> Any:
+    def add(name: str, **metrics: Any) -> None:
+        _results[name] = metrics
+
+    return add
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if not _results:
+        return
+    terminalreporter.section("harness benchmarks")
+    for name, metrics in _results.items():
+        terminalreporter.write_line(f"{name}: " + ", ".join(f"{key}={value}" for key, value in metrics.items()))
+    out = os.environ.get("HARNESS_BENCH_JSON")
+    if out:
+        Path(out).write_text(json.dumps(_results, indent=2), encoding="utf-8")
+        terminalreporter.write_line(f"Wrote: {out}")
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import json
+import resource
+import time
+import urllib.request
+
+from conftest import BENCH_TASKS, write_pack
+
+from harness import cli
+from harness.metrics import percentile
+
+RUN_ID = "20260418-210101"
+
+
+def _run(tmp_path, monkeypatch, pack, base_url, *options):
+    runs_dir = tmp_path / "runs"
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: RUN_ID)
+    args = cli.build_parser().parse_args(
+        ["run", "--pack", str(pack), "--base-url", base_url, "--no-cache", "--report-details", "failures", *options]
+    )
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.cmd_run(args)
+    elapsed = time.perf_counter() - started
+    return json.loads((runs_dir / f"run_{RUN_ID}.json").read_text(encoding="utf-8")), elapsed
+
+
+def _server_stats(base_url):
+    with urllib.request.urlopen(base_url.removesuffix("/v1") + "/stats", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def test_run_throughput_and_memory(tmp_path, monkeypatch, mock_server, record):
+    pack = write_pack(tmp_path / "pack.json", BENCH_TASKS)
+    base_url = mock_server(pack)
+    cli.OpenAI(base_url=base_url, api_key="bench")  # import the SDK before measuring memory
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    run, elapsed = _run(tmp_path, monkeypatch, pack, base_url, "--concurrency", "16")
+
+    growth_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    per_10k_mib = growth_kib / 1024 * 10_000 / BENCH_TASKS
+    record(
+        "run_throughput",
+        tasks=BENCH_TASKS,
+        tasks_per_s=round(BENCH_TASKS / elapsed, 1),
+        overhead_ms_per_task=round(elapsed / BENCH_TASKS * 1000, 3),
+        peak_rss_growth_mib_per_10k_tasks=round(per_10k_mib, 1),
+    )
+    assert run["summary"]["passed"] == BENCH_TASKS
+    assert per_10k_mib < 256
+
+
+def test_scheduler_keeps_requests_in_flight_and_in_pack_order(tmp_path, monkeypatch, mock_server, record):
+    count = max(200, BENCH_TASKS // 10)
+    concurrency = 8
+    pack = write_pack(tmp_path / "pack.json", count)
+    base_url = mock_server(pack, "--latency", "lognormal:0.02,0.5", "--tokens-per-s", "2000")
+
+    run, elapsed = _run(tmp_path, monkeypatch, pack, base_url, "--concurrency", str(concurrency))
+    stats = _server_stats(base_url)
+
+    # How far behind its pack position each task finished: the journal is in completion order.
+    lines = (tmp_path / "runs" / f"run_{RUN_ID}.jsonl").read_text(encoding="utf-8").splitlines()
+    indexes = [json.loads(line)["index"] for line in lines if '"result"' in line]
+    lags = sorted(max(0, position - index) for position, index in enumerate(indexes))
+    record(
+        "scheduler",
+        tasks=count,
+        concurrency=concurrency,
+        occupancy=round(stats["in_flight_s"] / (elapsed * concurrency), 3),
+        peak_in_flight=stats["peak_in_flight"],
+        lag_p99=round(percentile(lags, 99), 1),
+        lag_max=lags[-1],
+    )
+    assert run["summary"]["passed"] == count
+    assert stats["peak_in_flight"] <= concurrency
+    assert lags[-1] <= 16 * concurrency
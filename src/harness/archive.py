@@ -0,0 +1,225 @@
+import gzip
+import hashlib
+import json
+import math
+import mmap
+import shutil
+import sqlite3
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterator
+
+from harness.journal import dump_run
+
+ARCHIVE_DIRNAME = "archive"
+BLOBS_FILENAME = "blobs.sqlite"
+FORMAT_VERSION = 1
+
+# Fixed-width per-task columns: name -> array typecode. Missing numbers are NaN (floats) or -1 (ints).
+COLUMNS = {
+    "pass": "B",
+    "cached": "B",
+    "wall_s": "d",
+    "ttft_s": "d",
+    "prompt_tokens": "q",
+    "completion_tokens": "q",
+    "pass_rate": "d",
+}
+DIGEST_SIZE = 32
+_NO_DIGEST = bytes(DIGEST_SIZE)
+
+_BLOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (sha256 TEXT PRIMARY KEY, kind TEXT NOT NULL, content BLOB NOT NULL);
+"""
+
+
+def content_hash(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+class BlobStore:
+    """Content-addressed prompts and pack files shared by every archived run.
+
+    A blob is stored once however many runs refer to it; inserts are single ``INSERT OR IGNORE``
+    statements, so several processes can archive into the same store.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_BLOB_SCHEMA)
+
+    def __enter__(self) -> "BlobStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def put(self, kind: str, data: bytes) -> bytes:
+        digest = content_hash(data)
+        self._conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", (digest.hex(), kind, data))
+        return digest
+
+    def get(self, digest: bytes) -> bytes:
+        row = self._conn.execute("SELECT content FROM blobs WHERE sha256 = ?", (digest.hex(),)).fetchone()
+        if row is None:
+            raise KeyError(f"blob {digest.hex()} is missing from {self.path}")
+        return row[0]
+
+
+def _number(value: Any, missing: float | int) -> float | int:
+    return missing if value is None else value
+
+
+def _row(result: dict[str, Any]) -> dict[str, Any]:
+    latency = result.get("latency") or {}
+    sampling = result.get("sampling") or {}
+    return {
+        "pass": 1 if result["pass"] else 0,
+        "cached": 1 if latency.get("cached") else 0,
+        "wall_s": _number(latency.get("wall_s"), math.nan),
+        "ttft_s": _number(latency.get("ttft_s"), math.nan),
+        "prompt_tokens": _number(latency.get("prompt_tokens"), -1),
+        "completion_tokens": _number(latency.get("completion_tokens"), -1),
+        "pass_rate": _number(sampling.get("pass_rate"), math.nan),
+    }
+
+
+def write_archive(directory: Path, run_data: dict[str, Any], blobs: BlobStore, pack_file: Path | None = None) -> None:
+    """Store one run as columns, compressed result remainders and content-hashed prompts.
+
+    ``results.jsonl.gz`` keeps every result field except the prompt text, which is replaced by a
+    placeholder and restored from the blob store, so :func:`restore_run` gives back the same data.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = {name: array(code) for name, code in COLUMNS.items()}
+    task_ids = bytearray()
+    task_offsets = array("q", [0])
+    digests = bytearray()
+    with gzip.open(directory / "results.jsonl.gz", "wt", encoding="utf-8", compresslevel=6) as rest:
+        for result in run_data["results"]:
+            for name, value in _row(result).items():
+                columns[name].append(value)
+            task_ids += result["task_id"].encode("utf-8")
+            task_offsets.append(len(task_ids))
+            prompt = result.get("prompt")
+            if isinstance(prompt, str):
+                digests += blobs.put("prompt", prompt.encode("utf-8"))
+                result = {**result, "prompt": None}
+            else:
+                digests += _NO_DIGEST
+            rest.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+    for name, values in columns.items():
+        (directory / f"{name}.{values.typecode}").write_bytes(values.tobytes())
+    (directory / "task_id.q").write_bytes(task_offsets.tobytes())
+    (directory / "task_id.utf8").write_bytes(bytes(task_ids))
+    (directory / "prompt.sha256").write_bytes(bytes(digests))
+
+    meta = {key: value for key, value in run_data.items() if key != "results"}
+    archive = {"version": FORMAT_VERSION, "rows": len(task_offsets) - 1, "byteorder": sys.byteorder}
+    if pack_file is not None and pack_file.exists():
+        archive["pack_sha256"] = blobs.put("pack", pack_file.read_bytes()).hex()
+    (directory / "meta.json").write_text(json.dumps({"archive": archive, "run": meta}), encoding="utf-8")
+
+
+def _mapped(path: Path, typecode: str, byteorder: str) -> Any:
+    """A read-only, memory-mapped view of a column file (a copied array if it needs byte-swapping)."""
+    if byteorder != sys.byteorder:
+        values = array(typecode, path.read_bytes())
+        values.byteswap()
+        return values
+    if path.stat().st_size == 0:
+        return array(typecode)
+    with path.open("rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+class ArchivedRun:
+    """Read access to an archived run; columns are memory-mapped and loaded only when asked for."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        data = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        self.info = data["archive"]
+        self.meta = data["run"]
+        self.rows = self.info["rows"]
+
+    def column(self, name: str) -> Any:
+        typecode = COLUMNS.get(name, "q")
+        return _mapped(self.directory / f"{name}.{typecode}", typecode, self.info["byteorder"])
+
+    def task_ids(self) -> Iterator[str]:
+        offsets = self.column("task_id")
+        text = (self.directory / "task_id.utf8").read_bytes()
+        for row in range(self.rows):
+            yield text[offsets[row] : offsets[row + 1]].decode("utf-8")
+
+    def passed(self) -> int:
+        return sum(self.column("pass"))
+
+    def diff_rows(self) -> Iterator[dict[str, Any]]:
+        """Just the fields ``harness diff`` compares (task id, pass, timed wall seconds, pass rate)."""
+        passes, cached, wall, rate = (self.column(name) for name in ("pass", "cached", "wall_s", "pass_rate"))
+        for row, task_id in enumerate(self.task_ids()):
+            result: dict[str, Any] = {"task_id": task_id, "pass": bool(passes[row])}
+            if not math.isnan(wall[row]):
+                result["latency"] = {"wall_s": wall[row], "cached": bool(cached[row])}
+            if not math.isnan(rate[row]):
+                result["sampling"] = {"pass_rate": rate[row]}
+            yield result
+
+    def results(self, blobs: BlobStore) -> Iterator[dict[str, Any]]:
+        """Every result exactly as it was archived, prompts restored from the blob store."""
+        digests = (self.directory / "prompt.sha256").read_bytes()
+        with gzip.open(self.directory / "results.jsonl.gz", "rt", encoding="utf-8") as rest:
+            for row, line in enumerate(rest):
+                result = json.loads(line)
+                digest = digests[row * DIGEST_SIZE : (row + 1) * DIGEST_SIZE]
+                if digest != _NO_DIGEST:
+                    result["prompt"] = blobs.get(digest).decode("utf-8")
+                yield result
+
+
+def archive_dir(runs_dir: Path, run_id: str) -> Path:
+    return runs_dir / ARCHIVE_DIRNAME / run_id
+
+
+def open_archive(runs_dir: Path, run_id: str) -> ArchivedRun | None:
+    directory = archive_dir(runs_dir, run_id)
+    return ArchivedRun(directory) if (directory / "meta.json").exists() else None
+
+
+def restore_run(archived: ArchivedRun, blobs: BlobStore) -> dict[str, Any]:
+    return {**archived.meta, "results": archived.results(blobs)}
+
+
+class _Hasher:
+    def __init__(self) -> None:
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str) -> None:
+        self.digest.update(text.encode("utf-8"))
+
+
+def archive_run(runs_dir: Path, run_file: Path) -> tuple[ArchivedRun, bool]:
+    """Archive a run JSON file and its pack; returns the archive and whether it restores the file byte for byte."""
+    original = run_file.read_bytes()
+    run_data = json.loads(original)
+    pack_path = (run_data.get("pack") or {}).get("path")
+    directory = archive_dir(runs_dir, run_data["run_id"])
+    if directory.exists():
+        shutil.rmtree(directory)
+    with BlobStore(runs_dir / ARCHIVE_DIRNAME / BLOBS_FILENAME) as blobs:
+        write_archive(directory, run_data, blobs, Path(pack_path) if pack_path else None)
+        archived = ArchivedRun(directory)
+        hasher = _Hasher()
+        dump_run(hasher, restore_run(archived, blobs))
+    return archived, hasher.digest.digest() == hashlib.sha256(original).digest()
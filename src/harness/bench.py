@@ -0,0 +1,189 @@
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from harness.metrics import PERCENTILES, percentile
+
+# A bench call returns {"pass": bool, "latency": {...} | None} or raises on a transport/server error.
+BenchCall = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def classify_error(exc: Exception) -> str:
+    if "timeout" in type(exc).__name__.lower():
+        return "timeout"
+    return "error"
+
+
+class _Recorder:
+    """Thread-safe collector of one sample per request, plus the live in-flight count."""
+
+    def __init__(self, call: BenchCall, started: float):
+        self.call = call
+        self.started = started
+        self.samples: list[dict[str, Any]] = []
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def begin(self) -> int:
+        with self._lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def run(self, task: dict[str, Any], scheduled: float, in_flight: int) -> None:
+        sample: dict[str, Any] = {"task_id": task["id"], "sent_s": scheduled - self.started, "in_flight": in_flight}
+        try:
+            result = self.call(task)
+        except Exception as exc:  # noqa: BLE001 - every failure is a data point under load
+            sample["error"] = classify_error(exc)
+            sample["pass"] = False
+        else:
+            sample["error"] = None
+            sample["pass"] = bool(result["pass"])
+            latency = result.get("latency") or {}
+            sample["ttft_s"] = latency.get("ttft_s")
+            sample["completion_tokens"] = latency.get("completion_tokens")
+        # Latency runs from the scheduled send time, so queueing behind a saturated pool counts.
+        sample["latency_s"] = time.perf_counter() - scheduled
+        with self._lock:
+            self.in_flight -= 1
+            self.samples.append(sample)
+
+
+def run_open_loop(
+    tasks: list[dict[str, Any]],
+    call: BenchCall,
+    rate: float,
+    duration: float,
+    max_in_flight: int = 256,
+    seed: int = 0,
+) -> tuple[list[dict[str, Any]], float]:
+    """Send requests with Poisson arrivals at ``rate`` per second for ``duration`` seconds.
+
+    Arrivals do not wait for earlier requests to finish. Returns the samples and elapsed seconds.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    recorder = _Recorder(call, started)
+    deadline = started + duration
+    scheduled = started
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="harness-bench") as executor:
+        for task in itertools.cycle(tasks):
+            scheduled += rng.expovariate(rate)
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(recorder.run, task, scheduled, recorder.begin())
+    return recorder.samples, time.perf_counter() - started
+
+
+def run_closed_loop(
+    tasks: list[dict[str, Any]],
+    call: BenchCall,
+    concurrency: int,
+    duration: float,
+) -> tuple[list[dict[str, Any]], float]:
+    """Keep exactly ``concurrency`` requests in flight for ``duration`` seconds."""
+    started = time.perf_counter()
+    recorder = _Recorder(call, started)
+    deadline = started + duration
+    source = itertools.cycle(tasks)
+    source_lock = threading.Lock()
+
+    def loop() -> None:
+        while time.perf_counter() < deadline:
+            with source_lock:
+                task = next(source)
+            recorder.run(task, time.perf_counter(), recorder.begin())
+
+    threads = [threading.Thread(target=loop, name=f"harness-bench-{n}") for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.samples, time.perf_counter() - started
+
+
+def _distribution(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    summary = {f"p{pct}": round(percentile(ordered, pct), 6) for pct in PERCENTILES}
+    summary["mean"] = round(sum(ordered) / len(ordered), 6)
+    return summary
+
+
+def _bucket(in_flight: int) -> str:
+    """Power-of-two buckets of concurrent load: 1, 2-3, 4-7, 8-15, ..."""
+    low = 1 << (max(1, in_flight).bit_length() - 1)
+    high = low * 2 - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+def summarize_bench(samples: list[dict[str, Any]], elapsed_s: float) -> dict[str, Any]:
+    total = len(samples)
+    answered = [sample for sample in samples if sample["error"] is None]
+    timeouts = sum(1 for sample in samples if sample["error"] == "timeout")
+    errors = total - len(answered) - timeouts
+    completion_tokens = sum(sample.get("completion_tokens") or 0 for sample in answered)
+
+    by_load: dict[str, dict[str, Any]] = {}
+    for sample in sorted(samples, key=lambda sample: sample["in_flight"]):
+        bucket = by_load.setdefault(_bucket(sample["in_flight"]), {"requests": 0, "answered": 0, "passed": 0, "latencies": []})
+        bucket["requests"] += 1
+        if sample["error"] is None:
+            bucket["answered"] += 1
+            bucket["passed"] += 1 if sample["pass"] else 0
+            bucket["latencies"].append(sample["latency_s"])
+    load_rows = []
+    for name, bucket in by_load.items():
+        latencies = sorted(bucket.pop("latencies"))
+        load_rows.append(
+            {
+                "in_flight": name,
+                **bucket,
+                "pass_rate": round(bucket["passed"] / bucket["answered"], 4) if bucket["answered"] else None,
+                "latency_p50_s": round(percentile(latencies, 50), 6) if latencies else None,
+            }
+        )
+
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(answered) / elapsed_s, 3) if elapsed_s else 0.0,
+        "completion_tokens_per_s": round(completion_tokens / elapsed_s, 3) if elapsed_s else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "timeout_rate": round(timeouts / total, 4) if total else 0.0,
+        "pass_rate": round(sum(1 for sample in answered if sample["pass"]) / len(answered), 4) if answered else None,
+        "latency_s": _distribution([sample["latency_s"] for sample in answered]),
+        "ttft_s": _distribution([sample["ttft_s"] for sample in answered if sample.get("ttft_s") is not None]),
+        "by_load": load_rows,
+    }
+
+
+def render_bench(summary: dict[str, Any]) -> str:
+    def rate(value: float | None) -> str:
+        return "-" if value is None else f"{value * 100:.1f}%"
+
+    lines = [
+        f"Requests: {summary['requests']} in {summary['elapsed_s']:.1f}s "
+        f"({summary['throughput_rps']:.2f} answered/s, {summary['completion_tokens_per_s']:.1f} completion tokens/s)",
+        f"Errors: {rate(summary['error_rate'])}  Timeouts: {rate(summary['timeout_rate'])}  "
+        f"Pass rate: {rate(summary['pass_rate'])}",
+    ]
+    for label, key in (("Latency", "latency_s"), ("TTFT", "ttft_s")):
+        dist = summary[key]
+        if dist:
+            lines.append(
+                f"{label}: p50 {dist['p50']:.3f}s  p90 {dist['p90']:.3f}s  p99 {dist['p99']:.3f}s  mean {dist['mean']:.3f}s"
+            )
+    lines.extend(["", "Quality under load (requests grouped by in-flight count when sent):"])
+    lines.append(f"{'in-flight':>10}  {'requests':>8}  {'pass rate':>9}  {'p50 latency':>11}")
+    for row in summary["by_load"]:
+        p50 = "-" if row["latency_p50_s"] is None else f"{row['latency_p50_s']:.3f}s"
+        lines.append(f"{row['in_flight']:>10}  {row['requests']:>8}  {rate(row['pass_rate']):>9}  {p50:>11}")
+    return "\n".join(lines)
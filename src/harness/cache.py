@@ -0,0 +1,205 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+CACHE_FILENAME = "responses.sqlite"
+
+# Request options that change how a call is transported, not what the model returns.
+_TRANSPORT_KWARGS = {"timeout", "extra_headers"}
+
+
+class CacheMiss(RuntimeError):
+    pass
+
+
+def make_key(base_url: str, model: str, messages: list[dict[str, Any]], params: dict[str, Any]) -> str:
+    payload = {"base_url": base_url, "model": model, "messages": messages, "params": params}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Content-addressed store of chat completion payloads backed by a single SQLite file.
+
+    Entries older than ``max_age_s`` are ignored on read and dropped by :meth:`evict`, which also
+    trims the least recently used entries until the stored payloads fit in ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int | None = None, max_age_s: float | None = None):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / CACHE_FILENAME
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age_s is not None and now - created > self.max_age_s
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        encoded = json.dumps(value, ensure_ascii=True, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded), now, now),
+            )
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under ``max_bytes``."""
+        removed = 0
+        with self._lock:
+            if self.max_age_s is not None:
+                cursor = self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.max_age_s,))
+                removed += cursor.rowcount
+            if self.max_bytes is not None:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    doomed = []
+                    for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                        if total <= self.max_bytes:
+                            break
+                        doomed.append((key,))
+                        total -= size
+                    self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+                    removed += len(doomed)
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._conn.close()
+
+
+def _load_response(payload: dict[str, Any]) -> Any:
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate(payload)
+
+
+class _Replay:
+    """A cached stream: iterates like the server's chunk stream and is flagged as ``cached``."""
+
+    cached = True
+
+    def __init__(self, payloads: list[dict[str, Any]]):
+        from openai.types.chat import ChatCompletionChunk
+
+        self.chunks = [ChatCompletionChunk.model_validate(payload) for payload in payloads]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.chunks)
+
+
+def collapse_chunks(chunks: list[Any]) -> list[dict[str, Any]]:
+    """Merge a streamed response into one content chunk per choice, plus a trailing usage chunk."""
+    if not chunks:
+        return []
+    first = chunks[0]
+    base = {"id": first.id, "object": "chat.completion.chunk", "created": first.created, "model": first.model}
+    texts: dict[int, list[str]] = {}
+    finish_reasons: dict[int, str | None] = {}
+    usage = None
+    for chunk in chunks:
+        for choice in chunk.choices:
+            texts.setdefault(choice.index, [])
+            if choice.delta.content:
+                texts[choice.index].append(choice.delta.content)
+            if choice.finish_reason:
+                finish_reasons[choice.index] = choice.finish_reason
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage.model_dump(mode="json")
+
+    payloads = [
+        {
+            **base,
+            "choices": [
+                {
+                    "index": index,
+                    "delta": {"role": "assistant", "content": "".join(parts)},
+                    "finish_reason": finish_reasons.get(index),
+                }
+            ],
+        }
+        for index, parts in sorted(texts.items())
+    ]
+    if usage is not None:
+        payloads.append({**base, "choices": [], "usage": usage})
+    return payloads
+
+
+class CachingClient:
+    """Drop-in wrapper exposing ``chat.completions.create`` that serves repeated calls from a cache.
+
+    Calls sampled at a non-zero temperature or asking for several choices (``n`` > 1) bypass the
+    cache, since replaying one sample would hide exactly the variation the caller asked for. With
+    ``cache_only`` a miss raises :class:`CacheMiss` instead of reaching the server.
+    """
+
+    def __init__(self, client: Any, cache: ResponseCache, base_url: str, cache_only: bool = False):
+        self.client = client
+        self.cache = cache
+        self.base_url = base_url
+        self.cache_only = cache_only
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, *, model: str, messages: list[dict[str, Any]], **kwargs: Any) -> Any:
+        if kwargs.get("temperature", 0) or (kwargs.get("n") or 1) > 1:
+            return self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+        params = {name: value for name, value in kwargs.items() if name not in _TRANSPORT_KWARGS}
+        key = make_key(self.base_url, model, messages, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _Replay(cached["chunks"]) if "chunks" in cached else _load_response(cached)
+        if self.cache_only:
+            raise CacheMiss(f"cache miss for model {model} (key {key[:12]}) with --cache-only")
+
+        response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        if kwargs.get("stream"):
+            return self._store_stream(key, response)
+        self.cache.put(key, response.model_dump(mode="json"))
+        return response
+
+    def _store_stream(self, key: str, stream: Any) -> Iterator[Any]:
+        """Pass chunks through as they arrive and cache the collapsed stream once it completes."""
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            self.cache.put(key, {"chunks": collapse_chunks(chunks)})
@@ -0,0 +1,136 @@
+import math
+from typing import Any, Iterable
+
+FAIL_ON = ("significant", "any", "never")
+
+
+def _compact(result: dict[str, Any]) -> tuple[bool, float | None, float | None]:
+    """The few fields a diff needs: pass flag, timed wall seconds, and sampled pass rate."""
+    latency = result.get("latency") or {}
+    wall = None if latency.get("cached") else latency.get("wall_s")
+    sampling = result.get("sampling") or {}
+    return bool(result["pass"]), wall, sampling.get("pass_rate")
+
+
+def sign_test_p(worse: int, better: int) -> float:
+    """Exact two-sided binomial p-value for ``worse`` vs ``better`` discordant pairs (McNemar / sign test)."""
+    n = worse + better
+    if n == 0:
+        return 1.0
+    tail = sum(math.comb(n, i) for i in range(min(worse, better) + 1)) / 2**n
+    return min(1.0, 2 * tail)
+
+
+def diff_runs(
+    before: Iterable[dict[str, Any]],
+    after: Iterable[dict[str, Any]],
+    latency_ratio: float = 1.5,
+    latency_min_s: float = 0.25,
+) -> dict[str, Any]:
+    """Compare two runs task by task.
+
+    ``before`` is streamed into a compact per-task table; ``after`` is streamed against it, so
+    neither run's outputs or details are held in memory.
+    """
+    baseline = {result["task_id"]: _compact(result) for result in before}
+
+    newly_failing: list[str] = []
+    newly_passing: list[str] = []
+    slower: list[dict[str, Any]] = []
+    rated = rate_worse = rate_better = 0
+    compared = passed_after = passed_common_before = 0
+    only_after = 0
+    for result in after:
+        ok, wall, rate = _compact(result)
+        previous = baseline.pop(result["task_id"], None)
+        if previous is None:
+            only_after += 1
+            continue
+        was_ok, was_wall, was_rate = previous
+        compared += 1
+        passed_after += 1 if ok else 0
+        passed_common_before += 1 if was_ok else 0
+        if was_ok and not ok:
+            newly_failing.append(result["task_id"])
+        elif ok and not was_ok:
+            newly_passing.append(result["task_id"])
+        if rate is not None and was_rate is not None:
+            rated += 1
+            if rate < was_rate:
+                rate_worse += 1
+            elif rate > was_rate:
+                rate_better += 1
+        if wall is not None and was_wall is not None:
+            if wall >= was_wall * latency_ratio and wall - was_wall >= latency_min_s:
+                slower.append({"task_id": result["task_id"], "before_s": was_wall, "after_s": wall})
+
+    # When both runs sampled every shared task, compare pass rates rather than single pass flags.
+    sampled = compared > 0 and rated == compared
+    worse, better = (rate_worse, rate_better) if sampled else (len(newly_failing), len(newly_passing))
+    return {
+        "compared": compared,
+        "only_before": len(baseline),
+        "only_after": only_after,
+        "passed_before": passed_common_before,
+        "passed_after": passed_after,
+        "newly_failing": newly_failing,
+        "newly_passing": newly_passing,
+        "latency_regressions": slower,
+        "latency_ratio": latency_ratio,
+        "latency_min_s": latency_min_s,
+        "test": {
+            "name": "sign test on per-task pass rates" if sampled else "McNemar exact test",
+            "worse": worse,
+            "better": better,
+            "p_value": round(sign_test_p(worse, better), 6),
+        },
+    }
+
+
+def is_regression(diff: dict[str, Any], fail_on: str = "significant", alpha: float = 0.05, latency: bool = False) -> bool:
+    test = diff["test"]
+    if latency and diff["latency_regressions"]:
+        return True
+    if fail_on == "any":
+        return bool(diff["newly_failing"]) or test["worse"] > test["better"]
+    if fail_on == "significant":
+        return test["worse"] > test["better"] and test["p_value"] < alpha
+    return False
+
+
+def _percent(passed: int, total: int) -> str:
+    return "0.0%" if not total else f"{passed / total * 100:.1f}%"
+
+
+def _listing(title: str, items: list[str], limit: int) -> list[str]:
+    if not items:
+        return []
+    lines = [f"{title} ({len(items)}):"]
+    lines.extend(f"  - {item}" for item in items[:limit])
+    if len(items) > limit:
+        lines.append(f"  ... and {len(items) - limit} more")
+    return lines
+
+
+def render_diff(diff: dict[str, Any], before_id: str, after_id: str, limit: int = 50) -> str:
+    compared = diff["compared"]
+    delta = (diff["passed_after"] - diff["passed_before"]) / max(1, compared) * 100
+    lines = [
+        f"Diff {before_id} -> {after_id} ({compared} task(s) in both)",
+        f"Score: {diff['passed_before']}/{compared} ({_percent(diff['passed_before'], compared)}) -> "
+        f"{diff['passed_after']}/{compared} ({_percent(diff['passed_after'], compared)}), {delta:+.1f} pts",
+    ]
+    if diff["only_before"] or diff["only_after"]:
+        lines.append(f"Not compared: {diff['only_before']} task(s) only in {before_id}, {diff['only_after']} only in {after_id}")
+    lines.extend(_listing("Newly failing", diff["newly_failing"], limit))
+    lines.extend(_listing("Newly passing", diff["newly_passing"], limit))
+    slower = [
+        f"{item['task_id']}: {item['before_s']:.2f}s -> {item['after_s']:.2f}s "
+        f"({(item['after_s'] / item['before_s'] - 1) * 100 if item['before_s'] else math.inf:+.0f}%)"
+        for item in diff["latency_regressions"]
+    ]
+    ratio = (diff["latency_ratio"] - 1) * 100
+    lines.extend(_listing(f"Latency regressions (>{ratio:.0f}% and >{diff['latency_min_s']:g}s slower)", slower, limit))
+    test = diff["test"]
+    lines.append(f"Paired test ({test['name']}): {test['worse']} worse vs {test['better']} better, p={test['p_value']:.4g}")
+    return "\n".join(lines)
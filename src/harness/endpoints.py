@@ -0,0 +1,135 @@
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+_END = object()
+
+
+def read_endpoints_file(path: Path) -> list[str]:
+    """One base URL per line; blank lines and ``#`` comments are ignored."""
+    urls = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            urls.append(line)
+    return urls
+
+
+def is_endpoint_failure(exc: Exception) -> bool:
+    """Server-side errors and transport failures count against an endpoint; 4xx client errors do not."""
+    status = getattr(exc, "status_code", None)
+    return status is None or status >= 500
+
+
+class Endpoint:
+    def __init__(self, base_url: str, client: Any):
+        self.base_url = base_url
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "requests": self.requests,
+            "failures": self.failures,
+            "healthy": self.down_until <= time.monotonic(),
+        }
+
+
+class EndpointPool:
+    """Spread ``chat.completions.create`` and ``completions.create`` calls over replicas serving the same model.
+
+    Each call goes to the healthy endpoint with the fewest outstanding requests. An endpoint that
+    fails ``max_failures`` times in a row is taken out of rotation for ``cooldown`` seconds and then
+    probed again. A failed call is retried once on every other endpoint before the error is raised.
+    """
+
+    def __init__(
+        self,
+        base_urls: list[str],
+        client_factory: Callable[[str], Any],
+        max_failures: int = 3,
+        cooldown: float = 10.0,
+    ):
+        if not base_urls:
+            raise ValueError("EndpointPool needs at least one base URL.")
+        self.endpoints = [Endpoint(url, client_factory(url)) for url in base_urls]
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.completions = SimpleNamespace(create=partial(self._create, api="completions"))
+
+    def _acquire(self, exclude: set[int]) -> Endpoint | None:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if id(ep) not in exclude]
+            if not candidates:
+                return None
+            healthy = [ep for ep in candidates if ep.down_until <= now]
+            if healthy:
+                endpoint = min(healthy, key=lambda ep: (ep.outstanding, ep.requests))
+            else:
+                endpoint = min(candidates, key=lambda ep: ep.down_until)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, failed: bool) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            if not failed:
+                endpoint.consecutive_failures = 0
+                endpoint.down_until = 0.0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.max_failures:
+                endpoint.down_until = time.monotonic() + self.cooldown
+
+    def _create(self, api: str = "chat", **kwargs: Any) -> Any:
+        tried: set[int] = set()
+        while True:
+            endpoint = self._acquire(tried)
+            tried.add(id(endpoint))
+            try:
+                target = endpoint.client.chat.completions if api == "chat" else endpoint.client.completions
+                response = target.create(**kwargs)
+                if kwargs.get("stream"):
+                    # A stream that fails before its first chunk fails over like a failed request.
+                    chunks = iter(response)
+                    first = next(chunks, _END)
+            except Exception as exc:
+                failed = is_endpoint_failure(exc)
+                self._release(endpoint, failed)
+                if not failed or len(tried) == len(self.endpoints):
+                    raise
+                continue
+            if kwargs.get("stream"):
+                return self._release_after(endpoint, chunks, first)
+            self._release(endpoint, False)
+            return response
+
+    def _release_after(self, endpoint: Endpoint, chunks: Iterator[Any], first: Any) -> Iterator[Any]:
+        """Keep a streaming call outstanding on its endpoint until the stream ends, fails or is closed."""
+        failed = False
+        try:
+            if first is not _END:
+                yield first
+                yield from chunks
+        except Exception as exc:
+            failed = is_endpoint_failure(exc)
+            raise
+        finally:
+            self._release(endpoint, failed)
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
@@ -0,0 +1,84 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+
+def iter_completed(
+    items: Iterable[T],
+    worker: Callable[[T], Any],
+    concurrency: int = 1,
+) -> Iterator[tuple[int, Any]]:
+    """Run ``worker`` over ``items`` and yield ``(index, result)`` as each call finishes.
+
+    At most ``concurrency`` calls are in flight at once, and ``items`` is consumed lazily,
+    so large task streams never turn into a large backlog of pending futures.
+    With ``concurrency <= 1`` the items are processed inline, in order. Closing the generator
+    early submits nothing more and waits for the calls already in flight.
+    """
+    if concurrency <= 1:
+        for index, item in enumerate(items):
+            yield index, worker(item)
+        return
+
+    source = enumerate(items)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="harness") as executor:
+        pending: dict[Future, int] = {}
+
+        def submit_next() -> bool:
+            try:
+                index, item = next(source)
+            except StopIteration:
+                return False
+            pending[executor.submit(worker, item)] = index
+            return True
+
+        while len(pending) < concurrency and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                yield index, future.result()
+                submit_next()
+
+
+def iter_completed_by_key(
+    streams: dict[K, Iterable[T]],
+    worker: Callable[[K, T], Any],
+    concurrency: int = 1,
+    key_limit: int | None = None,
+) -> Iterator[tuple[K, int, Any]]:
+    """Run ``worker`` over several item streams through one pool, yielding ``(key, index, result)``.
+
+    At most ``concurrency`` calls are in flight overall and at most ``key_limit`` per stream. Free
+    slots go to the earliest stream (in dict order) that has both capacity and items left, so work
+    on one key finishes before later keys take over, rather than every key running at once.
+    """
+    limit = key_limit or concurrency
+    sources = {key: enumerate(items) for key, items in streams.items()}
+    running = {key: 0 for key in streams}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="harness") as executor:
+        pending: dict[Future, tuple[K, int]] = {}
+
+        def fill() -> None:
+            for key in list(sources):
+                while len(pending) < concurrency and running[key] < limit:
+                    try:
+                        index, item = next(sources[key])
+                    except StopIteration:
+                        del sources[key]
+                        break
+                    pending[executor.submit(worker, key, item)] = (key, index)
+                    running[key] += 1
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, index = pending.pop(future)
+                running[key] -= 1
+                yield key, index, future.result()
+            fill()
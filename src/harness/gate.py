@@ -0,0 +1,69 @@
+from dataclasses import asdict, dataclass
+from typing import Any
+
+EARLY_STOP = ("fail", "decided", "never")
+
+
+@dataclass
+class Gate:
+    """Pass/fail threshold over a run of ``total`` tasks, updated as results come in.
+
+    The gate passes when at least ``min_score`` of all ``total`` tasks pass and no more than
+    ``max_failures`` fail. Its outcome is known before the run ends once the remaining tasks can no
+    longer change it.
+    """
+
+    total: int
+    min_score: float | None = None
+    max_failures: int | None = None
+    passed: int = 0
+    failed: int = 0
+
+    def is_active(self) -> bool:
+        return self.min_score is not None or self.max_failures is not None
+
+    def add(self, ok: bool) -> None:
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.passed - self.failed)
+
+    def can_pass(self) -> bool:
+        score_ok = self.min_score is None or self.passed + self.remaining >= self.min_score * self.total
+        failures_ok = self.max_failures is None or self.failed <= self.max_failures
+        return score_ok and failures_ok
+
+    def guaranteed(self) -> bool:
+        score_ok = self.min_score is None or self.passed >= self.min_score * self.total
+        failures_ok = self.max_failures is None or self.failed + self.remaining <= self.max_failures
+        return score_ok and failures_ok
+
+    def outcome(self) -> str | None:
+        """``"fail"`` or ``"pass"`` once decided, else None."""
+        if not self.can_pass():
+            return "fail"
+        if self.guaranteed():
+            return "pass"
+        return None
+
+    def should_stop(self, mode: str) -> bool:
+        """Whether the remaining tasks can be skipped: on a decided failure (``fail``) or either outcome (``decided``)."""
+        outcome = self.outcome()
+        if not self.remaining or outcome is None:
+            return False
+        return mode == "decided" or (mode == "fail" and outcome == "fail")
+
+    def describe(self) -> str:
+        parts = []
+        if self.min_score is not None:
+            parts.append(f"score >= {self.min_score * 100:.1f}% of {self.total}")
+        if self.max_failures is not None:
+            parts.append(f"failures <= {self.max_failures}")
+        return " and ".join(parts)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "condition": self.describe(), "outcome": self.outcome()}
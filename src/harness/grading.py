@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Iterable, Iterator, TypeVar
+
+from harness.graders import MATCHER_KEY, grader_for, is_runtime_grader, matcher_for
+from harness.sampling import majority_pass, task_sampling
+
+K = TypeVar("K")
+
+_COMPACT = (",", ":")
+
+
+def needs_judge(task: dict[str, Any]) -> bool:
+    """Whether grading ``task`` may call a judge model, so it has to stay in the process with the client."""
+    grader = grader_for(task["type"])
+    return grader is None or grader.uses_judge
+
+
+def result_outputs(result: dict[str, Any]) -> list[str]:
+    if result.get("samples"):
+        return [sample["output"] for sample in result["samples"]]
+    return [result["output"]]
+
+
+def apply_grades(result: dict[str, Any], grades: list[tuple[bool, dict[str, Any]]]) -> dict[str, Any]:
+    """Fill in a result's pass/detail (and per-sample grades) from one ``(pass, detail)`` per output."""
+    if result.get("samples"):
+        samples = [
+            {"output": sample["output"], "pass": ok, "detail": detail}
+            for sample, (ok, detail) in zip(result["samples"], grades)
+        ]
+        result["pass"] = majority_pass(samples)
+        result["detail"] = samples[0]["detail"]
+        result["sampling"] = task_sampling(samples)
+        result["samples"] = samples
+    else:
+        result["pass"], result["detail"] = grades[0]
+    return result
+
+
+def grade_chunk(blob: bytes) -> bytes:
+    """Grade ``[[task, [output, ...]], ...]`` (JSON) in a worker process; returns ``[[[pass, detail], ...], ...]``."""
+    graded = []
+    for task, outputs in json.loads(blob):
+        grader = grader_for(task["type"])
+        if grader is None:
+            raise ValueError(f"unknown task type {task['type']!r} in a grading worker")
+        match = grader.compile(task)
+        graded.append([match(output, None) for output in outputs])
+    return json.dumps(graded, separators=_COMPACT).encode("utf-8")
+
+
+class GradePool:
+    """Grades outputs in ``workers`` processes, in chunks of up to ``chunk_size`` results.
+
+    Each chunk crosses the process boundary as one JSON byte string each way (task specs and
+    outputs out, ``[pass, detail]`` pairs back) instead of a pickled dict per result. Tasks are
+    compiled again in the worker, so only plain JSON task specs are sent; tasks of a grader added
+    with ``register_grader`` are graded in this process, since workers do not have it. A partial
+    chunk is sent as soon as every worker is idle or its first result has waited ``max_wait``
+    seconds, so results reach the caller without waiting for a full chunk.
+    """
+
+    def __init__(self, workers: int, chunk_size: int = 64, max_wait: float = 0.05):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_wait = max_wait
+        self.chunks = 0
+        # Forking a process that already runs request threads can deadlock the child; start workers clean.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+    def __enter__(self) -> "GradePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, batch: list[tuple[K, dict[str, Any], dict[str, Any]]]) -> Future:
+        payload = [
+            [{key: value for key, value in task.items() if key != MATCHER_KEY}, result_outputs(result)]
+            for _, task, result in batch
+        ]
+        self.chunks += 1
+        return self._executor.submit(grade_chunk, json.dumps(payload, separators=_COMPACT).encode("utf-8"))
+
+    def graded(
+        self, items: Iterable[tuple[K, dict[str, Any], dict[str, Any]]]
+    ) -> Iterator[tuple[K, dict[str, Any], dict[str, Any]]]:
+        """Grade ``(key, task, result)`` items whose ``pass`` is None; yield every item once graded.
+
+        Items that are already graded pass straight through. Results come back in chunk completion
+        order, and at most ``2 * workers`` chunks are queued, so ``items`` is consumed as the
+        workers keep up.
+        """
+        pending: list[tuple[list[tuple[K, dict[str, Any], dict[str, Any]]], Future]] = []
+        batch: list[tuple[K, dict[str, Any], dict[str, Any]]] = []
+        batch_started = 0.0
+
+        def finished(block: bool, timeout: float | None = None) -> Iterator[tuple[K, dict[str, Any], dict[str, Any]]]:
+            if block:
+                wait([future for _, future in pending], timeout=timeout, return_when=FIRST_COMPLETED)
+            for entry in [entry for entry in pending if entry[1].done()]:
+                pending.remove(entry)
+                chunk, future = entry
+                for (key, task, result), grades in zip(chunk, json.loads(future.result())):
+                    yield key, task, apply_grades(result, [(ok, detail) for ok, detail in grades])
+
+        for item in items:
+            key, task, result = item
+            if result["pass"] is not None:
+                yield item
+                continue
+            if is_runtime_grader(task["type"]):
+                match = matcher_for(task)
+                yield key, task, apply_grades(result, [match(output, None) for output in result_outputs(result)])
+                continue
+            if not batch:
+                batch_started = time.monotonic()
+            batch.append(item)
+            idle = not pending
+            if idle or len(batch) >= self.chunk_size or time.monotonic() - batch_started >= self.max_wait:
+                pending.append((batch, self._submit(batch)))
+                batch = []
+            if idle:
+                # A result that arrived at an idle pool is graded in milliseconds; hand it on before the next one.
+                yield from finished(block=True, timeout=self.max_wait)
+            else:
+                yield from finished(block=len(pending) > 2 * self.workers)
+        if batch:
+            pending.append((batch, self._submit(batch)))
+        while pending:
+            yield from finished(block=True)
@@ -0,0 +1,186 @@
+import json
+import os
+import textwrap
+import time
+from array import array
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+
+class RunJournal:
+    """Append-only JSONL log of a run: one header line, then one line per finished task.
+
+    Every line is flushed to the OS as soon as it is written; ``fsync`` runs at most once per
+    ``fsync_interval`` seconds (``0`` syncs after every task), and always on close.
+    """
+
+    def __init__(self, path: Path, fsync_interval: float = 1.0, mode: str = "ab"):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._handle = path.open(mode)
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, path: Path, header: dict[str, Any], fsync_interval: float = 1.0) -> "RunJournal":
+        # Exclusive create: of two processes starting the same run id, exactly one gets the journal.
+        try:
+            journal = cls(path, fsync_interval, "xb")
+        except FileExistsError:
+            raise FileExistsError(f"Journal already exists: {path}") from None
+        journal._write({"header": header})
+        journal.sync()
+        return journal
+
+    @classmethod
+    def reopen(cls, path: Path, fsync_interval: float = 1.0) -> "RunJournal":
+        """Reopen an interrupted journal for appending, dropping a torn final line if present."""
+        with path.open("rb+") as handle:
+            complete = 0
+            for raw in handle:
+                if raw.endswith(b"\n"):
+                    complete += len(raw)
+            handle.truncate(complete)
+        return cls(path, fsync_interval)
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n"
+        self._handle.write(line.encode("utf-8"))
+        self._handle.flush()
+
+    def append(self, index: int, result: dict[str, Any]) -> None:
+        self._write({"index": index, "result": result})
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        os.fsync(self._handle.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.sync()
+        self._handle.close()
+
+
+def _iter_lines(path: Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(offset, record)`` for every complete line; a torn final line is ignored."""
+    with path.open("rb") as handle:
+        offset = 0
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                break
+            yield offset, json.loads(raw)
+            offset += len(raw)
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    for _, record in _iter_lines(path):
+        return record["header"]
+    raise ValueError(f"Journal {path} has no header line.")
+
+
+def completed_task_ids(path: Path) -> set[str]:
+    return {record["result"]["task_id"] for _, record in _iter_lines(path) if "result" in record}
+
+
+class JournalResults:
+    """Re-iterable, pack-ordered view over the results in a journal.
+
+    Only one byte offset per task is kept in memory; each pass re-reads results from disk.
+    """
+
+    def __init__(self, path: Path, offsets: array):
+        self.path = path
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        with self.path.open("rb") as handle:
+            for offset in self.offsets:
+                handle.seek(offset)
+                yield json.loads(handle.readline())["result"]
+
+
+def index_journal(path: Path) -> tuple[dict[str, Any], JournalResults, int]:
+    """Scan a journal once and return its header, its ordered results and the pass count.
+
+    If a task was journaled twice (for example around a resume), the later line wins.
+    """
+    header: dict[str, Any] = {}
+    by_index: dict[int, tuple[int, bool]] = {}
+    for offset, record in _iter_lines(path):
+        if "header" in record:
+            header = record["header"]
+        else:
+            by_index[record["index"]] = (offset, bool(record["result"]["pass"]))
+
+    offsets = array("q")
+    passed = 0
+    for index in sorted(by_index):
+        offset, ok = by_index[index]
+        offsets.append(offset)
+        passed += 1 if ok else 0
+    return header, JournalResults(path, offsets), passed
+
+
+def dump_run(handle: IO[str], run_data: dict[str, Any]) -> None:
+    """Write ``run_data`` as indented JSON, streaming ``run_data["results"]`` one item at a time.
+
+    The output is identical to ``json.dumps(run_data, indent=2)`` with ``results`` as the last key,
+    but ``results`` may be any iterable, such as :class:`JournalResults`.
+    """
+    head = {key: value for key, value in run_data.items() if key != "results"}
+    results: Iterable[dict[str, Any]] = run_data["results"]
+    handle.write(json.dumps(head, indent=2)[:-2] + ",\n")
+    handle.write('  "results": [')
+    empty = True
+    for result in results:
+        handle.write("\n" if empty else ",\n")
+        handle.write(textwrap.indent(json.dumps(result, indent=2), "    "))
+        empty = False
+    handle.write("]\n}" if empty else "\n  ]\n}")
+
+
+def write_run_file(path: Path, run_data: dict[str, Any]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        dump_run(handle, run_data)
+
+
+class InterleavedResults:
+    """Re-iterable round-robin merge of shard results: item k of shard i is item ``k * N + i`` overall."""
+
+    def __init__(self, parts: list[Iterable[dict[str, Any]]]):
+        self.parts = parts
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        iterators = [iter(part) for part in self.parts]
+        while iterators:
+            alive = []
+            for iterator in iterators:
+                item = next(iterator, None)
+                if item is not None:
+                    alive.append(iterator)
+                    yield item
+            iterators = alive
+
+
+def open_run(run_file: Path) -> tuple[dict[str, Any], Iterable[dict[str, Any]], int]:
+    """Return a saved run's metadata, results and pass count, streaming from its journal when present."""
+    journal_path = run_file.with_suffix(".jsonl")
+    if journal_path.exists():
+        return index_journal(journal_path)
+    run_data = json.loads(run_file.read_text(encoding="utf-8"))
+    results = run_data.pop("results")
+    return run_data, results, sum(1 for result in results if result["pass"])
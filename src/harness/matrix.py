@@ -0,0 +1,110 @@
+from collections import Counter
+from typing import Any
+
+
+def _percent(passed: int, total: int) -> str:
+    return "0.0%" if not total else f"{passed / total * 100:.1f}%"
+
+
+def _seconds(latency: dict[str, Any] | None, metric: str, pct: str) -> str:
+    value = ((latency or {}).get(metric) or {}).get(pct)
+    return "-" if value is None else f"{value:.3f}"
+
+
+def matrix_cell(run_data: dict[str, Any]) -> dict[str, Any]:
+    """The part of one model x pack run that the comparison needs."""
+    return {
+        "model": run_data["model"],
+        "pack": run_data["pack"]["name"],
+        "pack_path": run_data["pack"]["path"],
+        "run_id": run_data["run_id"],
+        "passed": run_data["summary"]["passed"],
+        "total": run_data["summary"]["total"],
+        "latency": run_data["summary"].get("latency"),
+        "grid": {result["task_id"]: result["pass"] for result in run_data["results"]},
+    }
+
+
+def render_matrix_report(matrix: dict[str, Any]) -> str:
+    models = matrix["models"]
+    # Cells are keyed by pack path: two packs may share a name.
+    cells = {(cell["model"], cell["pack_path"]): cell for cell in matrix["cells"]}
+    names = Counter(pack["name"] for pack in matrix["packs"])
+    packs = {
+        pack["path"]: pack["name"] if names[pack["name"]] == 1 else f"{pack['name']} ({pack['path']})"
+        for pack in matrix["packs"]
+    }
+
+    lines = [
+        "# Model Comparison Report",
+        "",
+        "## Matrix",
+        f"- Matrix ID: `{matrix['matrix_id']}`",
+        f"- Models: {', '.join(f'`{model}`' for model in models)}",
+        f"- Packs: {', '.join(f'`{pack}`' for pack in packs.values())}",
+        f"- Base URL: `{matrix['base_url']}`",
+        "",
+        "## Scores",
+        "| Model | " + " | ".join(packs.values()) + " | Overall |",
+        "| --- | " + " | ".join("---" for _ in packs) + " | --- |",
+    ]
+    for model in models:
+        row = [f"`{model}`"]
+        passed = total = 0
+        for pack in packs:
+            cell = cells.get((model, pack))
+            if cell is None:
+                row.append("-")
+                continue
+            row.append(f"{cell['passed']}/{cell['total']} ({_percent(cell['passed'], cell['total'])})")
+            passed += cell["passed"]
+            total += cell["total"]
+        row.append(f"**{passed}/{total}** ({_percent(passed, total)})")
+        lines.append("| " + " | ".join(row) + " |")
+
+    lines.extend(
+        [
+            "",
+            "## Latency",
+            "| Model | Pack | Wall p50 (s) | Wall p90 (s) | TTFT p50 (s) | Tokens/s p50 |",
+            "| --- | --- | --- | --- | --- | --- |",
+        ]
+    )
+    for model in models:
+        for pack in packs:
+            cell = cells.get((model, pack))
+            if cell is None:
+                continue
+            latency = cell["latency"]
+            tokens = ((latency or {}).get("tokens_per_s") or {}).get("p50")
+            lines.append(
+                f"| `{model}` | {packs[pack]} | {_seconds(latency, 'wall_s', 'p50')} | {_seconds(latency, 'wall_s', 'p90')} "
+                f"| {_seconds(latency, 'ttft_s', 'p50')} | {'-' if tokens is None else f'{tokens:.1f}'} |"
+            )
+
+    for pack, label in packs.items():
+        task_ids: dict[str, None] = {}
+        for model in models:
+            task_ids.update(dict.fromkeys((cells.get((model, pack)) or {}).get("grid", {})))
+        lines.extend(
+            [
+                "",
+                f"## Tasks: {label}",
+                "| Task | " + " | ".join(f"`{model}`" for model in models) + " |",
+                "| --- | " + " | ".join("---" for _ in models) + " |",
+            ]
+        )
+        for task_id in task_ids:
+            marks = []
+            for model in models:
+                outcome = (cells.get((model, pack)) or {}).get("grid", {}).get(task_id)
+                marks.append("-" if outcome is None else ("PASS" if outcome else "**FAIL**"))
+            lines.append(f"| `{task_id}` | " + " | ".join(marks) + " |")
+
+    lines.extend(["", "## Runs"])
+    for model in models:
+        for pack in packs:
+            cell = cells.get((model, pack))
+            if cell is not None:
+                lines.append(f"- `{model}` on {packs[pack]}: `run_{cell['run_id']}.json`")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,199 @@
+import math
+import time
+from array import array
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator
+
+_calls: ContextVar[list[dict[str, Any]] | None] = ContextVar("harness_calls", default=None)
+_pool_waits: ContextVar[list[float] | None] = ContextVar("harness_pool_waits", default=None)
+
+PERCENTILES = (50, 90, 99)
+
+
+@contextmanager
+def record_calls() -> Iterator[list[dict[str, Any]]]:
+    """Collect the stats of every model call made in this context (and this thread) into a list."""
+    calls: list[dict[str, Any]] = []
+    token = _calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _calls.reset(token)
+
+
+def record_call(stats: dict[str, Any]) -> None:
+    calls = _calls.get()
+    if calls is not None:
+        calls.append(stats)
+
+
+@contextmanager
+def measure_pool_wait() -> Iterator[list[float]]:
+    """Collect the connection-pool waits of the HTTP requests sent in this context (one per attempt)."""
+    waits: list[float] = []
+    token = _pool_waits.set(waits)
+    try:
+        yield waits
+    finally:
+        _pool_waits.reset(token)
+
+
+def record_pool_wait(seconds: float) -> None:
+    waits = _pool_waits.get()
+    if waits is not None:
+        waits.append(seconds)
+
+
+def as_messages(prompt: str | list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """A bare prompt as a single user message; a message list as is."""
+    return prompt if isinstance(prompt, list) else [{"role": "user", "content": prompt}]
+
+
+def complete(client: Any, model: str, messages: list[dict[str, Any]], kind: str = "chat", **params: Any) -> str:
+    """Stream one chat completion and return its text, recording wall time, TTFT and token usage."""
+    return (complete_choices(client, model, messages, kind=kind, **params) or [""])[0]
+
+
+def complete_choices(
+    client: Any, model: str, messages: list[dict[str, Any]], n: int | None = None, kind: str = "chat", **params: Any
+) -> list[str]:
+    """Stream one request (for ``n`` choices if given) and return the text of each choice the server sent.
+
+    The request is recorded as one model call: wall time, time to the first token of any choice,
+    connection-pool wait and token usage.
+    """
+    if n is not None:
+        params["n"] = n
+    started = time.perf_counter()
+    with measure_pool_wait() as waits:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params,
+        )
+    parts: dict[int, list[str]] = {}
+    first_token = None
+    usage = None
+    for chunk in stream:
+        for choice in chunk.choices:
+            text = parts.setdefault(getattr(choice, "index", 0), [])
+            if choice.delta.content:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                text.append(choice.delta.content)
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage
+    finished = time.perf_counter()
+
+    record_call(
+        {
+            "kind": kind,
+            "wall_s": finished - started,
+            "ttft_s": None if first_token is None else first_token - started,
+            "pool_wait_s": sum(waits) if waits else None,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "cached": bool(getattr(stream, "cached", False)),
+        }
+    )
+    return ["".join(parts[index]).strip() for index in sorted(parts)]
+
+
+def _sum(values: Iterable[Any]) -> int | None:
+    present = [value for value in values if value is not None]
+    return sum(present) if present else None
+
+
+def task_latency(calls: list[dict[str, Any]], wall_s: float) -> dict[str, Any] | None:
+    """Fold the calls made for one task into the ``latency`` block stored on its result."""
+    if not calls:
+        return None
+    model_calls = [call for call in calls if call["kind"] != "judge"]
+    judge_calls = [call for call in calls if call["kind"] == "judge"]
+
+    latency: dict[str, Any] = {
+        "wall_s": round(wall_s, 6),
+        "ttft_s": None,
+        "prompt_tokens": _sum(call["prompt_tokens"] for call in model_calls),
+        "completion_tokens": _sum(call["completion_tokens"] for call in model_calls),
+        "tokens_per_s": None,
+        "cached": all(call["cached"] for call in model_calls) if model_calls else False,
+    }
+    if model_calls:
+        first = model_calls[0]
+        if first["ttft_s"] is not None:
+            latency["ttft_s"] = round(first["ttft_s"], 6)
+        # Decode throughput: completion tokens over the time spent generating after the first token.
+        generating = sum(call["wall_s"] - (call["ttft_s"] or 0.0) for call in model_calls)
+        if latency["completion_tokens"] and generating > 0:
+            latency["tokens_per_s"] = round(latency["completion_tokens"] / generating, 3)
+    waits = [call["pool_wait_s"] for call in calls if call.get("pool_wait_s") is not None]
+    if waits:
+        latency["pool_wait_s"] = round(sum(waits), 6)
+    if judge_calls:
+        latency["judge_wall_s"] = round(sum(call["wall_s"] for call in judge_calls), 6)
+    return latency
+
+
+def percentile(sorted_values: Any, pct: float) -> float | None:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not len(sorted_values):
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class LatencyStats:
+    """Accumulates per-task ``latency`` blocks into run-level percentiles and totals.
+
+    Only the metric values are kept (as packed float arrays), so a streaming pass over a large
+    journal stays cheap. Results served from the response cache are counted but not timed.
+    """
+
+    METRICS = ("wall_s", "ttft_s", "tokens_per_s", "judge_wall_s", "pool_wait_s")
+
+    def __init__(self) -> None:
+        self.values = {metric: array("d") for metric in self.METRICS}
+        self.timed = 0
+        self.cached = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def add(self, latency: dict[str, Any] | None) -> None:
+        if not latency:
+            return
+        if latency.get("cached"):
+            self.cached += 1
+            return
+        self.timed += 1
+        for metric in self.METRICS:
+            if latency.get(metric) is not None:
+                self.values[metric].append(latency[metric])
+        self.prompt_tokens += latency.get("prompt_tokens") or 0
+        self.completion_tokens += latency.get("completion_tokens") or 0
+
+    def summary(self, elapsed_s: float | None = None) -> dict[str, Any] | None:
+        if not self.timed and not self.cached:
+            return None
+        summary: dict[str, Any] = {
+            "timed_tasks": self.timed,
+            "cached_tasks": self.cached,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+        for metric, values in self.values.items():
+            if values:
+                ordered = sorted(values)
+                summary[metric] = {f"p{pct}": round(percentile(ordered, pct), 6) for pct in PERCENTILES}
+                summary[metric]["mean"] = round(sum(ordered) / len(ordered), 6)
+        if elapsed_s:
+            summary["elapsed_s"] = round(elapsed_s, 3)
+            summary["completion_tokens_per_s"] = round(self.completion_tokens / elapsed_s, 3)
+        return summary
@@ -0,0 +1,312 @@
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable
+
+_TOKEN = re.compile(r"\s*\S+")
+DISTRIBUTIONS = ("fixed", "uniform", "exp", "lognormal")
+
+
+def parse_latency(spec: str) -> tuple[str, tuple[float, ...]]:
+    """Parse ``fixed:S``, ``uniform:LOW,HIGH``, ``exp:MEAN`` or ``lognormal:MEDIAN,SIGMA`` (seconds)."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = tuple(float(value) for value in params.split(",")) if params else ()
+    except ValueError:
+        raise ValueError(f"latency {spec!r}: parameters must be numbers") from None
+    arity = {"fixed": 1, "uniform": 2, "exp": 1, "lognormal": 2}
+    if kind not in arity:
+        raise ValueError(f"latency {spec!r}: distribution must be one of {', '.join(DISTRIBUTIONS)}")
+    if len(values) != arity[kind] or any(value < 0 for value in values):
+        raise ValueError(f"latency {spec!r}: {kind} takes {arity[kind]} non-negative number(s)")
+    return kind, values
+
+
+def sample_latency(distribution: tuple[str, tuple[float, ...]], rng: random.Random) -> float:
+    kind, values = distribution
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return rng.expovariate(1 / values[0]) if values[0] else 0.0
+    return values[0] * math.exp(rng.gauss(0, values[1])) if values[0] else 0.0
+
+
+def split_tokens(text: str) -> list[str]:
+    """Whitespace-led words, so joining the pieces gives back ``text`` (minus trailing whitespace)."""
+    return _TOKEN.findall(text) or [text]
+
+
+@dataclass
+class MockConfig:
+    """How the mock server answers: time to first token, decode rate, injected errors and scripted replies.
+
+    ``answers`` maps a prompt (the last user message) to its reply; a list of replies is served
+    in turn, one per request for that prompt. Anything else gets ``default_answer``.
+    """
+
+    latency: tuple[str, tuple[float, ...]] = ("fixed", (0.0,))
+    tokens_per_s: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    answers: dict[str, str | list[str]] = field(default_factory=dict)
+    default_answer: str = "OK"
+    seed: int = 0
+
+
+def scripted_answers(tasks: Iterable[dict[str, Any]], script: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Replies keyed by prompt: ``script[task_id]`` when given, else the task's string ``expected`` value."""
+    answers: dict[str, Any] = {}
+    for task in tasks:
+        if script and task["id"] in script:
+            answers[task["prompt"]] = script[task["id"]]
+        elif isinstance(task.get("expected"), str):
+            answers[task["prompt"]] = task["expected"]
+    return answers
+
+
+class MockBackend:
+    """Deterministic answers and timings: each request's randomness is seeded by (seed, prompt, repeat count)."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.in_flight_s = 0.0
+        self._since = time.perf_counter()
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, prompts: list[str]) -> tuple[random.Random, list[int]]:
+        """Count one request for ``prompts``; its randomness is seeded by the first prompt and its repeat count."""
+        with self._lock:
+            repeats = []
+            for prompt in prompts:
+                repeats.append(self._seen.get(prompt, 0))
+                self._seen[prompt] = repeats[-1] + 1
+            self.requests += 1
+            self._tick()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return random.Random(f"{self.config.seed}:{repeats[0]}:{prompts[0]}"), repeats
+
+    def end(self, failed: bool = False) -> None:
+        with self._lock:
+            self._tick()
+            self.in_flight -= 1
+            self.errors += failed
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        self.in_flight_s += self.in_flight * (now - self._since)
+        self._since = now
+
+    def answer(self, prompt: str, repeat: int) -> str:
+        reply = self.config.answers.get(prompt, self.config.default_answer)
+        if isinstance(reply, list):
+            return reply[repeat % len(reply)] if reply else self.config.default_answer
+        return reply
+
+    def stats(self) -> dict[str, Any]:
+        """Request counts, plus ``in_flight_s``: requests in flight integrated over time (request-seconds)."""
+        with self._lock:
+            self._tick()
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "in_flight_s": round(self.in_flight_s, 6),
+            }
+
+
+def _prompt(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "harness"}]})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.backend.stats())
+        else:
+            self._send_json(404, {"error": {"message": f"no route {self.path}"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "request body is not JSON"}})
+            return
+        route = self.path.rstrip("/")
+        if route not in ("/v1/chat/completions", "/v1/completions"):
+            self._send_json(404, {"error": {"message": f"no route {self.path}"}})
+            return
+        backend = self.server.backend
+        config = backend.config
+        if route == "/v1/completions":
+            prompt = request.get("prompt") or ""
+            prompts = [str(item) for item in prompt] if isinstance(prompt, list) else [str(prompt)]
+        else:
+            prompts = [_prompt(request.get("messages") or [])]
+        rng, repeats = backend.begin(prompts)
+        failed = rng.random() < config.error_rate
+        try:
+            time.sleep(sample_latency(config.latency, rng))
+            if failed:
+                headers = {"Retry-After": "0"} if config.error_status == 429 else None
+                self._send_json(config.error_status, {"error": {"message": "injected error"}}, headers)
+                return
+            if route == "/v1/completions":
+                self._complete_text(request, prompts, repeats)
+                return
+            prompt, repeat = prompts[0], repeats[0]
+            tokens = split_tokens(backend.answer(prompt, repeat))
+            usage = {
+                "prompt_tokens": max(1, len(prompt) // 4),
+                "completion_tokens": len(tokens),
+                "total_tokens": max(1, len(prompt) // 4) + len(tokens),
+            }
+            base = {"id": f"mock-{repeat}", "created": int(time.time()), "model": request.get("model", "mock")}
+            n = int(request.get("n") or 1)
+            usage["completion_tokens"] *= n
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            if request.get("stream"):
+                include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+                self._stream(base, tokens, usage, n, include_usage)
+            else:
+                self._complete(base, tokens, usage, n)
+        finally:
+            backend.end(failed)
+
+    def _decode_delay(self) -> float:
+        rate = self.server.backend.config.tokens_per_s
+        return 1 / rate if rate > 0 else 0.0
+
+    def _complete(self, base: dict[str, Any], tokens: list[str], usage: dict[str, int], n: int) -> None:
+        time.sleep(self._decode_delay() * len(tokens))
+        message = {"role": "assistant", "content": "".join(tokens)}
+        choices = [{"index": index, "message": message, "finish_reason": "stop"} for index in range(n)]
+        self._send_json(200, {**base, "object": "chat.completion", "choices": choices, "usage": usage})
+
+    def _complete_text(self, request: dict[str, Any], prompts: list[str], repeats: list[int]) -> None:
+        """A legacy completion: one choice per prompt, decoded side by side as a batching server would."""
+        backend = self.server.backend
+        answers = [split_tokens(backend.answer(prompt, repeat)) for prompt, repeat in zip(prompts, repeats)]
+        time.sleep(self._decode_delay() * max(len(tokens) for tokens in answers))
+        choices = [
+            {"index": index, "text": "".join(tokens), "logprobs": None, "finish_reason": "stop"}
+            for index, tokens in enumerate(answers)
+        ]
+        prompt_tokens = sum(max(1, len(prompt) // 4) for prompt in prompts)
+        completion_tokens = sum(len(tokens) for tokens in answers)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        body = {
+            "id": f"mock-{repeats[0]}",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": choices,
+            "usage": usage,
+        }
+        self._send_json(200, body)
+
+    def _stream(
+        self, base: dict[str, Any], tokens: list[str], usage: dict[str, int], n: int, include_usage: bool
+    ) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        delay = self._decode_delay()
+        chunk = {**base, "object": "chat.completion.chunk"}
+        for position, token in enumerate(tokens):
+            if position and delay:
+                time.sleep(delay)
+            delta = {"role": "assistant", "content": token} if not position else {"content": token}
+            choices = [{"index": index, "delta": delta, "finish_reason": None} for index in range(n)]
+            self._chunk(b"data: " + json.dumps({**chunk, "choices": choices}).encode("utf-8") + b"\n\n")
+        stops = [{"index": index, "delta": {}, "finish_reason": "stop"} for index in range(n)]
+        events = [{**chunk, "choices": stops}]
+        if include_usage:
+            events.append({**chunk, "choices": [], "usage": usage})
+        for event in events:
+            self._chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+        self._chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class MockServer(ThreadingHTTPServer):
+    """A stand-in OpenAI-compatible server for offline runs and benchmarks.
+
+    Serves ``POST /v1/chat/completions`` (streaming and not), ``POST /v1/completions`` (one or a list
+    of prompts, not streamed), ``GET /v1/models`` and ``GET /stats``
+    from a thread per connection. ``port=0`` picks a free port; see :attr:`base_url`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.backend = MockBackend(config)
+        self._thread: threading.Thread | None = None
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients dropping idle keep-alive connections is normal; anything else is still reported.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="harness-mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+        self.server_close()
+
@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Any
+
+from harness.metrics import measure_pool_wait, percentile, record_call
+
+# By default the first prompts go one per request, to measure what a request costs unpacked.
+CALIBRATION_PROMPTS = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size in tokens (about four characters each), enough to fill a budget."""
+    return max(1, len(text) // 4)
+
+
+def _split(total: int | None, weights: list[int]) -> list[int | None]:
+    """Share a batch's token count among its prompts in proportion to ``weights``."""
+    if total is None:
+        return [None] * len(weights)
+    whole = sum(weights) or 1
+    return [round(total * weight / whole) for weight in weights]
+
+
+def complete_prompts(client: Any, model: str, prompts: list[str], **params: Any) -> tuple[list[str], dict[str, Any]]:
+    """Send ``prompts`` as one legacy ``/v1/completions`` request and return each prompt's text, in order.
+
+    Also returns the request's stats (wall time, pool wait, usage). A prompt the reply has no choice
+    for gets an empty string.
+    """
+    started = time.perf_counter()
+    with measure_pool_wait() as waits:
+        response = client.completions.create(model=model, prompt=prompts, **params)
+    finished = time.perf_counter()
+    texts = [""] * len(prompts)
+    for choice in response.choices:
+        if 0 <= choice.index < len(prompts):
+            texts[choice.index] = (choice.text or "").strip()
+    usage = getattr(response, "usage", None)
+    stats = {
+        "wall_s": finished - started,
+        "pool_wait_s": sum(waits) if waits else None,
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+    }
+    return texts, stats
+
+
+class _Pending:
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+        self.tokens = estimate_tokens(prompt)
+        self.done = threading.Event()
+        self.text: str | None = None
+        self.call: dict[str, Any] | None = None
+        self.error: BaseException | None = None
+
+
+class PromptPacker:
+    """Collect bare prompts from concurrent tasks and send many per ``/v1/completions`` request.
+
+    A batch is sent once it holds ``max_prompts`` prompts or ``max_tokens`` estimated prompt tokens,
+    or after ``max_wait`` seconds by whichever waiting caller times out first; that caller makes the
+    request. Every caller then records the batch request as its own model call, with the usage split
+    in proportion to prompt and answer length, so per-task latency and token counts stay comparable.
+    The first ``calibrate`` prompts are sent one per request, to estimate the time saved against
+    sending every prompt on its own.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        max_prompts: int = 16,
+        max_tokens: int = 2048,
+        max_wait: float = 0.05,
+        max_output_tokens: int = 256,
+        calibrate: int = CALIBRATION_PROMPTS,
+    ):
+        self.client = client
+        self.model = model
+        self.max_prompts = max_prompts
+        self.max_tokens = max_tokens
+        self.max_wait = max_wait
+        self.max_output_tokens = max_output_tokens
+        self.prompts = 0
+        self.requests = 0
+        self.packed_prompts = 0
+        self.packed_request_s = 0.0
+        self.single_walls: list[float] = []
+        self._calibrating = calibrate
+        self._pending: list[_Pending] = []
+        self._pending_tokens = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str) -> str:
+        entry = _Pending(prompt)
+        with self._lock:
+            self.prompts += 1
+            calibrating = self._calibrating > 0
+            self._calibrating -= calibrating
+        if calibrating:
+            self._send([entry])
+        else:
+            self._enqueue(entry)
+        if entry.error is not None:
+            raise entry.error
+        assert entry.text is not None and entry.call is not None
+        record_call(entry.call)
+        return entry.text
+
+    def _enqueue(self, entry: _Pending) -> None:
+        with self._lock:
+            overflow = None
+            if self._pending and self._pending_tokens + entry.tokens > self.max_tokens:
+                overflow = self._take()
+            self._pending.append(entry)
+            self._pending_tokens += entry.tokens
+            full = len(self._pending) >= self.max_prompts or self._pending_tokens >= self.max_tokens
+            batch = self._take() if full else None
+        if overflow is not None:
+            self._send(overflow)
+        if batch is None and not entry.done.wait(self.max_wait):
+            with self._lock:
+                batch = self._take() if entry in self._pending else None
+        if batch is not None:
+            self._send(batch)
+        entry.done.wait()
+
+    def _take(self) -> list[_Pending]:
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        return batch
+
+    def _send(self, batch: list[_Pending]) -> None:
+        try:
+            texts, stats = complete_prompts(
+                self.client,
+                self.model,
+                [entry.prompt for entry in batch],
+                temperature=0,
+                max_tokens=self.max_output_tokens,
+            )
+        except BaseException as exc:
+            # Each caller raises the error for its own task; the sender may be filling in for others.
+            for entry in batch:
+                entry.error = exc
+                entry.done.set()
+            if not isinstance(exc, Exception):
+                raise
+            return
+        with self._lock:
+            self.requests += 1
+            if len(batch) == 1:
+                self.single_walls.append(stats["wall_s"])
+            else:
+                self.packed_prompts += len(batch)
+                self.packed_request_s += stats["wall_s"]
+        prompt_tokens = _split(stats["prompt_tokens"], [entry.tokens for entry in batch])
+        completion_tokens = _split(stats["completion_tokens"], [max(1, len(text)) for text in texts])
+        for position, (entry, text) in enumerate(zip(batch, texts)):
+            entry.text = text
+            entry.call = {
+                "kind": "chat",
+                "wall_s": stats["wall_s"],
+                "ttft_s": None,
+                "pool_wait_s": stats["pool_wait_s"],
+                "prompt_tokens": prompt_tokens[position],
+                "completion_tokens": completion_tokens[position],
+                "cached": False,
+            }
+            entry.done.set()
+
+    def stats(self) -> dict[str, Any]:
+        """Request counts, and the time saved against one request per prompt (estimated from unpacked requests)."""
+        with self._lock:
+            stats: dict[str, Any] = {
+                "prompts": self.prompts,
+                "requests": self.requests,
+                "request_reduction": round(1 - self.requests / self.prompts, 4) if self.prompts else 0.0,
+                "packed_prompts": self.packed_prompts,
+                "packed_request_s": round(self.packed_request_s, 3),
+                "single_request_p50_s": None,
+                "estimated_saved_request_s": None,
+            }
+            if self.single_walls:
+                single_p50 = percentile(sorted(self.single_walls), 50)
+                stats["single_request_p50_s"] = round(single_p50, 4)
+                saved = self.packed_prompts * single_p50 - self.packed_request_s
+                stats["estimated_saved_request_s"] = round(saved, 3)
+        return stats
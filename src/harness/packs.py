@@ -0,0 +1,209 @@
+import json
+import random
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TypeVar
+
+from harness.graders import MATCHER_KEY, field_error, grader_for, task_types
+from harness.prefix import prefix_problem
+
+T = TypeVar("T")
+
+PACK_SUFFIXES = {".json", ".jsonl"}
+
+
+class PackValidationError(ValueError):
+    pass
+
+
+def validate_task(task: dict[str, Any], index: int) -> None:
+    if not isinstance(task, dict):
+        raise PackValidationError(f"Task {index} must be an object.")
+
+    missing = [field for field in ("id", "type", "prompt") if field not in task]
+    if missing:
+        raise PackValidationError(f"Task {index} missing required field(s): {', '.join(missing)}.")
+
+    task_type = task["type"]
+    grader = grader_for(task_type)
+    if grader is None:
+        raise PackValidationError(
+            f"Task {index} has unknown type '{task_type}'. Allowed types: {', '.join(task_types())}."
+        )
+
+    extra_missing = [field for field in grader.fields if field not in task]
+    if extra_missing:
+        raise PackValidationError(
+            f"Task {index} ({task_type}) missing required field(s): {', '.join(extra_missing)}."
+        )
+
+    if not isinstance(task["prompt"], str):
+        raise PackValidationError(f"Task {index} field 'prompt' must be a string.")
+
+    problem = field_error(task, grader) or prefix_problem(task)
+    if problem:
+        raise PackValidationError(f"Task {index} {problem}")
+
+    # Compiled once here, at load time, so grading a stored output is a single matcher call.
+    try:
+        task[MATCHER_KEY] = grader.compile(task)
+    except ValueError as exc:
+        raise PackValidationError(f"Task {index} ({task_type}) {exc}") from exc
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Which tasks of a pack to run.
+
+    Skip ``offset`` tasks, keep a seeded ``sample`` fraction, stop at ``limit``, and finally keep
+    every ``shards``-th of those starting at ``shard``, so N shard runs partition the same slice.
+    """
+
+    offset: int = 0
+    limit: int | None = None
+    sample: float | None = None
+    seed: int = 0
+    shard: int = 0
+    shards: int = 1
+
+    def is_default(self) -> bool:
+        return self == Selection()
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def select(self, items: Iterable[T]) -> Iterator[tuple[int, T]]:
+        """Yield ``(position, item)`` for selected items without looking inside them."""
+        rng = random.Random(self.seed)
+        taken = 0
+        for position, item in enumerate(items):
+            if position < self.offset:
+                continue
+            if self.limit is not None and taken >= self.limit:
+                return
+            if self.sample is not None and rng.random() >= self.sample:
+                continue
+            taken += 1
+            if (taken - 1) % self.shards == self.shard:
+                yield position, item
+
+    def unsharded(self) -> "Selection":
+        return replace(self, shard=0, shards=1)
+
+
+def _read_json_pack(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise PackValidationError(f"Pack file {path} is not valid JSON: {exc}") from exc
+
+    if not isinstance(data, dict):
+        raise PackValidationError("Pack JSON must be an object.")
+
+    tasks = data.get("tasks")
+    if tasks is None:
+        raise PackValidationError("Pack JSON missing required field: tasks.")
+    if not isinstance(tasks, list):
+        raise PackValidationError("Pack field 'tasks' must be a list.")
+    if not tasks:
+        raise PackValidationError("Pack field 'tasks' must not be empty.")
+    return data
+
+
+def _jsonl_lines(path: Path) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(line_number, raw_line)`` for every non-blank line of a JSONL file."""
+    with path.open("rb") as handle:
+        for line_number, raw in enumerate(handle, start=1):
+            if raw.strip():
+                yield line_number, raw
+
+
+def _read_jsonl_header(path: Path) -> dict[str, Any]:
+    for line_number, raw in _jsonl_lines(path):
+        try:
+            header = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise PackValidationError(f"Pack file {path} line {line_number} is not valid JSON: {exc}") from exc
+        if not isinstance(header, dict) or "tasks" in header or "prompt" in header:
+            raise PackValidationError(
+                f"Pack file {path} must start with a header object (name, description) before its tasks."
+            )
+        return header
+    raise PackValidationError(f"Pack file {path} is empty.")
+
+
+class PackStream:
+    """A pack whose tasks are parsed and validated one at a time as they are iterated.
+
+    ``.jsonl`` packs hold a header object on the first line and one task per following line; only
+    selected lines are ever parsed. ``.json`` packs are read whole, as before, then selected.
+    """
+
+    def __init__(self, path: Path, selection: Selection = Selection()):
+        if not path.exists():
+            raise PackValidationError(f"Pack file not found: {path}")
+        self.path = path
+        self.selection = selection
+        if path.suffix == ".jsonl":
+            self.header = _read_jsonl_header(path)
+            self._tasks = None
+        else:
+            data = _read_json_pack(path)
+            self.header = {key: value for key, value in data.items() if key != "tasks"}
+            self._tasks = data["tasks"]
+        problem = prefix_problem(self.header)
+        if problem:
+            raise PackValidationError(f"Pack {problem}")
+        # A pack-level system prompt and few-shot turns apply to every task that does not set its own.
+        self.prefix = {key: self.header[key] for key in ("system", "few_shot") if key in self.header}
+
+    @property
+    def name(self) -> str:
+        return self.header.get("name", self.path.stem)
+
+    def _raw_tasks(self) -> Iterator[tuple[int, Any]]:
+        if self._tasks is not None:
+            yield from enumerate(self._tasks, start=1)
+            return
+        lines = _jsonl_lines(self.path)
+        next(lines, None)
+        yield from lines
+
+    def count(self) -> int:
+        """Number of selected tasks, found by scanning lines without parsing them."""
+        return sum(1 for _ in self.selection.select(self._raw_tasks()))
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index, (line_number, raw) in self.selection.select(self._raw_tasks()):
+            if self._tasks is not None:
+                task = raw
+            else:
+                try:
+                    task = json.loads(raw)
+                except json.JSONDecodeError as exc:
+                    raise PackValidationError(
+                        f"Pack file {self.path} line {line_number} is not valid JSON: {exc}"
+                    ) from exc
+            for key, value in self.prefix.items():
+                task.setdefault(key, value)
+            validate_task(task, index)
+            yield task
+
+
+def open_pack(path: Path, selection: Selection = Selection()) -> PackStream:
+    return PackStream(path, selection)
+
+
+def load_pack(path: Path) -> dict[str, Any]:
+    """Read and fully validate a pack, returning it in the ``{..., "tasks": [...]}`` JSON shape."""
+    stream = open_pack(path)
+    tasks = list(stream)
+    if not tasks:
+        raise PackValidationError("Pack field 'tasks' must not be empty.")
+    return {**stream.header, "tasks": tasks}
+
+
+def list_available_packs(directory: Path) -> list[Path]:
+    if not directory.exists():
+        return []
+    return sorted(path for path in directory.iterdir() if path.is_file() and path.suffix in PACK_SUFFIXES)
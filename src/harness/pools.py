@@ -0,0 +1,142 @@
+import importlib
+import threading
+import time
+from typing import Any
+
+from harness.metrics import record_pool_wait
+
+DEFAULT_POOL = {"max_connections": None, "max_keepalive": None, "keepalive_expiry": 5.0, "http2": False}
+
+# Trace events marking the moment a request holds a connection: a new one starts connecting, or an idle one
+# starts sending. Anything before that was spent queued in the pool.
+_CONNECT_EVENTS = ("connection.connect_tcp.started", "connection.connect_unix_socket.started")
+_SEND_EVENTS = ("http11.send_request_headers.started", "http2.send_request_headers.started")
+# Most a closed stream is read ahead to finish its body so the connection can be kept alive.
+DRAIN_LIMIT = 64 * 1024
+
+
+def sdk_httpx() -> Any:
+    """The httpx module the installed OpenAI SDK is built on (its client classes must come from the same one)."""
+    import openai
+
+    return importlib.import_module(openai.DefaultHttpxClient.__base__.__module__.partition(".")[0])
+
+
+def _draining_stream(httpx: Any, stream: Any) -> Any:
+    class DrainingStream(httpx.SyncByteStream):
+        """Reads the last bytes of a finished SSE body on close, so the connection goes back to the pool.
+
+        The SDK stops reading at ``data: [DONE]``, before the transport has seen the end of the body;
+        closing the response then drops the connection instead of keeping it alive.
+        """
+
+        def __init__(self) -> None:
+            self._chunks: Any = None
+            self._tail = b""
+
+        def __iter__(self) -> Any:
+            self._chunks = iter(stream)
+            for chunk in self._chunks:
+                self._tail = (self._tail + chunk)[-16:]
+                yield chunk
+
+        def close(self) -> None:
+            try:
+                if self._chunks is not None and self._tail.rstrip().endswith(b"[DONE]"):
+                    drained = 0
+                    for chunk in self._chunks:
+                        drained += len(chunk)
+                        if drained > DRAIN_LIMIT:
+                            break
+            except Exception:
+                pass
+            finally:
+                stream.close()
+
+    return DrainingStream()
+
+
+class ConnectionPools:
+    """One HTTP connection pool per endpoint URL, shared by every client that calls it (model and judge).
+
+    Requests are traced to time how long each waited for a connection: from handing the request to the
+    pool until a new connection starts to open or an idle one starts sending. That wait is recorded on
+    the current model call (``pool_wait_s``) and totalled per endpoint, apart from the server's time.
+    """
+
+    def __init__(self, settings: dict[str, Any] | None = None):
+        self.settings = {**DEFAULT_POOL, **(settings or {})}
+        self._clients: dict[str, Any] = {}
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def http_client(self, base_url: str) -> Any:
+        with self._lock:
+            if base_url not in self._clients:
+                self._stats[base_url] = {"requests": 0, "connections": 0, "pool_wait_s": 0.0, "max_pool_wait_s": 0.0}
+                self._clients[base_url] = self._build(base_url)
+            return self._clients[base_url]
+
+    def _build(self, base_url: str) -> Any:
+        import openai
+
+        httpx = sdk_httpx()
+        defaults = openai.DEFAULT_CONNECTION_LIMITS
+        settings = self.settings
+        limits = httpx.Limits(
+            max_connections=settings["max_connections"] or defaults.max_connections,
+            max_keepalive_connections=(
+                defaults.max_keepalive_connections if settings["max_keepalive"] is None else settings["max_keepalive"]
+            ),
+            keepalive_expiry=settings["keepalive_expiry"],
+        )
+        stats = self._stats[base_url]
+
+        def on_request(request: Any) -> None:
+            sent = time.perf_counter()
+            waiting = [True]
+
+            def trace(event: str, info: dict[str, Any]) -> None:
+                if not waiting[0] or (event not in _CONNECT_EVENTS and event not in _SEND_EVENTS):
+                    return
+                waiting[0] = False
+                wait = time.perf_counter() - sent
+                record_pool_wait(wait)
+                with self._lock:
+                    stats["requests"] += 1
+                    stats["connections"] += event in _CONNECT_EVENTS
+                    stats["pool_wait_s"] += wait
+                    stats["max_pool_wait_s"] = max(stats["max_pool_wait_s"], wait)
+
+            request.extensions["trace"] = trace
+
+        def on_response(response: Any) -> None:
+            response.stream = _draining_stream(httpx, response.stream)
+
+        try:
+            return openai.DefaultHttpxClient(
+                limits=limits,
+                http2=settings["http2"],
+                event_hooks={"request": [on_request], "response": [on_response]},
+            )
+        except ImportError as exc:
+            raise SystemExit(f"--http2 needs the h2 package: {exc}") from exc
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "base_url": base_url,
+                    "requests": stats["requests"],
+                    "connections": stats["connections"],
+                    "pool_wait_s": round(stats["pool_wait_s"], 6),
+                    "max_pool_wait_s": round(stats["max_pool_wait_s"], 6),
+                }
+                for base_url, stats in self._stats.items()
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.close()
@@ -0,0 +1,129 @@
+from typing import Any, Iterable, Sequence
+
+from harness.metrics import percentile
+
+ORDERS = ("file", "prefix")
+# Two consecutive requests sharing at least this many leading characters count as a warm prefix
+# (roughly 64 tokens, below which prefill savings are lost in the noise).
+WARM_PREFIX_CHARS = 256
+
+Key = tuple[tuple[str, str], ...]
+
+
+def prefix_problem(fields: dict[str, Any]) -> str | None:
+    """Describe what is wrong with a pack or task ``system``/``few_shot`` field, if anything."""
+    if "system" in fields and not isinstance(fields["system"], str):
+        return "field 'system' must be a string."
+    shots = fields.get("few_shot", [])
+    if not isinstance(shots, list) or not all(
+        isinstance(shot, dict) and isinstance(shot.get("user"), str) and isinstance(shot.get("assistant"), str)
+        for shot in shots
+    ):
+        return "field 'few_shot' must be a list of {\"user\": ..., \"assistant\": ...} objects."
+    return None
+
+
+def prefix_messages(task: dict[str, Any]) -> list[dict[str, str]]:
+    """The system prompt and few-shot turns sent before a task's prompt."""
+    messages = []
+    if task.get("system"):
+        messages.append({"role": "system", "content": task["system"]})
+    for shot in task.get("few_shot") or ():
+        messages.append({"role": "user", "content": shot["user"]})
+        messages.append({"role": "assistant", "content": shot["assistant"]})
+    return messages
+
+
+def task_request(task: dict[str, Any]) -> str | list[dict[str, str]]:
+    """What to send for a task: its bare prompt, or the full message list when it has a prefix."""
+    prefix = prefix_messages(task)
+    if not prefix:
+        return task["prompt"]
+    return [*prefix, {"role": "user", "content": task["prompt"]}]
+
+
+def request_key(task: dict[str, Any]) -> Key:
+    """The rendered messages of a task as a tuple; pack-level strings are shared, not copied."""
+    return tuple((message["role"], message["content"]) for message in prefix_messages(task)) + (
+        ("user", task["prompt"]),
+    )
+
+
+def shared_chars(a: Key, b: Key) -> int:
+    """Length of the common leading text of two rendered message sequences."""
+    shared = 0
+    for (role_a, text_a), (role_b, text_b) in zip(a, b):
+        if role_a != role_b:
+            return shared
+        if text_a is text_b or text_a == text_b:
+            shared += len(text_a)
+            continue
+        limit = min(len(text_a), len(text_b))
+        common = 0
+        while common < limit and text_a[common] == text_b[common]:
+            common += 1
+        return shared + common
+    return shared
+
+
+def prefix_order(keys: Sequence[Key]) -> list[int]:
+    """Positions of ``keys`` in a pre-order walk of their prefix trie.
+
+    Walking a trie of message sequences with children in sorted order visits them in
+    lexicographic order, so a stable sort gives the walk without building the trie: every
+    subtree, i.e. every group of requests sharing a prefix, is dispatched contiguously.
+    """
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def warm_flags(keys: Iterable[Key], min_shared: int = WARM_PREFIX_CHARS) -> list[bool]:
+    """For each request in dispatch order, whether it shares a long prefix with the one before it."""
+    flags = []
+    previous: Key | None = None
+    for key in keys:
+        flags.append(previous is not None and shared_chars(previous, key) >= min_shared)
+        previous = key
+    return flags
+
+
+class PrefixSchedule:
+    """Prefix-trie dispatch order for a batch of tasks, and what it is expected to save.
+
+    ``warm`` marks each task that follows a task with a long shared prefix in the scheduled
+    order. After the run, :meth:`summary` compares the TTFT of warm and cold tasks as measured by
+    the harness and scales the difference by how many more warm tasks this order has than file order.
+    """
+
+    def __init__(self, tasks: Sequence[dict[str, Any]], min_shared: int = WARM_PREFIX_CHARS):
+        keys = [request_key(task) for task in tasks]
+        self.order = prefix_order(keys)
+        self.min_shared = min_shared
+        self.file_warm = sum(warm_flags(keys, min_shared))
+        flags = warm_flags((keys[position] for position in self.order), min_shared)
+        self.warm = {tasks[position]["id"]: flag for position, flag in zip(self.order, flags)}
+
+    def summary(self, results: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        ttft: dict[bool, list[float]] = {True: [], False: []}
+        for result in results:
+            warm = self.warm.get(result["task_id"])
+            value = (result.get("latency") or {}).get("ttft_s")
+            if warm is not None and value is not None:
+                ttft[warm].append(value)
+        summary: dict[str, Any] = {
+            "order": "prefix",
+            "tasks": len(self.warm),
+            "min_shared_chars": self.min_shared,
+            "warm_tasks": sum(self.warm.values()),
+            "warm_tasks_file_order": self.file_warm,
+            "warm_ttft_p50_s": None,
+            "cold_ttft_p50_s": None,
+            "estimated_saved_s": None,
+        }
+        if ttft[True] and ttft[False]:
+            warm_p50 = percentile(sorted(ttft[True]), 50)
+            cold_p50 = percentile(sorted(ttft[False]), 50)
+            summary["warm_ttft_p50_s"] = round(warm_p50, 4)
+            summary["cold_ttft_p50_s"] = round(cold_p50, 4)
+            gained = summary["warm_tasks"] - self.file_warm
+            summary["estimated_saved_s"] = round(gained * (cold_p50 - warm_p50), 3)
+        return summary
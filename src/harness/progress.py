@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from harness.metrics import percentile
+
+# Latency percentiles cover this many of the most recent tasks, so computing them costs the same at any run size.
+LATENCY_WINDOW = 1024
+
+
+class RunProgress:
+    """Thread-safe live counters for a run: completed, passed, in flight, throughput, latency.
+
+    Workers call :meth:`begin`/:meth:`end` around each request and the main loop calls
+    :meth:`add` per result; each is a few integer updates under a lock. Everything derived
+    (rates, ETA, percentiles) is computed only when :meth:`snapshot` is called.
+    """
+
+    def __init__(self, total: int, done: int = 0, clock: Callable[[], float] = time.perf_counter, **labels: str):
+        self.total = total
+        self.labels = labels
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._initial = done
+        self.completed = done
+        self.passed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self._wall = deque(maxlen=LATENCY_WINDOW)
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def add(self, result: dict[str, Any]) -> None:
+        wall = (result.get("latency") or {}).get("wall_s")
+        with self._lock:
+            self.completed += 1
+            if result["pass"]:
+                self.passed += 1
+            else:
+                self.failed += 1
+            if wall is not None:
+                self._wall.append(wall)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            completed, passed, failed, in_flight = self.completed, self.passed, self.failed, self.in_flight
+            wall = sorted(self._wall)
+        elapsed = self._clock() - self._started
+        rate = (completed - self._initial) / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - completed)
+        return {
+            **self.labels,
+            "total": self.total,
+            "completed": completed,
+            "passed": passed,
+            "failed": failed,
+            "in_flight": in_flight,
+            "pass_rate": passed / (passed + failed) if passed + failed else None,
+            "elapsed_s": round(elapsed, 3),
+            "tasks_per_s": round(rate, 3),
+            "eta_s": round(remaining / rate, 1) if rate > 0 else None,
+            "wall_s": {name: percentile(wall, pct) for name, pct in (("p50", 50), ("p90", 90), ("p99", 99))},
+        }
+
+
+def _seconds(value: float | None) -> str:
+    if value is None:
+        return "-"
+    if value >= 60:
+        return f"{int(value // 60)}m{int(value % 60):02d}s"
+    return f"{value:.1f}s"
+
+
+def render_progress(snapshot: dict[str, Any]) -> str:
+    """One status line: ``[ 412/1000] 41% | 8 in flight | pass 87.1% | 5.2 task/s | ETA 1m53s | p50 1.2s p99 4.0s``."""
+    total = snapshot["total"]
+    done = snapshot["completed"]
+    width = len(str(total))
+    rate = "-" if snapshot["pass_rate"] is None else f"{snapshot['pass_rate'] * 100:.1f}%"
+    wall = snapshot["wall_s"]
+    return (
+        f"[{done:>{width}}/{total}] {done * 100 // max(1, total)}% | {snapshot['in_flight']} in flight | pass {rate} | "
+        f"{snapshot['tasks_per_s']:.1f} task/s | ETA {_seconds(snapshot['eta_s'])} | "
+        f"p50 {_seconds(wall['p50'])} p99 {_seconds(wall['p99'])}"
+    )
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: dict[str, str], **extra: str) -> str:
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items()) + "}"
+
+
+def prometheus_text(snapshot: dict[str, Any], labels: dict[str, str]) -> str:
+    """The snapshot in the Prometheus text exposition format."""
+    series = [
+        ("harness_tasks", "gauge", "Tasks in the run.", snapshot["total"]),
+        ("harness_tasks_completed_total", "counter", "Tasks finished, including resumed ones.", snapshot["completed"]),
+        ("harness_tasks_passed_total", "counter", "Tasks passed in this process.", snapshot["passed"]),
+        ("harness_tasks_failed_total", "counter", "Tasks failed in this process.", snapshot["failed"]),
+        ("harness_requests_in_flight", "gauge", "Tasks being requested or graded right now.", snapshot["in_flight"]),
+        ("harness_pass_rate", "gauge", "Fraction of finished tasks that passed.", snapshot["pass_rate"]),
+        ("harness_tasks_per_second", "gauge", "Task throughput since the run started.", snapshot["tasks_per_s"]),
+        ("harness_elapsed_seconds", "gauge", "Seconds since the run started.", snapshot["elapsed_s"]),
+        ("harness_eta_seconds", "gauge", "Estimated seconds until the run finishes.", snapshot["eta_s"]),
+    ]
+    label_text = _label_text(labels)
+    lines = []
+    for name, kind, help_text, value in series:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines.append(f"{name}{label_text} {'NaN' if value is None else value}")
+    lines += [
+        "# HELP harness_task_wall_seconds Task wall time over the most recent tasks.",
+        "# TYPE harness_task_wall_seconds summary",
+    ]
+    for name, quantile in (("p50", "0.5"), ("p90", "0.9"), ("p99", "0.99")):
+        value = snapshot["wall_s"][name]
+        label_text = _label_text(labels, quantile=quantile)
+        lines.append(f"harness_task_wall_seconds{label_text} {'NaN' if value is None else value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    """Replace ``path`` atomically, so a reader never sees a half-written snapshot."""
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+class ProgressDisplay:
+    """Refreshes a status line and/or a JSON snapshot file every ``interval`` seconds from a background thread.
+
+    On a terminal the status line is redrawn in place; otherwise a full line is printed per refresh.
+    :meth:`echo` prints a message above the status line.
+    """
+
+    def __init__(
+        self,
+        progress: RunProgress,
+        interval: float = 1.0,
+        stream: TextIO | None = None,
+        snapshot_file: Path | None = None,
+    ):
+        self.progress = progress
+        self.interval = interval
+        self.stream = stream
+        self.snapshot_file = snapshot_file
+        self._live = stream is not None and stream.isatty()
+        self._line = ""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="harness-progress", daemon=True)
+
+    def __enter__(self) -> "ProgressDisplay":
+        return self.start()
+
+    def start(self) -> "ProgressDisplay":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def refresh(self) -> None:
+        snapshot = self.progress.snapshot()
+        if self.snapshot_file is not None:
+            write_snapshot(self.snapshot_file, snapshot)
+        if self.stream is None:
+            return
+        with self._lock:
+            self._line = render_progress(snapshot)
+            self.stream.write(f"\r\x1b[K{self._line}" if self._live else self._line + "\n")
+            self.stream.flush()
+
+    def echo(self, text: str) -> None:
+        with self._lock:
+            if self.stream is None or not self._live:
+                print(text)
+                return
+            self.stream.write(f"\r\x1b[K{text}\n{self._line}")
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Stop refreshing after one last update, leaving the final status on its own line."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.refresh()
+        if self._live:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` (Prometheus text) and ``GET /progress`` (JSON) for a run from a daemon thread."""
+
+    def __init__(self, progress: RunProgress, port: int, host: str = "127.0.0.1"):
+        # Imported here so commands that never serve metrics do not load http.server and email at startup.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        labels = {key: str(value) for key, value in progress.labels.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body = prometheus_text(progress.snapshot(), labels).encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/progress":
+                    body = json.dumps(progress.snapshot()).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}/metrics"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="harness-metrics", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
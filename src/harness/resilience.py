@@ -0,0 +1,337 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+_task: ContextVar[dict[str, Any] | None] = ContextVar("harness_task", default=None)
+
+# Statuses that mean "slow down" rather than "this request is wrong".
+OVERLOAD_STATUSES = {429, 503}
+MAX_EVENTS = 1000
+_END = object()
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class RequestFailed(RuntimeError):
+    """A model call that could not be completed within the retry budget or the task deadline."""
+
+
+class DeadlineExceeded(RequestFailed):
+    pass
+
+
+class TaskCancelled(RuntimeError):
+    """The run no longer needs this task's result (for example, an early-stop gate was decided)."""
+
+
+@contextmanager
+def task_scope(
+    task_id: str, deadline_s: float | None = None, cancel: threading.Event | None = None
+) -> Iterator[None]:
+    """Tag every model call made in this context with ``task_id``, an optional deadline and cancel event."""
+    deadline = None if deadline_s is None else time.monotonic() + deadline_s
+    token = _task.set({"id": task_id, "deadline": deadline, "cancel": cancel})
+    try:
+        yield
+    finally:
+        _task.reset(token)
+
+
+def error_kind(exc: Exception) -> str | None:
+    """Classify a failed call as ``overload``, ``timeout``, ``server`` or ``connection``; None if not retryable."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        if status in OVERLOAD_STATUSES:
+            return "overload"
+        return "server" if status >= 500 else None
+    # Class names up the MRO, so transport errors raised raw from a half-read stream are recognised too.
+    names = [cls.__name__.lower() for cls in type(exc).__mro__]
+    if isinstance(exc, TimeoutError) or any("timeout" in name for name in names):
+        return "timeout"
+    if isinstance(exc, ConnectionError) or any("connection" in name or name == "transporterror" for name in names):
+        return "connection"
+    return None
+
+
+def retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdaptiveLimiter:
+    """AIMD cap on requests in flight.
+
+    Each success raises the limit by ``1 / limit`` (about one slot per round of requests); an
+    overload signal multiplies it by ``backoff``, at most once per ``interval`` seconds so a burst
+    of rejections from one overload episode counts once.
+    """
+
+    def __init__(self, limit: int, min_limit: int = 1, backoff: float = 0.5, interval: float = 1.0):
+        self.max_limit = limit
+        self.min_limit = min_limit
+        self.limit = float(limit)
+        self.lowest = float(limit)
+        self.backoff = backoff
+        self.interval = interval
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self, deadline: float | None = None) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    raise DeadlineExceeded("task deadline passed while waiting for a request slot")
+                self._cond.wait(timeout)
+            self.in_flight += 1
+
+    def release(self, overloaded: bool = False, adapt: bool = True) -> bool:
+        """Free a slot and adapt the limit; returns True if this call lowered it."""
+        with self._cond:
+            self.in_flight -= 1
+            throttled = False
+            now = time.monotonic()
+            if not adapt:
+                pass
+            elif not overloaded:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif now - self._last_decrease >= self.interval:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.lowest = min(self.lowest, self.limit)
+                self._last_decrease = now
+                throttled = True
+            self._cond.notify_all()
+            return throttled
+
+
+class CircuitBreaker:
+    """Fail fast after ``threshold`` consecutive failed calls, for ``cooldown`` seconds.
+
+    After the cooldown a single probe call is let through; its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.open_until is None:
+                return
+            remaining = self.open_until - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    f"endpoint failed {self.failures} call(s) in a row; circuit open for another {max(0.0, remaining):.0f}s"
+                )
+            self._probing = True
+
+    def record(self, ok: bool) -> bool:
+        """Record a call outcome; returns True if this failure opened the circuit."""
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                self.open_until = None
+                return False
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.open_until = time.monotonic() + self.cooldown
+                return True
+            return False
+
+
+class ResilientClient:
+    """Wrapper exposing ``chat.completions.create`` (and the legacy ``completions.create``) with retries,
+    deadlines, AIMD and a circuit breaker.
+
+    Retryable failures (429/5xx, timeouts, dropped connections) are retried up to ``max_retries``
+    times with full-jitter exponential backoff, honouring ``Retry-After`` and the current task's
+    deadline. Retry, throttle, circuit and deadline events are kept for the run artifacts.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        label: str,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        limiter: AdaptiveLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        request_timeout: float | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.client = client
+        self.label = label
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.request_timeout = request_timeout
+        self.rng = rng or random.Random()
+        self.counts = {"calls": 0, "retries": 0, "throttles": 0, "circuit_opens": 0, "deadlines": 0, "gave_up": 0}
+        self.events: list[dict[str, Any]] = []
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.completions = SimpleNamespace(create=partial(self._create, api="completions"))
+
+    def _event(self, name: str, **fields: Any) -> None:
+        task = _task.get()
+        event = {"t": round(time.monotonic() - self._started, 3), "event": name}
+        if task is not None:
+            event["task_id"] = task["id"]
+        event.update(fields)
+        with self._lock:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append(event)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _create(self, api: str = "chat", **kwargs: Any) -> Any:
+        task = _task.get()
+        deadline = task["deadline"] if task else None
+        cancel = task.get("cancel") if task else None
+        self._count("calls")
+        attempt = 0
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise TaskCancelled("run stopped before the request was sent")
+            try:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise DeadlineExceeded("task deadline passed before the request was sent")
+                if self.limiter is not None:
+                    self.limiter.acquire(deadline)
+            except DeadlineExceeded:
+                self._count("deadlines")
+                self._event("deadline", attempt=attempt)
+                raise
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                if self.limiter is not None:
+                    self.limiter.release(adapt=False)
+                raise
+
+            params = dict(kwargs)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                params["timeout"] = remaining if self.request_timeout is None else min(self.request_timeout, remaining)
+            try:
+                endpoint = self.client.chat.completions if api == "chat" else self.client.completions
+                response = endpoint.create(**params)
+                if kwargs.get("stream"):
+                    # A stream that fails before its first chunk is retried like a failed request.
+                    chunks = iter(response)
+                    first = next(chunks, _END)
+            except Exception as exc:
+                kind = error_kind(exc)
+                # A client error (e.g. a 400) says nothing about server capacity, so it leaves the limit alone.
+                adapt = kind is not None
+                if self.limiter is not None and self.limiter.release(kind in ("overload", "timeout"), adapt):
+                    self._count("throttles")
+                    self._event("throttle", limit=round(self.limiter.limit, 2))
+                if kind is None:
+                    # The server answered (e.g. a 400): the endpoint is up, the request is what failed.
+                    self.breaker.record(True)
+                    raise
+                status = getattr(exc, "status_code", None)
+                if self.breaker.record(False):
+                    self._count("circuit_opens")
+                    self._event("circuit_open", kind=kind, status=status, cooldown_s=self.breaker.cooldown)
+                    raise CircuitOpenError(
+                        f"{self.label} failed {self.breaker.failures} request(s) in a row (last: {kind} error)"
+                    ) from exc
+                if attempt >= self.max_retries:
+                    self._count("gave_up")
+                    self._event("gave_up", attempt=attempt, kind=kind, status=status)
+                    raise RequestFailed(f"{kind} error after {attempt + 1} attempt(s): {exc}") from exc
+                delay = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+                delay = max(delay, retry_after(exc) or 0.0)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    self._count("deadlines")
+                    self._event("deadline", attempt=attempt, kind=kind, status=status)
+                    raise DeadlineExceeded(f"task deadline leaves no time to retry after {kind} error: {exc}") from exc
+                self._count("retries")
+                self._event("retry", attempt=attempt + 1, kind=kind, status=status, delay_s=round(delay, 3))
+                if cancel is None:
+                    time.sleep(delay)
+                elif cancel.wait(delay):
+                    raise TaskCancelled("run stopped while waiting to retry") from exc
+                attempt += 1
+                continue
+
+            self.breaker.record(True)
+            if kwargs.get("stream"):
+                return self._release_after(response, chunks, first, cancel)
+            if self.limiter is not None:
+                self.limiter.release()
+            return response
+
+    def _release_after(
+        self, stream: Any, chunks: Iterator[Any], first: Any, cancel: threading.Event | None = None
+    ) -> Iterator[Any]:
+        """Hold the request slot until the streamed response has been read, or closed on cancel.
+
+        Chunks already reached the caller, so a failure mid-stream is not retried: it counts against
+        the circuit breaker and fails the task with :class:`RequestFailed`.
+        """
+        overloaded = False
+        try:
+            chunk = first
+            while chunk is not _END:
+                if cancel is not None and cancel.is_set():
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        close()
+                    raise TaskCancelled("run stopped while the response was streaming")
+                yield chunk
+                try:
+                    chunk = next(chunks, _END)
+                except Exception as exc:
+                    kind = error_kind(exc) or "server"
+                    overloaded = kind in ("overload", "timeout")
+                    self._event("stream_failed", kind=kind)
+                    if self.breaker.record(False):
+                        self._count("circuit_opens")
+                        self._event("circuit_open", kind=kind, status=None, cooldown_s=self.breaker.cooldown)
+                        raise CircuitOpenError(
+                            f"{self.label} failed {self.breaker.failures} request(s) in a row (last: {kind} error)"
+                        ) from exc
+                    self._count("gave_up")
+                    raise RequestFailed(f"{kind} error while the response was streaming: {exc}") from exc
+        finally:
+            if self.limiter is not None and self.limiter.release(overloaded=overloaded):
+                self._count("throttles")
+                self._event("throttle", limit=round(self.limiter.limit, 2))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = {"base_url": self.label, **self.counts}
+            if self.limiter is not None:
+                stats["limit"] = {
+                    "max": self.limiter.max_limit,
+                    "final": round(self.limiter.limit, 2),
+                    "lowest": round(self.limiter.lowest, 2),
+                }
+            stats["events"] = list(self.events)
+        return stats
@@ -0,0 +1,134 @@
+import contextvars
+import math
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from harness.metrics import as_messages, complete, complete_choices
+
+Z_95 = 1.959964
+
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """Unbiased estimate of the chance that at least one of ``k`` samples passes, from ``c`` of ``n``."""
+    if n - c < k:
+        return 1.0
+    return 1.0 - math.comb(n - c, k) / math.comb(n, k)
+
+
+def wilson_interval(passed: int, total: int, z: float = Z_95) -> tuple[float, float]:
+    if total == 0:
+        return 0.0, 1.0
+    rate = passed / total
+    denominator = 1 + z * z / total
+    centre = (rate + z * z / (2 * total)) / denominator
+    spread = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+class Sampler:
+    """Draws ``samples`` completions per prompt at ``temperature``.
+
+    Uses the ``n`` request parameter first; if the server returns fewer choices than asked (many
+    local servers ignore ``n``), the rest are requested in parallel and ``n`` is not tried again.
+    """
+
+    def __init__(self, client: Any, model: str, samples: int, temperature: float):
+        self.client = client
+        self.model = model
+        self.samples = samples
+        self.temperature = temperature
+        self.supports_n: bool | None = None
+
+    def settings(self) -> dict[str, Any]:
+        return {"samples": self.samples, "temperature": self.temperature}
+
+    def outputs(self, prompt: str | list[dict[str, Any]]) -> list[str]:
+        messages = as_messages(prompt)
+        outputs: list[str] = []
+        if self.samples > 1 and self.supports_n is not False:
+            outputs = complete_choices(self.client, self.model, messages, self.samples, temperature=self.temperature)
+            self.supports_n = len(outputs) >= self.samples
+            outputs = outputs[: self.samples]
+        missing = self.samples - len(outputs)
+        if missing == 1:
+            outputs.append(complete(self.client, self.model, messages, temperature=self.temperature))
+        elif missing > 1:
+            with ThreadPoolExecutor(max_workers=missing, thread_name_prefix="harness-sample") as executor:
+                # Each request runs in a copy of this context so its stats land in the task's call list.
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        complete,
+                        self.client,
+                        self.model,
+                        messages,
+                        temperature=self.temperature,
+                    )
+                    for _ in range(missing)
+                ]
+                outputs.extend(future.result() for future in futures)
+        return outputs
+
+
+class SamplingStats:
+    """Accumulates per-task sample pass counts into pass@1, pass@k and confidence intervals.
+
+    Only two small integers per task are kept, and pass@k is evaluated once per distinct
+    ``(samples, passed)`` pair rather than once per task.
+    """
+
+    def __init__(self) -> None:
+        self.drawn = array("I")
+        self.passed = array("I")
+
+    def add(self, result: dict[str, Any]) -> None:
+        samples = result.get("samples")
+        if samples:
+            self.drawn.append(len(samples))
+            self.passed.append(sum(1 for sample in samples if sample["pass"]))
+
+    def summary(self, k: int | None = None) -> dict[str, Any] | None:
+        tasks = len(self.drawn)
+        if not tasks:
+            return None
+        k = k or max(self.drawn)
+        counts = Counter(zip(self.drawn, self.passed))
+
+        rates = {pair: pair[1] / pair[0] for pair in counts}
+        mean = sum(rates[pair] * count for pair, count in counts.items()) / tasks
+        variance = sum((rates[pair] - mean) ** 2 * count for pair, count in counts.items()) / max(1, tasks - 1)
+        margin = Z_95 * math.sqrt(variance / tasks)
+
+        summary: dict[str, Any] = {
+            "tasks": tasks,
+            "samples": k,
+            "pass@1": round(mean, 4),
+            "pass@1_ci95": [round(max(0.0, mean - margin), 4), round(min(1.0, mean + margin), 4)],
+        }
+        for size in sorted({1, 2, 4, 8, 16, k} & set(range(2, k + 1))):
+            eligible = {(n, c): count for (n, c), count in counts.items() if n >= size}
+            total = sum(pass_at_k(n, c, size) * count for (n, c), count in eligible.items())
+            summary[f"pass@{size}"] = round(total / sum(eligible.values()), 4)
+        summary["always_pass"] = sum(count for (n, c), count in counts.items() if c == n)
+        summary["never_pass"] = sum(count for (n, c), count in counts.items() if c == 0)
+        summary["flaky"] = tasks - summary["always_pass"] - summary["never_pass"]
+        return summary
+
+
+def majority_pass(samples: list[dict[str, Any]]) -> bool:
+    """A sampled task counts as passing when at least half of its samples pass."""
+    return 2 * sum(1 for sample in samples if sample["pass"]) >= len(samples)
+
+
+def task_sampling(samples: list[dict[str, Any]]) -> dict[str, Any]:
+    """Per-task pass rate and its 95% Wilson interval, stored on the task's result."""
+    passed = sum(1 for sample in samples if sample["pass"])
+    low, high = wilson_interval(passed, len(samples))
+    return {
+        "passed": passed,
+        "samples": len(samples),
+        "pass_rate": round(passed / len(samples), 4),
+        "ci95": [round(low, 4), round(high, 4)],
+    }
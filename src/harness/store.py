@@ -0,0 +1,123 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+STORE_FILENAME = "index.sqlite"
+LEGACY_INDEX_FILENAME = "index.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    pack_name TEXT,
+    base_url TEXT,
+    passed INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    score REAL NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_model ON runs (model, run_id);
+CREATE INDEX IF NOT EXISTS runs_pack ON runs (pack_name, run_id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class RunStore:
+    """Index of finished runs in a SQLite file, safe for several processes writing at once.
+
+    Each insert is a single atomic statement, so concurrent runs never rewrite each other's
+    entries, and queries read only the rows they ask for. On first open, entries from a legacy
+    ``index.json`` next to the store are imported once.
+    """
+
+    def __init__(self, path: Path, migrate_legacy: bool = True):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        if migrate_legacy:
+            legacy = path.parent / LEGACY_INDEX_FILENAME
+            if legacy.exists() and not self._meta("migrated_index_json"):
+                self.import_index_json(legacy)
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _row(entry: dict[str, Any]) -> tuple[Any, ...]:
+        total = int(entry["total"])
+        passed = int(entry["passed"])
+        score = float(entry["score"]) if "score" in entry else passed / max(1, total)
+        return (
+            entry["run_id"],
+            entry["model"],
+            entry.get("pack_name"),
+            entry.get("base_url"),
+            passed,
+            total,
+            score,
+            json.dumps(entry, separators=(",", ":")),
+        )
+
+    def insert(self, entry: dict[str, Any], replace: bool = False) -> bool:
+        """Add a run entry; returns False if an entry with that run id already exists and was kept.
+
+        With ``replace``, an existing entry for the run id is overwritten instead (a resumed run saved again).
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        cursor = self._conn.execute(f"{verb} INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._row(entry))
+        return cursor.rowcount == 1
+
+    def import_index_json(self, index_path: Path) -> int:
+        """Import every entry of a legacy ``runs/index.json``; returns how many were new."""
+        entries = json.loads(index_path.read_text(encoding="utf-8")).get("runs", [])
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            for entry in entries:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._row(entry)
+                )
+                added += cursor.rowcount
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('migrated_index_json', ?)", (index_path.as_posix(),)
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return added
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        row = self._conn.execute("SELECT entry FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def recent(self, limit: int = 5, model: str | None = None, pack_name: str | None = None) -> list[dict[str, Any]]:
+        """The ``limit`` latest runs matching the filters, oldest first."""
+        clauses, params = [], []
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        if pack_name is not None:
+            clauses.append("pack_name = ?")
+            params.append(pack_name)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT entry FROM runs {where} ORDER BY run_id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
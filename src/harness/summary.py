@@ -1,7 +1,8 @@
-import json
 from pathlib import Path
 from typing import Any
 
+from harness.store import LEGACY_INDEX_FILENAME, STORE_FILENAME, RunStore
+
 
 def _score_value(run: dict[str, Any]) -> float:
     if "score" in run:
@@ -17,12 +18,31 @@ def _score_percent(run: dict[str, Any]) -> str:
     return f"{(int(run['passed']) / total) * 100:.1f}%"
 
 
+def _format_latency(run: dict[str, Any]) -> str:
+    parts = []
+    if run.get("latency_p50_s") is not None:
+        parts.append(f"p50={run['latency_p50_s']:.2f}s")
+    if run.get("ttft_p50_s") is not None:
+        parts.append(f"ttft={run['ttft_p50_s']:.2f}s")
+    if run.get("tokens_per_s_p50") is not None:
+        parts.append(f"tok/s={run['tokens_per_s_p50']:.1f}")
+    return "".join(f"  {part}" for part in parts)
+
+
+def _format_early_stop(run: dict[str, Any]) -> str:
+    if not run.get("early_stop"):
+        return ""
+    if run.get("pack_total") is None:
+        return "  stopped early"
+    return f"  stopped early {run['total']}/{run['pack_total']}"
+
+
 def _format_run(run: dict[str, Any]) -> str:
     pack_name = run.get("pack_name")
     pack_part = f"  pack={pack_name}" if pack_name else ""
     return (
         f"- {run['run_id']}  score={run['passed']}/{run['total']} ({_score_percent(run)})  "
-        f"model={run['model']}{pack_part}"
+        f"model={run['model']}{pack_part}{_format_latency(run)}{_format_early_stop(run)}"
     )
 
 
@@ -48,17 +68,18 @@ def render_summary(runs: list[dict[str, Any]], limit: int = 5) -> str:
     return "\n".join(lines)
 
 
-def main() -> None:
-    index_path = Path("runs/index.json")
-    if not index_path.exists():
-        raise SystemExit("No runs/index.json found. Run: harness run")
+def main(limit: int = 5, model: str | None = None, pack: str | None = None) -> None:
+    runs_dir = Path("runs")
+    if not (runs_dir / STORE_FILENAME).exists() and not (runs_dir / LEGACY_INDEX_FILENAME).exists():
+        raise SystemExit("No runs/index.sqlite found. Run: harness run")
 
-    data = json.loads(index_path.read_text(encoding="utf-8"))
-    runs = data.get("runs", [])
+    # Only the requested window is read; a legacy index.json is imported on first open.
+    with RunStore(runs_dir / STORE_FILENAME) as store:
+        runs = store.recent(limit, model=model, pack_name=pack)
     if not runs:
-        raise SystemExit("index.json has no runs. Run: harness run")
+        raise SystemExit("No matching runs in runs/index.sqlite. Run: harness run")
 
-    print(render_summary(runs))
+    print(render_summary(runs, limit=limit))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+import json
+import sqlite3
+
+import pytest
+
+from harness import cli
+from harness.archive import ArchivedRun, archive_run
+from harness.journal import write_run_file
+
+PROMPT = "Long shared prompt with unicode ✓ " * 20
+
+
+def _run(run_id, passes):
+    results = []
+    for index, ok in enumerate(passes):
+        result = {"task_id": f"t{index}", "type": "exact_match", "prompt": PROMPT + str(index), "output": "o", "pass": ok}
+        if index % 2:
+            result["latency"] = {"wall_s": 0.1 * (index + 1), "ttft_s": 0.05, "cached": False, "prompt_tokens": 12}
+        results.append({**result, "detail": {"expected": "o", "score": 0.5}})
+    return {
+        "run_id": run_id,
+        "model": "m",
+        "base_url": "u",
+        "pack": {"name": "p", "path": None},
+        "summary": {"passed": sum(passes), "total": len(passes)},
+        "results": results,
+    }
+
+
+def _save(runs_dir, run_data):
+    runs_dir.mkdir(exist_ok=True)
+    run_file = runs_dir / f"run_{run_data['run_id']}.json"
+    write_run_file(run_file, run_data)
+    return run_file
+
+
+def test_archive_round_trips_and_stores_each_prompt_once(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    first = _save(runs_dir, _run("r1", [True, False, True]))
+    original = first.read_bytes()
+    _save(runs_dir, _run("r2", [True, True, False]))
+
+    archived, lossless = archive_run(runs_dir, first)
+    assert lossless
+    assert list(archived.task_ids()) == ["t0", "t1", "t2"]
+    assert list(archived.column("pass")) == [1, 0, 1]
+    assert list(archived.column("prompt_tokens")) == [-1, 12, -1]
+
+    cli.cmd_archive(cli.build_parser().parse_args(["archive", "--all", "--prune"]))
+    assert "verified" in capsys.readouterr().out
+    assert not list(runs_dir.glob("run_*.json"))
+    with sqlite3.connect(runs_dir / "archive" / "blobs.sqlite") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 3
+
+    with pytest.raises(SystemExit, match="harness unarchive r1"):
+        cli.resolve_run_file("r1")
+    cli.cmd_unarchive(cli.build_parser().parse_args(["unarchive", "r1"]))
+    assert first.read_bytes() == original
+
+
+def test_diff_reads_archived_runs_from_columns(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    for run_data in (_run("r1", [True] * 8), _run("r2", [n < 2 for n in range(8)])):
+        archive_run(runs_dir, _save(runs_dir, run_data))
+        (runs_dir / f"run_{run_data['run_id']}.json").unlink()
+
+    meta, rows, passed = cli.open_any_run("r2")
+    assert (meta["run_id"], passed) == ("r2", 2)
+    assert next(iter(rows)) == {"task_id": "t0", "pass": True}
+    assert ArchivedRun(runs_dir / "archive" / "r1").rows == 8
+
+    with pytest.raises(SystemExit, match="REGRESSION"):
+        cli.cmd_diff(cli.build_parser().parse_args(["diff", "r1", "r2"]))
+    assert "Newly failing (6):" in capsys.readouterr().out
+    assert json.loads((runs_dir / "archive" / "r1" / "meta.json").read_text())["run"]["summary"]["total"] == 8
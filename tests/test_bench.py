@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+
+from harness import cli
+from harness.bench import run_closed_loop, run_open_loop, summarize_bench
+
+TASKS = [{"id": "a", "type": "exact_match"}, {"id": "b", "type": "exact_match"}]
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+def test_closed_loop_holds_concurrency_for_duration():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def call(task):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return {"pass": task["id"] == "a", "latency": {"ttft_s": 0.001, "completion_tokens": 4}}
+
+    samples, elapsed = run_closed_loop(TASKS, call, concurrency=3, duration=0.2)
+
+    assert peak == 3
+    assert elapsed >= 0.2
+    assert len(samples) > 20
+    assert {sample["task_id"] for sample in samples} == {"a", "b"}
+    assert all(1 <= sample["in_flight"] <= 3 for sample in samples)
+
+
+def test_open_loop_sends_at_target_rate_and_records_errors():
+    def call(task):
+        if task["id"] == "b":
+            raise APITimeoutError()
+        return {"pass": True}
+
+    samples, elapsed = run_open_loop(TASKS, call, rate=200, duration=0.3, seed=1)
+
+    assert 30 < len(samples) < 110
+    summary = summarize_bench(samples, elapsed)
+    assert summary["timeout_rate"] > 0.3
+    assert summary["error_rate"] == 0.0
+    assert summary["pass_rate"] == 1.0
+
+
+def test_summarize_bench_groups_quality_by_load():
+    samples = [
+        {"task_id": "a", "in_flight": 1, "error": None, "pass": True, "latency_s": 0.1, "ttft_s": 0.01, "completion_tokens": 5},
+        {"task_id": "a", "in_flight": 1, "error": None, "pass": True, "latency_s": 0.2, "ttft_s": 0.02, "completion_tokens": 5},
+        {"task_id": "a", "in_flight": 6, "error": None, "pass": False, "latency_s": 0.9, "ttft_s": 0.5, "completion_tokens": 5},
+        {"task_id": "a", "in_flight": 7, "error": "error", "pass": False, "latency_s": 0.05},
+    ]
+    summary = summarize_bench(samples, elapsed_s=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["throughput_rps"] == 1.5
+    assert summary["completion_tokens_per_s"] == 7.5
+    assert summary["error_rate"] == 0.25
+    assert summary["pass_rate"] == round(2 / 3, 4)
+    assert summary["by_load"] == [
+        {"in_flight": "1", "requests": 2, "answered": 2, "passed": 2, "pass_rate": 1.0, "latency_p50_s": 0.15},
+        {"in_flight": "4-7", "requests": 2, "answered": 1, "passed": 0, "pass_rate": 0.0, "latency_p50_s": 0.9},
+    ]
+
+
+def test_cmd_bench_writes_bench_artifact(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Reply with exactly: READY", "expected": "READY"},
+                    {"id": "quality", "type": "judge", "prompt": "Explain evals."},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    client_options = {}
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: client_options.update(kwargs))
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: "READY")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    args = cli.build_parser().parse_args(
+        ["bench", "--pack", str(pack_path), "--concurrency", "2", "--duration", "0.1", "--timeout", "5"]
+    )
+    cli.cmd_bench(args)
+
+    assert client_options["timeout"] == 5 and client_options["max_retries"] == 0
+    out = capsys.readouterr().out
+    assert "Quality under load" in out
+    bench = json.loads((runs_dir / "bench_20260418-210101.json").read_text(encoding="utf-8"))
+    assert bench["mode"] == {"type": "closed-loop", "concurrency": 2, "duration_s": 0.1}
+    assert bench["summary"]["pass_rate"] == 1.0
+    assert {sample["task_id"] for sample in bench["samples"]} == {"ready"}
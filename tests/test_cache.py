@@ -0,0 +1,159 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from harness import cli
+from harness.cache import CacheMiss, CachingClient, ResponseCache, make_key
+from harness.metrics import complete, record_calls
+
+
+def completion(content):
+    return ChatCompletion.model_validate(
+        {
+            "id": "cmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test-model",
+            "choices": [
+                {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+            ],
+        }
+    )
+
+
+def chunks(content, usage=(5, 2)):
+    base = {"id": "cmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "test-model"}
+    pieces = [content[: len(content) // 2], content[len(content) // 2 :]]
+    payloads = [
+        {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]} for piece in pieces
+    ]
+    payloads.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    payloads.append(
+        {**base, "choices": [], "usage": {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)}}
+    )
+    return [ChatCompletionChunk.model_validate(payload) for payload in payloads]
+
+
+class CountingClient:
+    def __init__(self, answer="OK"):
+        self.calls = []
+        self.answer = answer
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            return iter(chunks(self.answer))
+        return completion(self.answer)
+
+
+def test_make_key_depends_on_every_component():
+    messages = [{"role": "user", "content": "hi"}]
+    base = make_key("http://a/v1", "m", messages, {"temperature": 0})
+    assert base == make_key("http://a/v1", "m", list(messages), {"temperature": 0})
+    assert base != make_key("http://b/v1", "m", messages, {"temperature": 0})
+    assert base != make_key("http://a/v1", "m2", messages, {"temperature": 0})
+    assert base != make_key("http://a/v1", "m", [{"role": "user", "content": "yo"}], {"temperature": 0})
+    assert base != make_key("http://a/v1", "m", messages, {"temperature": 0, "max_tokens": 5})
+
+
+def test_caching_client_serves_repeats_from_cache(tmp_path):
+    inner = CountingClient("READY")
+    with ResponseCache(tmp_path) as cache:
+        client = CachingClient(inner, cache, "http://a/v1")
+        for _ in range(3):
+            response = client.chat.completions.create(
+                model="m", messages=[{"role": "user", "content": "go"}], temperature=0, timeout=5
+            )
+            assert response.choices[0].message.content == "READY"
+        assert len(inner.calls) == 1
+        assert cache.stats() == {"hits": 2, "misses": 1}
+
+    # Persisted across processes: a fresh cache file handle still hits.
+    with ResponseCache(tmp_path) as cache:
+        offline = CachingClient(CountingClient(), cache, "http://a/v1", cache_only=True)
+        response = offline.chat.completions.create(model="m", messages=[{"role": "user", "content": "go"}], temperature=0)
+        assert response.choices[0].message.content == "READY"
+        with pytest.raises(CacheMiss):
+            offline.chat.completions.create(model="m", messages=[{"role": "user", "content": "new"}], temperature=0)
+
+
+def test_caching_client_replays_streams_as_cached(tmp_path):
+    inner = CountingClient("READY")
+    with ResponseCache(tmp_path) as cache:
+        client = CachingClient(inner, cache, "http://a/v1")
+        with record_calls() as calls:
+            assert complete(client, "m", [{"role": "user", "content": "go"}], temperature=0) == "READY"
+            assert complete(client, "m", [{"role": "user", "content": "go"}], temperature=0) == "READY"
+        assert len(inner.calls) == 1
+        assert [call["cached"] for call in calls] == [False, True]
+        assert calls[1]["completion_tokens"] == 2
+        assert calls[0]["ttft_s"] is not None
+
+
+def test_caching_client_bypasses_sampled_calls(tmp_path):
+    inner = CountingClient()
+    with ResponseCache(tmp_path) as cache:
+        client = CachingClient(inner, cache, "http://a/v1")
+        for _ in range(2):
+            client.chat.completions.create(model="m", messages=[], temperature=0.7)
+            client.chat.completions.create(model="m", messages=[], temperature=0, n=3)
+        assert len(inner.calls) == 4
+        assert cache.stats() == {"hits": 0, "misses": 0}
+
+
+def test_evict_trims_by_age_and_size(tmp_path):
+    with ResponseCache(tmp_path, max_bytes=None, max_age_s=60) as cache:
+        cache.put("old", {"v": 1})
+        cache._conn.execute("UPDATE entries SET created = ?", (time.time() - 120,))
+        cache.put("new", {"v": 2})
+        assert cache.get("old") is None
+        assert cache.evict() == 1
+        assert cache.get("new") == {"v": 2}
+
+    with ResponseCache(tmp_path / "sized", max_bytes=50) as cache:
+        for index in range(5):
+            cache.put(f"k{index}", {"payload": "x" * 10})
+            time.sleep(0.001)
+        cache.get("k0")
+        assert cache.evict() == 3
+        assert cache.get("k0") is not None
+        assert cache.get("k4") is not None
+        assert cache.get("k1") is None
+
+
+def test_cmd_run_cache_only_replays_previous_run(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Reply with exactly: READY", "expected": "READY"},
+                    {"id": "other", "type": "exact_match", "prompt": "Reply with exactly: GO", "expected": "GO"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    server = CountingClient("READY")
+    stamps = iter(["20260418-210101", "20260418-210202"])
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: server)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: next(stamps))
+
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path)]))
+    assert len(server.calls) == 2
+
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--cache-only"]))
+    assert len(server.calls) == 2
+
+    replay = json.loads((runs_dir / "run_20260418-210202.json").read_text(encoding="utf-8"))
+    assert replay["cache"] == {"mode": "cache-only", "hits": 2, "misses": 0}
+    assert (replay["summary"]["passed"], replay["summary"]["total"]) == (1, 2)
+    assert replay["summary"]["latency"]["cached_tasks"] == 2
+    assert replay["summary"]["latency"]["timed_tasks"] == 0
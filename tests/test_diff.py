@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from harness import cli
+from harness.diff import diff_runs, is_regression, render_diff, sign_test_p
+from harness.journal import RunJournal
+
+
+def _result(task_id, ok, wall=None, rate=None):
+    result = {"task_id": task_id, "pass": ok}
+    if wall is not None:
+        result["latency"] = {"wall_s": wall}
+    if rate is not None:
+        result["sampling"] = {"pass_rate": rate}
+    return result
+
+
+def test_sign_test_p_is_exact_two_sided():
+    assert sign_test_p(0, 0) == 1.0
+    assert sign_test_p(5, 0) == pytest.approx(2 / 32)
+    assert sign_test_p(6, 0) == pytest.approx(2 / 64)
+    assert sign_test_p(3, 3) == 1.0
+
+
+def test_diff_runs_reports_flips_latency_and_unmatched_tasks():
+    before = [_result("a", True, 1.0), _result("b", True, 1.0), _result("c", False, 1.0), _result("gone", True)]
+    after = iter([_result("c", True, 1.1), _result("b", False, 3.0), _result("a", True, 1.2), _result("new", True)])
+
+    diff = diff_runs(before, after)
+    assert diff["newly_failing"] == ["b"]
+    assert diff["newly_passing"] == ["c"]
+    assert [item["task_id"] for item in diff["latency_regressions"]] == ["b"]
+    assert (diff["compared"], diff["only_before"], diff["only_after"]) == (3, 1, 1)
+    assert diff["test"]["name"] == "McNemar exact test"
+    assert not is_regression(diff)
+    assert is_regression(diff, fail_on="any")
+    assert is_regression(diff, latency=True)
+
+    text = render_diff(diff, "A", "B")
+    assert "Newly failing (1):\n  - b" in text
+    assert "b: 1.00s -> 3.00s (+200%)" in text
+
+
+def test_diff_runs_uses_pass_rates_for_sampled_runs():
+    before = [_result(f"t{n}", True, rate=1.0) for n in range(8)]
+    after = [_result(f"t{n}", True, rate=0.75) for n in range(8)]
+    diff = diff_runs(before, after)
+    assert diff["newly_failing"] == []
+    assert diff["test"]["worse"] == 8
+    assert is_regression(diff)
+
+
+def _write_run(runs_dir, run_id, results):
+    runs_dir.mkdir(exist_ok=True)
+    header = {"run_id": run_id, "model": "m", "base_url": "u", "pack": {"name": "p", "path": "p.json"}}
+    with RunJournal.create(runs_dir / f"run_{run_id}.jsonl", header) as journal:
+        for index, result in enumerate(results):
+            journal.append(index, result)
+    (runs_dir / f"run_{run_id}.json").write_text(json.dumps({**header, "results": results}), encoding="utf-8")
+
+
+def test_cmd_diff_exits_non_zero_on_regression(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    _write_run(runs_dir, "20260418-210101", [_result(f"t{n}", True) for n in range(8)])
+    _write_run(runs_dir, "20260418-220000", [_result(f"t{n}", n < 2) for n in range(8)])
+
+    diff_json = tmp_path / "diff.json"
+    args = cli.build_parser().parse_args(["diff", "20260418-210101", "20260418-220000", "--diff-json", str(diff_json)])
+    with pytest.raises(SystemExit, match="REGRESSION"):
+        cli.cmd_diff(args)
+    out = capsys.readouterr().out
+    assert "Newly failing (6):" in out
+    assert "p=0.03125" in out
+    assert json.loads(diff_json.read_text(encoding="utf-8"))["newly_failing"][0] == "t2"
+
+    args = cli.build_parser().parse_args(["diff", "20260418-210101", "20260418-210101"])
+    cli.cmd_diff(args)
+    assert "Result: no regression" in capsys.readouterr().out
+
+
+def test_cmd_run_with_baseline_gates_on_newly_failing_tasks(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": f"Say {n}", "expected": str(n)} for n in range(3)]
+    pack_path.write_text(json.dumps({"name": "gate", "tasks": tasks}), encoding="utf-8")
+    _write_run(runs_dir, "20260418-210101", [_result(f"t{n}", True) for n in range(3)])
+
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: "0" if prompt == "Say 0" else "?")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+
+    args = cli.build_parser().parse_args(
+        ["run", "--pack", str(pack_path), "--no-cache", "--baseline", "20260418-210101", "--fail-on", "any"]
+    )
+    with pytest.raises(SystemExit, match="REGRESSION"):
+        cli.cmd_run(args)
+    assert (runs_dir / "run_20260418-220000.json").exists()
+    assert "Newly failing (2):" in capsys.readouterr().out
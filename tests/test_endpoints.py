@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.endpoints import EndpointPool, read_endpoints_file
+from harness.store import RunStore
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+class FakeReplica:
+    def __init__(self, url, delay=0.0, error=None):
+        self.url = url
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.url
+
+
+def test_pool_prefers_least_outstanding_endpoint():
+    replicas = {"a": FakeReplica("a", delay=0.05), "b": FakeReplica("b", delay=0.0)}
+    pool = EndpointPool(["a", "b"], replicas.__getitem__)
+
+    slow = threading.Thread(target=pool.chat.completions.create)
+    slow.start()
+    time.sleep(0.01)
+    # "a" is busy with the slow call, so every call made meanwhile lands on "b".
+    assert [pool.chat.completions.create() for _ in range(3)] == ["b", "b", "b"]
+    slow.join()
+    assert replicas["a"].calls == 1
+
+
+def test_pool_fails_over_and_benches_unhealthy_endpoints():
+    replicas = {"down": FakeReplica("down", error=ServerError()), "up": FakeReplica("up")}
+    pool = EndpointPool(["down", "up"], replicas.__getitem__, max_failures=2, cooldown=60)
+
+    assert [pool.chat.completions.create() for _ in range(6)] == ["up"] * 6
+    assert replicas["down"].calls == 2
+    stats = {entry["base_url"]: entry for entry in pool.stats()}
+    assert stats["down"]["healthy"] is False
+    assert stats["down"]["failures"] == 2
+    assert stats["up"]["healthy"] is True
+
+
+class StreamingReplica(FakeReplica):
+    def create(self, **kwargs):
+        self.calls += 1
+        yield self.url
+        if self.error is not None:
+            raise self.error
+
+
+def test_streams_stay_outstanding_until_read_and_count_mid_stream_failures():
+    replicas = {"a": StreamingReplica("a"), "b": StreamingReplica("b", error=ServerError())}
+    pool = EndpointPool(["a", "b"], replicas.__getitem__, max_failures=1, cooldown=60)
+
+    first = pool.chat.completions.create(stream=True)
+    second = pool.chat.completions.create(stream=True)
+    assert [endpoint.outstanding for endpoint in pool.endpoints] == [1, 1]
+    assert list(first) == ["a"]
+    with pytest.raises(ServerError):
+        list(second)
+    assert [endpoint.outstanding for endpoint in pool.endpoints] == [0, 0]
+    stats = {entry["base_url"]: entry for entry in pool.stats()}
+    assert (stats["b"]["failures"], stats["b"]["healthy"]) == (1, False)
+
+
+def test_pool_does_not_fail_over_client_errors():
+    replicas = {"a": FakeReplica("a", error=BadRequest()), "b": FakeReplica("b", error=BadRequest())}
+    pool = EndpointPool(["a", "b"], replicas.__getitem__)
+    with pytest.raises(BadRequest):
+        pool.chat.completions.create()
+    assert replicas["a"].calls + replicas["b"].calls == 1
+    assert all(entry["healthy"] for entry in pool.stats())
+
+
+def test_read_endpoints_file(tmp_path):
+    path = tmp_path / "endpoints.txt"
+    path.write_text("# replicas\nhttp://a:8000/v1\n\nhttp://b:8000/v1  # second GPU\n", encoding="utf-8")
+    assert read_endpoints_file(path) == ["http://a:8000/v1", "http://b:8000/v1"]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests += 1
+        answer = body["messages"][-1]["content"].split()[-1]
+        base = {"id": "cmpl", "object": "chat.completion.chunk", "created": 0, "model": body["model"]}
+        events = [
+            {**base, "choices": [{"index": 0, "delta": {"content": answer}, "finish_reason": "stop"}]},
+            {**base, "choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 1, "total_tokens": 8}},
+        ]
+        encoded = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_servers():
+    servers = []
+    for _ in range(2):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        server.requests = 0
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def write_pack(path, count):
+    tasks = [
+        {"id": f"t{i}", "type": "exact_match", "prompt": f"Reply with exactly: {i}", "expected": str(i)}
+        for i in range(count)
+    ]
+    path.write_text(json.dumps({"name": "spread", "tasks": tasks}), encoding="utf-8")
+    return tasks
+
+
+def test_sharded_runs_across_endpoints_merge_into_one_run(tmp_path, monkeypatch, capsys, stand_in_servers):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "spread.json"
+    tasks = write_pack(pack_path, 9)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/v1" for server in stand_in_servers]
+    stamps = iter(["20260418-210100", "20260418-210101", "20260418-210102", "20260418-210200"])
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: next(stamps))
+
+    for shard in range(3):
+        argv = ["run", "--pack", str(pack_path), "--shard", f"{shard}/3", "--no-cache", "--concurrency", "2"]
+        for url in urls:
+            argv += ["--base-url", url]
+        cli.cmd_run(cli.build_parser().parse_args(argv))
+
+    assert sum(server.requests for server in stand_in_servers) == 9
+    assert all(server.requests for server in stand_in_servers)
+    shard_run = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert [result["task_id"] for result in shard_run["results"]] == ["t1", "t4", "t7"]
+    assert shard_run["endpoints"] == urls
+    assert sum(entry["requests"] for entry in shard_run["endpoint_stats"]) == 3
+    assert shard_run["results"][0]["latency"]["prompt_tokens"] == 7
+    assert shard_run["summary"]["latency"]["timed_tasks"] == 3
+
+    cli.cmd_merge(cli.build_parser().parse_args(["merge", "20260418-210102", "20260418-210100", "20260418-210101"]))
+
+    merged = json.loads((runs_dir / "run_20260418-210200.json").read_text(encoding="utf-8"))
+    assert [result["task_id"] for result in merged["results"]] == [task["id"] for task in tasks]
+    assert (merged["summary"]["passed"], merged["summary"]["total"]) == (9, 9)
+    assert merged["summary"]["latency"]["completion_tokens"] == 9
+    assert merged["merged_from"] == ["20260418-210100", "20260418-210101", "20260418-210102"]
+    assert "selection" not in merged
+
+    with RunStore(runs_dir / "index.sqlite") as store:
+        assert store.recent(1)[0]["merged_from"] == merged["merged_from"]
+
+
+def test_merge_rejects_incomplete_shard_sets(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "spread.json"
+    write_pack(pack_path, 4)
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: prompt.split()[-1])
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210100")
+
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--shard", "0/2", "--no-cache"]))
+    with pytest.raises(SystemExit, match="one run per shard 0..1"):
+        cli.cmd_merge(cli.build_parser().parse_args(["merge", "20260418-210100"]))
+
+
+def test_shards_started_in_the_same_second_get_distinct_run_ids(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "spread.json"
+    write_pack(pack_path, 4)
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: prompt.split()[-1])
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210100")
+
+    for shard in range(2):
+        argv = ["run", "--pack", str(pack_path), "--shard", f"{shard}/2", "--no-cache"]
+        cli.cmd_run(cli.build_parser().parse_args(argv))
+
+    second = json.loads((runs_dir / "run_20260418-210100-02.json").read_text(encoding="utf-8"))
+    assert [result["task_id"] for result in second["results"]] == ["t1", "t3"]
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210200")
+    cli.cmd_merge(cli.build_parser().parse_args(["merge", "20260418-210100", "20260418-210100-02"]))
+    merged = json.loads((runs_dir / "run_20260418-210200.json").read_text(encoding="utf-8"))
+    assert merged["summary"]["total"] == 4
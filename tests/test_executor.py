@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from harness.executor import iter_completed, iter_completed_by_key
+
+
+def test_iter_completed_sequential_preserves_order():
+    assert list(iter_completed(["a", "b", "c"], str.upper)) == [(0, "A"), (1, "B"), (2, "C")]
+
+
+def test_iter_completed_bounds_in_flight_and_consumes_lazily():
+    in_flight = 0
+    peak = 0
+    pulled = 0
+    lock = threading.Lock()
+
+    def items():
+        nonlocal pulled
+        for number in range(20):
+            pulled += 1
+            yield number
+
+    def worker(number):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.005)
+        with lock:
+            in_flight -= 1
+        return number * 2
+
+    stream = iter_completed(items(), worker, concurrency=3)
+    first = next(stream)
+    assert pulled <= 4
+    results = dict([first, *stream])
+
+    assert results == {index: index * 2 for index in range(20)}
+    assert peak <= 3
+
+
+def test_iter_completed_propagates_worker_errors():
+    def worker(number):
+        if number == 2:
+            raise RuntimeError("boom")
+        return number
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(iter_completed(range(5), worker, concurrency=2))
+
+
+def test_iter_completed_by_key_caps_each_key_and_prefers_earlier_keys():
+    in_flight = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0, "total": 0}
+    lock = threading.Lock()
+
+    def worker(key, number):
+        with lock:
+            in_flight[key] += 1
+            peak[key] = max(peak[key], in_flight[key])
+            peak["total"] = max(peak["total"], in_flight["a"] + in_flight["b"])
+        time.sleep(0.005)
+        with lock:
+            in_flight[key] -= 1
+        return key, number
+
+    streams = {"a": iter(range(6)), "b": iter(range(6))}
+    results = list(iter_completed_by_key(streams, worker, concurrency=3, key_limit=2))
+
+    assert sorted((key, index) for key, index, _ in results) == [(k, n) for k in "ab" for n in range(6)]
+    assert all(result == (key, index) for key, index, result in results)
+    assert peak == {"a": 2, "b": 2, "total": 3}
+    # "b" only gets the slot "a" cannot use until "a" runs out of items.
+    assert [key for key, _, _ in results[-2:]] == ["b", "b"]
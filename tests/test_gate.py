@@ -0,0 +1,120 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.gate import Gate
+from harness.resilience import ResilientClient, TaskCancelled, task_scope
+from harness.store import RunStore
+from harness.summary import render_summary
+
+
+def test_gate_decides_as_soon_as_the_rest_cannot_change_the_outcome():
+    gate = Gate(10, min_score=0.8)
+    for ok in (True, False, False):
+        gate.add(ok)
+    assert gate.outcome() is None
+    gate.add(False)
+    assert gate.outcome() == "fail" and gate.remaining == 6
+    assert gate.should_stop("fail") and gate.should_stop("decided") and not gate.should_stop("never")
+
+    gate = Gate(10, max_failures=3)
+    for _ in range(7):
+        gate.add(True)
+    assert gate.outcome() == "pass"
+    assert not gate.should_stop("fail") and gate.should_stop("decided")
+
+
+def test_cancelled_stream_is_closed_and_raises():
+    closed = []
+
+    class Stream:
+        def __iter__(self):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="a"))], usage=None)
+            cancel.set()
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="b"))], usage=None)
+
+        def close(self):
+            closed.append(True)
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: Stream())))
+    client = ResilientClient(fake, "http://gpu")
+    cancel = threading.Event()
+    with task_scope("t", cancel=cancel), pytest.raises(TaskCancelled):
+        list(client.chat.completions.create(model="m", messages=[], stream=True))
+    assert closed == [True]
+    with task_scope("t", cancel=cancel), pytest.raises(TaskCancelled):
+        client.chat.completions.create(model="m", messages=[], stream=True)
+
+
+def test_cmd_run_stops_early_and_writes_a_partial_run(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": "Reply READY", "expected": "READY"} for n in range(10)]
+    pack_path.write_text(json.dumps({"name": "gate", "tasks": tasks}), encoding="utf-8")
+
+    calls = []
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: calls.append(prompt) or "NOPE")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+    args = cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache", "--max-failures", "2"])
+    with pytest.raises(SystemExit, match="GATE FAILED"):
+        cli.cmd_run(args)
+
+    assert len(calls) == 3
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["summary"] == {"passed": 0, "total": 3}
+    assert run_data["early_stop"]["outcome"] == "fail"
+    assert (run_data["early_stop"]["completed"], run_data["early_stop"]["skipped"]) == (3, 7)
+    assert run_data["gate"]["outcome"] == "fail" and run_data["gate"]["max_failures"] == 2
+    report = (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+    assert "- Gate: FAIL (failures <= 2; 0 passed, 3 failed)" in report
+    assert "7 task(s) not run" in report
+    with RunStore(runs_dir / "index.sqlite") as store:
+        [entry] = store.recent(1)
+    assert (entry["early_stop"], entry["pack_total"]) == ("fail", 10)
+    assert "pack=gate  stopped early 3/10" in render_summary([entry])
+
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: "READY")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210202")
+    cli.cmd_run(
+        cli.build_parser().parse_args(
+            ["run", "--pack", str(pack_path), "--no-cache", "--min-score", "0.5", "--early-stop", "decided"]
+        )
+    )
+    run_data = json.loads((runs_dir / "run_20260418-210202.json").read_text(encoding="utf-8"))
+    assert run_data["summary"]["total"] == 5
+    assert run_data["early_stop"]["outcome"] == "pass"
+
+
+def test_resuming_a_stopped_run_keeps_the_gate_unless_early_stop_is_given(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": "Reply READY", "expected": "READY"} for n in range(5)]
+    pack_path.write_text(json.dumps({"name": "gate", "tasks": tasks}), encoding="utf-8")
+
+    calls = []
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: calls.append(prompt) or "NOPE")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+    argv = ["run", "--pack", str(pack_path), "--no-cache", "--max-failures", "0"]
+    with pytest.raises(SystemExit, match="GATE FAILED"):
+        cli.cmd_run(cli.build_parser().parse_args(argv))
+    assert len(calls) == 1
+    assert "--resume 20260418-210101 --early-stop never" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit, match="GATE FAILED"):
+        cli.cmd_run(cli.build_parser().parse_args(["run", "--resume", "20260418-210101", "--no-cache"]))
+    assert len(calls) == 1
+    assert "Gate already decided (fail)" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit, match="GATE FAILED"):
+        argv = ["run", "--resume", "20260418-210101", "--no-cache", "--early-stop", "never"]
+        cli.cmd_run(cli.build_parser().parse_args(argv))
+    assert len(calls) == 5
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["summary"]["total"] == 5
+    assert run_data["gate"]["early_stop"] == "never"
+    assert "early_stop" not in run_data
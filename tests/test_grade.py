@@ -1,5 +1,8 @@
+from types import SimpleNamespace
+
 import pytest
 
+from harness import graders
 from harness.cli import grade
 
 
@@ -36,3 +39,80 @@ def test_grade_refusal_check(output, expected):
     ok, detail = grade(task, output)
     assert ok is True
     assert detail["refused"] == expected
+
+
+def test_grade_contains_reports_missing_words_including_overlapping_ones():
+    task = {"type": "contains", "expected_contains": ["Alpha", "alph", "pha", "delta", ""]}
+    ok, detail = grade(task, "ALPHA and beta")
+    assert ok is False
+    assert detail["missing"] == ["delta"]
+
+
+def test_grade_regex():
+    task = {"type": "regex", "pattern": r"answer:\s*(yes|no)", "ignore_case": True}
+    ok, detail = grade(task, "Final ANSWER: yes")
+    assert ok is True
+    assert detail["matched"] == "ANSWER: yes"
+
+    strict = {"type": "regex", "pattern": r"\d+", "match": "fullmatch"}
+    assert grade(strict, " 42 \n")[0] is True
+    assert grade(strict, "42 apples")[0] is False
+
+
+@pytest.mark.parametrize(
+    "output,expected",
+    [
+        ("3.1416", True),
+        ("Working: 22/7 = 3.1428..., so the answer is 3.14", True),
+        ("about 3.2", False),
+        ("no idea", False),
+    ],
+)
+def test_grade_numeric_tolerance(output, expected):
+    task = {"type": "numeric_tolerance", "expected": 3.1416, "tolerance": 0.002}
+    ok, detail = grade(task, output)
+    assert ok is expected
+
+
+def test_grade_numeric_tolerance_relative_and_thousands_separators():
+    task = {"type": "numeric_tolerance", "expected": 1_000_000, "relative_tolerance": 0.01}
+    assert grade(task, "Roughly 1,004,000 people.")[0] is True
+    assert grade(task, "Roughly 1,020,000 people.")[0] is False
+
+
+def test_grade_json_schema():
+    task = {
+        "type": "json_schema",
+        "schema": {
+            "type": "object",
+            "required": ["name", "tags"],
+            "additionalProperties": False,
+            "properties": {
+                "name": {"type": "string", "minLength": 1},
+                "tags": {"type": "array", "items": {"enum": ["a", "b"]}, "maxItems": 2},
+            },
+        },
+    }
+    assert grade(task, '{"name": "x", "tags": ["a"]}') == (True, {"got": {"name": "x", "tags": ["a"]}})
+    ok, detail = grade(task, '{"name": "x", "tags": ["c"]}')
+    assert ok is False
+    assert detail["error"] == "$.tags[0]: not one of ['a', 'b']"
+    assert grade(task, '{"name": "x", "tags": [], "extra": 1}')[1]["error"] == "$: unexpected property 'extra'"
+    assert "json_parse_failed" in grade(task, "not json")[1]["error"]
+
+
+def test_grade_unknown_type():
+    assert grade({"type": "nope"}, "x") == (False, {"error": "unknown task type nope"})
+
+
+def test_plugin_graders_are_loaded_from_entry_points(monkeypatch):
+    def compile_shout(task):
+        return lambda output, judge_with: (output.isupper(), {"got": output})
+
+    entry_point = SimpleNamespace(name="shout", value="plugin:SHOUT", load=lambda: graders.Grader(compile_shout))
+    monkeypatch.setattr(graders, "entry_points", lambda group: [entry_point] if group == "harness.graders" else [])
+    monkeypatch.setattr(graders, "_plugins_loaded", False)
+    monkeypatch.setattr(graders, "GRADERS", dict(graders.GRADERS))
+
+    assert "shout" in graders.task_types()
+    assert grade({"type": "shout"}, "HEY")[0] is True
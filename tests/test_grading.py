@@ -0,0 +1,75 @@
+import json
+
+from harness import cli, graders
+from harness.graders import Grader
+from harness.grading import GradePool
+
+
+def test_grade_pool_grades_in_chunks_and_passes_graded_items_through():
+    schema_task = {"id": "s", "type": "json_schema", "prompt": "p", "schema": {"type": "object", "required": ["a"]}}
+    exact_task = {"id": "e", "type": "exact_match", "prompt": "p", "expected": "OK"}
+    items = [
+        (0, schema_task, {"task_id": "s", "output": '{"a": 1}', "pass": None, "detail": None}),
+        (1, exact_task, {"task_id": "e", "output": "", "pass": False, "detail": {"error": "timeout"}}),
+        (2, exact_task, {"task_id": "e", "output": "nope", "pass": None, "detail": None}),
+    ]
+    samples = [{"output": "OK"}, {"output": " OK "}, {"output": "no"}]
+    items.append((3, exact_task, {"task_id": "e", "output": "OK", "pass": None, "detail": None, "samples": samples}))
+    with GradePool(2, chunk_size=2, max_wait=5.0) as pool:
+        graded = {key: result for key, _, result in pool.graded(items)}
+        # An idle pool takes each result as it arrives instead of holding it for a full chunk.
+        assert pool.chunks == 3
+        # Workers never fork the parent, which may already run request threads.
+        assert pool._executor._mp_context.get_start_method() != "fork"
+
+    assert graded[0]["pass"] is True and graded[0]["detail"] == {"got": {"a": 1}}
+    assert graded[1]["detail"] == {"error": "timeout"}
+    assert graded[2]["pass"] is False and graded[2]["detail"]["got"] == "nope"
+    assert graded[3]["pass"] is True
+    assert graded[3]["sampling"]["passed"] == 2
+    assert [sample["pass"] for sample in graded[3]["samples"]] == [True, True, False]
+
+
+def test_grade_pool_hands_results_on_and_grades_runtime_graders_in_process(monkeypatch):
+    monkeypatch.setattr(graders, "GRADERS", dict(graders.GRADERS))
+    monkeypatch.setattr(graders, "_runtime_graders", set())
+    graders.register_grader("shout", Grader(lambda task: lambda output, judge: (output.isupper(), {"got": output})))
+    shout_task = {"id": "s", "type": "shout", "prompt": "p"}
+    exact_task = {"id": "e", "type": "exact_match", "prompt": "p", "expected": "OK"}
+    seen = []
+
+    def items():
+        yield 0, exact_task, {"task_id": "e", "output": "OK", "pass": None, "detail": None}
+        yield 1, shout_task, {"task_id": "s", "output": "LOUD", "pass": None, "detail": None}
+        # Both results reached the caller before the run produced another one.
+        assert seen == [0, 1]
+
+    with GradePool(1, chunk_size=64, max_wait=5.0) as pool:
+        for key, _, result in pool.graded(items()):
+            seen.append(key)
+            assert result["pass"] is True
+        assert pool.chunks == 1
+
+
+def test_cmd_run_with_grade_workers_matches_inline_grading(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [
+        {"id": f"t{n}", "type": "regex", "prompt": f"Say {n}", "pattern": r"^\d+$", "match": "fullmatch"}
+        for n in range(7)
+    ]
+    pack_path.write_text(json.dumps({"name": "regex", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: prompt.split()[-1] if "3" not in prompt else "three")
+
+    for stamp, extra in (("20260418-210101", []), ("20260418-210202", ["--grade-workers", "2", "--grade-chunk-size", "3"])):
+        monkeypatch.setattr(cli.time, "strftime", lambda fmt, stamp=stamp: stamp)
+        cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache", "--concurrency", "2", *extra]))
+
+    inline, pooled = (
+        json.loads((runs_dir / f"run_{stamp}.json").read_text(encoding="utf-8"))
+        for stamp in ("20260418-210101", "20260418-210202")
+    )
+    assert pooled["summary"] == inline["summary"] == {"passed": 6, "total": 7}
+    for before, after in zip(inline["results"], pooled["results"]):
+        assert (before["task_id"], before["pass"], before["detail"]) == (after["task_id"], after["pass"], after["detail"])
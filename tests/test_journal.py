@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from harness import cli
+from harness.journal import RunJournal, completed_task_ids, index_journal, read_header, write_run_file
+
+
+def result(task_id, ok=True):
+    return {"task_id": task_id, "type": "exact_match", "prompt": "p", "output": "o", "pass": ok, "detail": {}}
+
+
+def test_write_run_file_matches_json_dumps(tmp_path):
+    run_data = {
+        "run_id": "r1",
+        "summary": {"passed": 1, "total": 2},
+        "results": [result("a"), {**result("b", ok=False), "detail": {"nested": {"x": [1, 2]}}}],
+    }
+    path = tmp_path / "run.json"
+    write_run_file(path, {**run_data, "results": iter(run_data["results"])})
+    assert path.read_text(encoding="utf-8") == json.dumps(run_data, indent=2)
+
+    write_run_file(path, {"run_id": "r2", "results": []})
+    assert path.read_text(encoding="utf-8") == json.dumps({"run_id": "r2", "results": []}, indent=2)
+
+
+def test_journal_orders_results_and_survives_torn_lines(tmp_path):
+    path = tmp_path / "run_r1.jsonl"
+    with RunJournal.create(path, {"run_id": "r1"}, fsync_interval=0) as journal:
+        journal.append(2, result("c"))
+        journal.append(0, result("a", ok=False))
+
+    with path.open("ab") as handle:
+        handle.write(b'{"index": 1, "result": {"task_')
+
+    assert read_header(path) == {"run_id": "r1"}
+    assert completed_task_ids(path) == {"a", "c"}
+
+    with RunJournal.reopen(path) as journal:
+        journal.append(1, result("b"))
+        journal.append(0, result("a"))
+
+    header, results, passed = index_journal(path)
+    assert header == {"run_id": "r1"}
+    assert [item["task_id"] for item in results] == ["a", "b", "c"]
+    assert len(results) == 3
+    assert passed == 3
+
+    with pytest.raises(FileExistsError):
+        RunJournal.create(path, {"run_id": "r1"})
+
+
+def test_cmd_run_resume_skips_journaled_tasks(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    tasks = [
+        {"id": f"task_{i}", "type": "exact_match", "prompt": f"Reply with exactly: {i}", "expected": str(i)}
+        for i in range(4)
+    ]
+    pack_path.write_text(json.dumps({"name": "smoke", "tasks": tasks}), encoding="utf-8")
+
+    asked = []
+
+    def crashing_chat(client, model, prompt):
+        if prompt.endswith("2"):
+            raise KeyboardInterrupt
+        asked.append(prompt)
+        return prompt.rsplit(" ", 1)[1]
+
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "chat", crashing_chat)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    with pytest.raises(SystemExit, match="harness run --resume 20260418-210101"):
+        cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache"]))
+    assert not (runs_dir / "run_20260418-210101.json").exists()
+    assert completed_task_ids(runs_dir / "run_20260418-210101.jsonl") == {"task_0", "task_1"}
+
+    def chat(client, model, prompt):
+        asked.append(prompt)
+        return prompt.rsplit(" ", 1)[1]
+
+    monkeypatch.setattr(cli, "chat", chat)
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--resume", "20260418-210101", "--no-cache"]))
+
+    assert asked == [task["prompt"] for task in tasks]
+    out = capsys.readouterr().out
+    assert "Resuming 20260418-210101: 2 task(s) already journaled." in out
+
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert [item["task_id"] for item in run_data["results"]] == [task["id"] for task in tasks]
+    assert run_data["summary"] == {"passed": 4, "total": 4}
+    assert run_data["pack"]["path"] == pack_path.as_posix()
@@ -1,4 +1,9 @@
-from harness.judge import _try_parse_json
+import json
+import threading
+from types import SimpleNamespace
+
+from harness import cli
+from harness.judge import JudgeBatcher, _try_parse_json, judge_batch
 
 
 def test_try_parse_json_accepts_direct_json():
@@ -13,3 +18,97 @@ def test_try_parse_json_extracts_wrapped_object():
 
 def test_try_parse_json_returns_none_for_invalid_text():
     assert _try_parse_json("not json at all") is None
+
+
+
+class ScriptedJudge:
+    """Streams back a reply computed from the request's messages and counts requests."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream, stream_options, **params):
+        self.requests.append((model, messages))
+        delta = SimpleNamespace(content=self.reply(messages))
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)])
+
+
+def _batch_or_single(messages):
+    items = json.loads(messages[-1]["content"])
+    if isinstance(items, dict):
+        return json.dumps({"overall": 3, "rationale": "single"})
+    # Score every item except index 1, in reverse order to exercise index matching.
+    return json.dumps([{"index": item["index"], "overall": 5} for item in reversed(items) if item["index"] != 1])
+
+
+def test_judge_batch_matches_indexes_and_leaves_gaps():
+    client = ScriptedJudge(_batch_or_single)
+    scores = judge_batch(client, "judge", [("p0", "a0"), ("p1", "a1"), ("p2", "a2")])
+    assert scores == [{"overall": 5}, None, {"overall": 5}]
+    assert len(client.requests) == 1
+
+
+def test_batcher_scores_concurrent_answers_in_one_request_and_falls_back_per_item():
+    client = ScriptedJudge(_batch_or_single)
+    batcher = JudgeBatcher(client, "judge", batch_size=3, max_wait=5.0)
+    results = {}
+
+    def work(n):
+        results[n] = batcher.judge(f"p{n}", f"a{n}")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(result["overall"] for result in results.values()) == [3, 5, 5]
+    assert len(client.requests) == 2
+    assert batcher.stats() == {"batch_size": 3, "batches": 1, "fallbacks": 1}
+
+
+def test_cmd_run_sends_judge_tasks_to_separate_judge_model(tmp_path, monkeypatch):
+    pack_path = tmp_path / "judged.json"
+    tasks = [{"id": f"explain_{n}", "type": "judge", "prompt": f"Explain {n}"} for n in range(4)]
+    pack_path.write_text(json.dumps({"name": "judged", "tasks": tasks}), encoding="utf-8")
+
+    judge_client = ScriptedJudge(lambda messages: json.dumps([{"index": i, "overall": 4} for i in range(2)]))
+    clients = {"http://judge:8080/v1": judge_client}
+    monkeypatch.setattr(cli, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(cli, "OpenAI", lambda base_url, **kwargs: clients.get(base_url, object()))
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: f"Answer to {prompt}")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    args = cli.build_parser().parse_args(
+        [
+            "run",
+            "--pack",
+            str(pack_path),
+            "--no-cache",
+            "--concurrency",
+            "2",
+            "--judge-model",
+            "small-judge",
+            "--judge-base-url",
+            "http://judge:8080/v1",
+            "--judge-batch-size",
+            "2",
+            "--judge-batch-wait",
+            "5",
+        ]
+    )
+    cli.cmd_run(args)
+
+    run_data = json.loads((tmp_path / "runs" / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["summary"]["passed"] == 4
+    assert run_data["judge"] == {
+        "model": "small-judge",
+        "base_url": "http://judge:8080/v1",
+        "batch_size": 2,
+        "batches": 2,
+        "fallbacks": 0,
+    }
+    assert {model for model, _ in judge_client.requests} == {"small-judge"}
+    assert len(judge_client.requests) == 2
@@ -0,0 +1,105 @@
+import json
+
+from harness import cli
+from harness.matrix import render_matrix_report
+from harness.store import RunStore
+
+
+def test_cmd_matrix_runs_cross_product_and_writes_comparison(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    exact = tmp_path / "exact.json"
+    exact.write_text(
+        json.dumps(
+            {
+                "name": "exact",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Say READY", "expected": "READY"},
+                    {"id": "done", "type": "exact_match", "prompt": "Say DONE", "expected": "DONE"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    words = tmp_path / "words.json"
+    words.write_text(
+        json.dumps(
+            {
+                "name": "words",
+                "tasks": [{"id": "colors", "type": "contains", "prompt": "Name colors", "expected_contains": ["red"]}],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    answers = {
+        "big": {"Say READY": "READY", "Say DONE": "DONE", "Name colors": "red, blue"},
+        "small": {"Say READY": "READY", "Say DONE": "done", "Name colors": "blue"},
+    }
+    clients = []
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: clients.append(kwargs) or object())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: answers[model][prompt])
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    args = cli.build_parser().parse_args(
+        [
+            "matrix",
+            "--model",
+            "big",
+            "--model",
+            "small",
+            "--pack",
+            str(exact),
+            "--pack",
+            str(words),
+            "--concurrency",
+            "4",
+            "--per-model-concurrency",
+            "2",
+            "--no-cache",
+        ]
+    )
+    cli.cmd_matrix(args)
+
+    assert len(clients) == 1
+    matrix = json.loads((runs_dir / "matrix_20260418-210101.json").read_text(encoding="utf-8"))
+    assert matrix["per_model_concurrency"] == 2
+    scores = {(cell["model"], cell["pack"]): (cell["passed"], cell["total"]) for cell in matrix["cells"]}
+    assert scores == {("big", "exact"): (2, 2), ("big", "words"): (1, 1), ("small", "exact"): (1, 2), ("small", "words"): (0, 1)}
+
+    run = json.loads((runs_dir / "run_20260418-210101-03.json").read_text(encoding="utf-8"))
+    assert (run["model"], run["pack"]["name"], run["matrix"]) == ("small", "exact", "20260418-210101")
+    assert [result["task_id"] for result in run["results"]] == ["ready", "done"]
+
+    report = (runs_dir / "matrix_20260418-210101.md").read_text(encoding="utf-8")
+    assert "| `big` | 2/2 (100.0%) | 1/1 (100.0%) | **3/3** (100.0%) |" in report
+    assert "| `done` | PASS | **FAIL** |" in report
+
+    with RunStore(runs_dir / "index.sqlite") as store:
+        assert [entry["matrix"] for entry in store.recent(10)] == ["20260418-210101"] * 4
+
+
+def test_matrix_report_keeps_packs_with_the_same_name_apart():
+    def cell(path, passed, grid):
+        return {
+            "model": "m",
+            "pack": "smoke",
+            "pack_path": path,
+            "run_id": path[0],
+            "passed": passed,
+            "total": 1,
+            "latency": None,
+            "grid": grid,
+        }
+
+    report = render_matrix_report(
+        {
+            "matrix_id": "20260418-210101",
+            "base_url": "http://localhost:1234/v1",
+            "models": ["m"],
+            "packs": [{"name": "smoke", "path": "a/smoke.json"}, {"name": "smoke", "path": "b/smoke.json"}],
+            "cells": [cell("a/smoke.json", 1, {"x": True}), cell("b/smoke.json", 0, {"y": False})],
+        }
+    )
+    assert "| `m` | 1/1 (100.0%) | 0/1 (0.0%) | **1/2** (50.0%) |" in report
+    assert "## Tasks: smoke (b/smoke.json)\n| Task | `m` |\n| --- | --- |\n| `y` | **FAIL** |" in report
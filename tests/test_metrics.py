@@ -0,0 +1,105 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.metrics import LatencyStats, percentile, task_latency
+from harness.store import RunStore
+
+
+def test_percentile_interpolates_sorted_values():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 50) == pytest.approx(2.5)
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 4.0
+    assert percentile([], 50) is None
+
+
+def test_task_latency_separates_model_and_judge_calls():
+    calls = [
+        {"kind": "chat", "wall_s": 1.0, "ttft_s": 0.2, "prompt_tokens": 10, "completion_tokens": 40, "cached": False},
+        {"kind": "judge", "wall_s": 0.5, "ttft_s": 0.1, "prompt_tokens": 90, "completion_tokens": 30, "cached": False},
+    ]
+    latency = task_latency(calls, wall_s=1.6)
+    assert latency["wall_s"] == 1.6
+    assert latency["ttft_s"] == 0.2
+    assert latency["prompt_tokens"] == 10
+    assert latency["completion_tokens"] == 40
+    assert latency["tokens_per_s"] == pytest.approx(50.0)
+    assert latency["judge_wall_s"] == 0.5
+    assert task_latency([], wall_s=1.0) is None
+
+
+def test_latency_stats_skips_cached_results():
+    stats = LatencyStats()
+    for wall in (1.0, 2.0, 3.0):
+        stats.add({"wall_s": wall, "ttft_s": wall / 10, "prompt_tokens": 5, "completion_tokens": 10})
+    stats.add({"wall_s": 0.0001, "cached": True})
+    stats.add(None)
+
+    summary = stats.summary(elapsed_s=3.0)
+    assert summary["timed_tasks"] == 3
+    assert summary["cached_tasks"] == 1
+    assert summary["wall_s"]["p50"] == 2.0
+    assert summary["completion_tokens"] == 30
+    assert summary["completion_tokens_per_s"] == 10.0
+    assert "judge_wall_s" not in summary
+    assert LatencyStats().summary() is None
+
+
+class StreamingClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream, stream_options, **params):
+        assert stream and stream_options == {"include_usage": True}
+        answer = messages[-1]["content"].split()[-1]
+        return iter(
+            [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer))], usage=None),
+                SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3)),
+            ]
+        )
+
+
+def test_cmd_run_records_latency_in_results_summary_report_and_index(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Reply with exactly: READY", "expected": "READY"},
+                    {"id": "go", "type": "exact_match", "prompt": "Reply with exactly: GO", "expected": "GO"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: StreamingClient())
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache"]))
+
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    first = run_data["results"][0]["latency"]
+    assert first["prompt_tokens"] == 12 and first["completion_tokens"] == 3
+    assert first["ttft_s"] is not None and first["wall_s"] >= first["ttft_s"]
+
+    latency = run_data["summary"]["latency"]
+    assert latency["timed_tasks"] == 2
+    assert latency["completion_tokens"] == 6
+    assert set(latency["wall_s"]) == {"p50", "p90", "p99", "mean"}
+
+    report = (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+    assert "## Latency" in report
+    assert "| Time to first token (s) |" in report
+    assert "- Latency: wall " in report
+
+    with RunStore(runs_dir / "index.sqlite") as store:
+        entry = store.recent(1)[0]
+    assert entry["latency_p50_s"] == latency["wall_s"]["p50"]
+    assert entry["ttft_p50_s"] == latency["ttft_s"]["p50"]
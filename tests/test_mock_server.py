@@ -0,0 +1,46 @@
+import json
+import random
+
+import pytest
+
+from harness import cli
+from harness.mock_server import MockConfig, MockServer, parse_latency, sample_latency, scripted_answers
+
+
+def test_latency_specs_parse_and_sample_deterministically():
+    assert parse_latency("fixed:0.5") == ("fixed", (0.5,))
+    lognormal = parse_latency("lognormal:0.2,0.5")
+    samples = [sample_latency(lognormal, random.Random(n)) for n in range(200)]
+    assert samples == [sample_latency(lognormal, random.Random(n)) for n in range(200)]
+    assert 0.15 < sorted(samples)[100] < 0.25
+    with pytest.raises(ValueError, match="distribution must be one of"):
+        parse_latency("gamma:1")
+    with pytest.raises(ValueError, match="uniform takes 2"):
+        parse_latency("uniform:1")
+
+
+def test_cmd_run_against_mock_server_streams_scripted_answers_and_retries_errors(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": f"Say {n}", "expected": str(n)} for n in range(6)]
+    pack_path.write_text(json.dumps({"name": "mock", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    answers = scripted_answers(tasks, {"t5": ["wrong", "5"]})
+    config = MockConfig(tokens_per_s=1000, error_rate=0.3, error_status=429, answers=answers, seed=3)
+    with MockServer(config) as server:
+        args = cli.build_parser().parse_args(
+            ["run", "--pack", str(pack_path), "--base-url", server.base_url, "--no-cache", "--concurrency", "3"]
+        )
+        cli.cmd_run(args)
+        stats = server.backend.stats()
+
+    run = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert {result["task_id"]: result["pass"] for result in run["results"]} == {
+        "t0": True, "t1": True, "t2": True, "t3": True, "t4": True, "t5": False
+    }
+    assert run["results"][0]["latency"]["completion_tokens"] == 1
+    assert stats["errors"] > 0
+    assert stats["requests"] == 6 + stats["errors"]
+    assert run["resilience"][0]["throttles"] == stats["errors"]
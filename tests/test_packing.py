@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.metrics import record_calls
+from harness.mock_server import MockConfig, MockServer, scripted_answers
+from harness.packing import CALIBRATION_PROMPTS, PromptPacker
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.batches = []
+        self.completions = SimpleNamespace(create=self.create)
+
+    def create(self, model, prompt, **params):
+        self.batches.append(list(prompt))
+        choices = [SimpleNamespace(index=index, text=f" {text.upper()}") for index, text in enumerate(prompt)]
+        return SimpleNamespace(choices=choices[::-1], usage=SimpleNamespace(prompt_tokens=40, completion_tokens=8))
+
+
+def test_packer_fills_batches_to_token_budget_and_demultiplexes():
+    client = FakeCompletions()
+    packer = PromptPacker(client, "m", max_prompts=8, max_tokens=10, max_wait=5.0, calibrate=0)
+    prompts = ["a" * 16, "b" * 16, "c" * 8, "d" * 40]
+    outputs, calls = {}, {}
+
+    def ask(prompt):
+        with record_calls() as recorded:
+            outputs[prompt] = packer.complete(prompt)
+        calls[prompt] = recorded
+
+    threads = []
+    for prompt in prompts:
+        threads.append(threading.Thread(target=ask, args=(prompt,)))
+        threads[-1].start()
+        # Queue the prompts in order: wait until this one is pending or sent.
+        while all(entry.prompt != prompt for entry in packer._pending) and not any(
+            prompt in batch for batch in client.batches
+        ):
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+
+    assert outputs == {prompt: prompt.upper() for prompt in prompts}
+    # 4 + 4 + 2 estimated tokens fill the first batch; the 10-token prompt goes out on its own.
+    assert sorted(map(sorted, client.batches)) == [sorted(prompts[:3]), [prompts[3]]]
+    [call] = calls[prompts[0]]
+    assert (call["prompt_tokens"], call["ttft_s"]) == (16, None)
+    assert packer.stats()["requests"] == 2
+
+
+def test_cmd_run_packs_prompts_into_completions_requests(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": f"Say {n}", "expected": str(n)} for n in range(24)]
+    pack_path.write_text(json.dumps({"name": "short", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    with MockServer(MockConfig(latency=("fixed", (0.05,)), answers=scripted_answers(tasks))) as server:
+        args = cli.build_parser().parse_args(
+            [
+                "run", "--pack", str(pack_path), "--base-url", server.base_url, "--no-cache", "--no-adaptive",
+                "--concurrency", "8", "--prompt-batch-size", "8", "--prompt-batch-wait", "1",
+            ]
+        )
+        cli.cmd_run(args)
+        stats = server.backend.stats()
+
+    run = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run["summary"]["passed"] == 24
+    packing = run["packing"]
+    assert packing["prompts"] == 24
+    assert packing["requests"] == stats["requests"] == CALIBRATION_PROMPTS + 2
+    assert packing["estimated_saved_request_s"] > 0.5
+    assert run["results"][-1]["latency"]["prompt_tokens"] == 1
+    report = (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+    assert "## Request Packing\n- 24 prompt(s) in 10 /v1/completions request(s), 58% fewer requests" in report
+
+
+def test_cmd_run_rejects_batches_larger_than_concurrency(tmp_path, monkeypatch):
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": "t", "type": "exact_match", "prompt": "Say 1", "expected": "1"}]
+    pack_path.write_text(json.dumps({"name": "short", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", tmp_path / "runs")
+
+    argv = ["run", "--pack", str(pack_path), "--concurrency", "4", "--prompt-batch-size", "8"]
+    args = cli.build_parser().parse_args(argv)
+    with pytest.raises(SystemExit, match="--prompt-batch-size 8 cannot fill with --concurrency 4"):
+        cli.cmd_run(args)
+    assert not list((tmp_path / "runs").glob("run_*"))
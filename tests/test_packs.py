@@ -6,6 +6,7 @@ import pytest
 
 from harness import cli
 from harness.cli import PackValidationError, cmd_packs, cmd_validate, load_pack
+from harness.packs import Selection, open_pack
 
 
 def test_load_pack_success():
@@ -34,6 +35,23 @@ def test_load_pack_missing_fields(tmp_path):
         load_pack(pack_path)
 
 
+@pytest.mark.parametrize(
+    "task,message",
+    [
+        ({"type": "regex", "pattern": "(unclosed"}, r"Task 0 \(regex\) field 'pattern' is not a valid regex"),
+        ({"type": "numeric_tolerance", "expected": "3"}, "Task 0 field 'expected' must be a number"),
+        ({"type": "json_schema", "schema": {"oneOf": []}}, "unsupported schema keyword"),
+        ({"type": "contains", "expected_contains": "x"}, "Task 0 field 'expected_contains' must be a list"),
+    ],
+)
+def test_load_pack_rejects_specs_that_cannot_be_compiled(tmp_path, task, message):
+    pack_path = tmp_path / "invalid.json"
+    pack_path.write_text(json.dumps({"tasks": [{"id": "t", "prompt": "p", **task}]}), encoding="utf-8")
+
+    with pytest.raises(PackValidationError, match=message):
+        load_pack(pack_path)
+
+
 def test_cmd_packs_prints_metadata(tmp_path, monkeypatch, capsys):
     alpha = tmp_path / "alpha.json"
     beta = tmp_path / "beta.json"
@@ -86,3 +104,69 @@ def test_cmd_validate_checks_every_pack(tmp_path, monkeypatch, capsys):
     out = capsys.readouterr().out
     assert "valid: " in out
     assert "Validated 1 pack(s)." in out
+
+
+def write_jsonl_pack(path, count, header=None):
+    lines = [json.dumps(header or {"name": "stream", "description": "Streaming pack."})]
+    lines.extend(
+        json.dumps({"id": f"t{i}", "type": "exact_match", "prompt": f"Say {i}", "expected": str(i)})
+        for i in range(count)
+    )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_open_pack_streams_jsonl_slice_without_parsing_the_rest(tmp_path):
+    pack_path = tmp_path / "big.jsonl"
+    write_jsonl_pack(pack_path, 50)
+    with pack_path.open("a", encoding="utf-8") as handle:
+        handle.write("{not json\n")
+
+    pack = open_pack(pack_path, Selection(offset=10, limit=3))
+    assert pack.name == "stream"
+    assert pack.count() == 3
+    assert [task["id"] for task in pack] == ["t10", "t11", "t12"]
+
+    with pytest.raises(PackValidationError, match="line 52 is not valid JSON"):
+        list(open_pack(pack_path))
+
+
+def test_selection_sample_is_seeded_and_matches_count(tmp_path):
+    pack_path = tmp_path / "big.jsonl"
+    write_jsonl_pack(pack_path, 200)
+
+    first = open_pack(pack_path, Selection(sample=0.1, seed=7))
+    ids = [task["id"] for task in first]
+    assert 5 < len(ids) < 40
+    assert first.count() == len(ids)
+    assert ids == [task["id"] for task in open_pack(pack_path, Selection(sample=0.1, seed=7))]
+    assert ids != [task["id"] for task in open_pack(pack_path, Selection(sample=0.1, seed=8))]
+
+
+def test_jsonl_pack_validates_tasks_lazily(tmp_path):
+    pack_path = tmp_path / "bad.jsonl"
+    pack_path.write_text(
+        json.dumps({"name": "bad"}) + "\n"
+        + json.dumps({"id": "ok", "type": "exact_match", "prompt": "p", "expected": "x"}) + "\n"
+        + json.dumps({"id": "broken", "type": "exact_match", "prompt": "p"}) + "\n",
+        encoding="utf-8",
+    )
+    tasks = iter(open_pack(pack_path))
+    assert next(tasks)["id"] == "ok"
+    with pytest.raises(PackValidationError, match=r"Task 1 \(exact_match\) missing required field"):
+        next(tasks)
+
+    with pytest.raises(PackValidationError, match="header object"):
+        pack_path.write_text(json.dumps({"id": "t", "type": "exact_match", "prompt": "p"}) + "\n", encoding="utf-8")
+        open_pack(pack_path)
+
+
+def test_cmd_validate_streams_jsonl_packs(tmp_path, monkeypatch, capsys):
+    write_jsonl_pack(tmp_path / "stream.jsonl", 25)
+
+    monkeypatch.setattr(cli, "EVALS_DIR", tmp_path)
+    cmd_validate(argparse.Namespace(pack=None))
+    cmd_packs(argparse.Namespace())
+
+    out = capsys.readouterr().out
+    assert "valid: " in out and "stream.jsonl (25 tasks)" in out
+    assert "stream.jsonl | stream | 25 tasks | Streaming pack." in out
@@ -0,0 +1,49 @@
+import json
+
+from harness import cli
+from harness.mock_server import MockConfig, MockServer, scripted_answers
+from harness.pools import ConnectionPools
+
+
+def test_one_pool_per_endpoint_is_shared():
+    pools = ConnectionPools({"max_connections": 2})
+    try:
+        first = pools.http_client("http://a/v1")
+        assert pools.http_client("http://a/v1") is first
+        assert pools.http_client("http://b/v1") is not first
+        assert [stats["base_url"] for stats in pools.stats()] == ["http://a/v1", "http://b/v1"]
+    finally:
+        pools.close()
+
+
+def test_cmd_run_reuses_connections_and_reports_pool_wait(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": f"Say {n}", "expected": str(n)} for n in range(6)]
+    pack_path.write_text(json.dumps({"name": "pool", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    config = MockConfig(latency=("fixed", (0.05,)), answers=scripted_answers(tasks))
+    with MockServer(config) as server:
+        args = cli.build_parser().parse_args(
+            [
+                "run", "--pack", str(pack_path), "--base-url", server.base_url, "--no-cache",
+                "--concurrency", "3", "--no-adaptive", "--max-connections", "1",
+            ]
+        )
+        cli.cmd_run(args)
+
+    run = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run["summary"]["passed"] == 6
+    pools = run["connection_pools"]
+    assert pools["max_connections"] == 1
+    [endpoint] = pools["endpoints"]
+    # Streams are read to the end on close, so one kept-alive connection serves every request.
+    assert (endpoint["requests"], endpoint["connections"]) == (6, 1)
+    assert endpoint["max_pool_wait_s"] > 0.03
+    assert all(result["latency"]["pool_wait_s"] >= 0 for result in run["results"])
+    assert run["summary"]["latency"]["pool_wait_s"]["p90"] > 0.03
+    report = (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+    assert "| Connection pool wait (s) |" in report
+    assert f"- Connections (`{server.base_url}`): 6 request(s) over 1 new connection(s)" in report
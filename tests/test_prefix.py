@@ -0,0 +1,102 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.packs import PackValidationError, open_pack
+from harness.prefix import PrefixSchedule, prefix_order, request_key, shared_chars, task_request
+
+SYSTEM = "You are a careful assistant. " * 20
+
+
+def test_task_request_renders_pack_prefix_and_prefix_order_groups_shared_prefixes():
+    plain = {"id": "a", "prompt": "hi"}
+    assert task_request(plain) == "hi"
+
+    shot = [{"user": "2+2?", "assistant": "4"}]
+    tasks = [
+        {"id": "x1", "prompt": "q1", "system": SYSTEM},
+        {"id": "y1", "prompt": "q2", "system": "Other."},
+        {"id": "x2", "prompt": "q3", "system": SYSTEM, "few_shot": shot},
+        {"id": "x3", "prompt": "q4", "system": SYSTEM},
+    ]
+    assert task_request(tasks[2]) == [
+        {"role": "system", "content": SYSTEM},
+        {"role": "user", "content": "2+2?"},
+        {"role": "assistant", "content": "4"},
+        {"role": "user", "content": "q3"},
+    ]
+    keys = [request_key(task) for task in tasks]
+    assert shared_chars(keys[0], keys[3]) == len(SYSTEM) + 1
+    assert [tasks[position]["id"] for position in prefix_order(keys)] == ["y1", "x2", "x1", "x3"]
+
+
+def test_prefix_schedule_estimates_time_saved_from_measured_ttft():
+    tasks = [{"id": f"t{n}", "prompt": f"q{n}", "system": SYSTEM if n % 2 else "Short."} for n in range(6)]
+    schedule = PrefixSchedule(tasks)
+    assert (schedule.file_warm, sum(schedule.warm.values())) == (0, 2)
+
+    results = [
+        {"task_id": task_id, "latency": {"ttft_s": 0.2 if warm else 1.2}} for task_id, warm in schedule.warm.items()
+    ]
+    summary = schedule.summary(results)
+    assert (summary["warm_ttft_p50_s"], summary["cold_ttft_p50_s"]) == (0.2, 1.2)
+    assert summary["estimated_saved_s"] == 2.0
+
+
+def test_pack_level_prefix_is_validated_and_applied(tmp_path):
+    pack_path = tmp_path / "pack.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "prefixed",
+                "system": SYSTEM,
+                "few_shot": [{"user": "Say A", "assistant": "A"}],
+                "tasks": [
+                    {"id": "a", "type": "exact_match", "prompt": "Say B", "expected": "B"},
+                    {"id": "b", "type": "exact_match", "prompt": "Say C", "expected": "C", "system": "Own."},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    first, second = open_pack(pack_path)
+    assert first["system"] == SYSTEM and first["few_shot"][0]["assistant"] == "A"
+    assert second["system"] == "Own."
+
+    pack_path.write_text(json.dumps({"few_shot": ["nope"], "tasks": [{"id": "a", "type": "judge", "prompt": "p"}]}), encoding="utf-8")
+    with pytest.raises(PackValidationError, match="few_shot"):
+        open_pack(pack_path)
+
+
+def test_cmd_run_prefix_order_sends_grouped_messages(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.jsonl"
+    lines = [{"name": "prefixed", "system": SYSTEM}]
+    for n in range(4):
+        task = {"id": f"t{n}", "type": "exact_match", "prompt": f"Say {n}", "expected": str(n)}
+        if n % 2:
+            task["system"] = "Other."
+        lines.append(task)
+    pack_path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+    sent = []
+
+    def create(model, messages, stream=False, stream_options=None, **params):
+        sent.append(messages)
+        delta = SimpleNamespace(content=messages[-1]["content"].split()[-1])
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: fake)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache", "--order", "prefix"]))
+
+    assert [messages[-1]["content"] for messages in sent] == ["Say 1", "Say 3", "Say 0", "Say 2"]
+    assert sent[2][0] == {"role": "system", "content": SYSTEM}
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["summary"]["passed"] == 4
+    assert (run_data["prefix_schedule"]["warm_tasks"], run_data["prefix_schedule"]["warm_tasks_file_order"]) == (1, 0)
+    assert "## Prefix Scheduling" in (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
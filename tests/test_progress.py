@@ -0,0 +1,76 @@
+import io
+import json
+import urllib.request
+
+from harness import cli
+from harness.progress import MetricsServer, ProgressDisplay, RunProgress, prometheus_text, render_progress
+
+
+def test_progress_snapshot_rates_eta_and_rendering():
+    now = [0.0]
+    progress = RunProgress(10, done=2, clock=lambda: now[0], run_id="r1")
+    progress.begin()
+    progress.begin()
+    progress.end()
+    for ok, wall in ((True, 1.0), (False, 3.0), (True, 2.0), (True, None)):
+        progress.add({"pass": ok, "latency": {"wall_s": wall} if wall else None})
+    now[0] = 2.0
+
+    snapshot = progress.snapshot()
+    assert (snapshot["completed"], snapshot["in_flight"], snapshot["pass_rate"]) == (6, 1, 0.75)
+    assert (snapshot["tasks_per_s"], snapshot["eta_s"], snapshot["wall_s"]["p50"]) == (2.0, 2.0, 2.0)
+    assert render_progress(snapshot) == (
+        "[ 6/10] 60% | 1 in flight | pass 75.0% | 2.0 task/s | ETA 2.0s | p50 2.0s p99 3.0s"
+    )
+
+    text = prometheus_text(snapshot, {"run_id": "r1"})
+    assert 'harness_tasks_completed_total{run_id="r1"} 6' in text
+    assert 'harness_task_wall_seconds{run_id="r1",quantile="0.99"} 2.98' in text
+    assert "# TYPE harness_requests_in_flight gauge" in text
+
+
+def test_display_echoes_above_status_and_metrics_server_serves_counters(tmp_path):
+    progress = RunProgress(4, run_id="r1", model="m")
+    progress.add({"pass": False})
+    stream = io.StringIO()
+    stream.isatty = lambda: True
+    snapshot_file = tmp_path / "progress.json"
+    with ProgressDisplay(progress, interval=60, stream=stream, snapshot_file=snapshot_file) as display:
+        display.refresh()
+        display.echo("t0: FAIL")
+    assert stream.getvalue().count("\r\x1b[K[1/4] 25%") == 2
+    assert "\r\x1b[Kt0: FAIL\n[1/4]" in stream.getvalue()
+    assert json.loads(snapshot_file.read_text(encoding="utf-8"))["failed"] == 1
+
+    server = MetricsServer(progress, port=0)
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.close()
+    assert 'harness_tasks_failed_total{run_id="r1",model="m"} 1' in body
+
+
+def test_cmd_run_writes_progress_snapshot(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": "Reply READY", "expected": "READY"} for n in range(3)]
+    pack_path.write_text(json.dumps({"name": "live", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: "READY")
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+    snapshot_file = tmp_path / "progress.json"
+    args = cli.build_parser().parse_args(
+        ["run", "--pack", str(pack_path), "--no-cache", "--progress-file", str(snapshot_file)]
+    )
+    cli.cmd_run(args)
+
+    snapshot = json.loads(snapshot_file.read_text(encoding="utf-8"))
+    assert (snapshot["run_id"], snapshot["completed"], snapshot["passed"], snapshot["in_flight"]) == (
+        "20260418-210101",
+        3,
+        3,
+        0,
+    )
+    assert "t0: PASS" in capsys.readouterr().out
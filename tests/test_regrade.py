@@ -0,0 +1,174 @@
+import json
+
+import pytest
+
+from harness import cli
+from harness.store import RunStore
+
+
+def write_source_run(runs_dir, pack_path):
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    run_file = runs_dir / "run_20260418-210101.json"
+    run_file.write_text(
+        json.dumps(
+            {
+                "run_id": "20260418-210101",
+                "model": "test-model",
+                "base_url": "http://localhost:1234/v1",
+                "pack": {"name": "smoke", "description": "", "path": pack_path.as_posix()},
+                "summary": {"passed": 1, "total": 3},
+                "results": [
+                    {
+                        "task_id": "ready",
+                        "type": "exact_match",
+                        "prompt": "Reply with exactly: READY",
+                        "output": "READY.",
+                        "pass": False,
+                        "detail": {"expected": "READY", "got": "READY."},
+                    },
+                    {
+                        "task_id": "explain",
+                        "type": "judge",
+                        "prompt": "Explain evals.",
+                        "output": "Evals check models.",
+                        "pass": True,
+                        "detail": {"scores": {"overall": 5}},
+                    },
+                    {
+                        "task_id": "explain_more",
+                        "type": "judge",
+                        "prompt": "Explain evals briefly.",
+                        "output": "They test.",
+                        "pass": False,
+                        "detail": {"scores": {"overall": 2}},
+                    },
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return run_file
+
+
+@pytest.mark.parametrize("extra", [[], ["--grade-workers", "2"]])
+def test_cmd_regrade_uses_stored_outputs_and_reuses_judge_scores(tmp_path, monkeypatch, capsys, extra):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Reply with exactly: READY", "expected": "READY."},
+                    {"id": "explain", "type": "judge", "prompt": "Explain evals."},
+                    {"id": "explain_more", "type": "judge", "prompt": "Explain evals in one line."},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    source_file = write_source_run(runs_dir, pack_path)
+
+    judged = []
+
+    def fake_judge(client, model, prompt, answer):
+        judged.append((model, prompt, answer))
+        return {"overall": 4}
+
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: object())
+    monkeypatch.setattr(cli, "judge", fake_judge)
+    monkeypatch.setattr(cli, "chat", lambda *args: (_ for _ in ()).throw(AssertionError("model must not be called")))
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+
+    cli.cmd_regrade(cli.build_parser().parse_args(["regrade", "--run", str(source_file), "--no-cache", *extra]))
+
+    out = capsys.readouterr().out
+    assert "ready: PASS (was FAIL)" in out
+    assert "explain_more: PASS (was FAIL)" in out
+    assert "1 task prompt(s) changed" in out
+    assert judged == [("test-model", "Explain evals in one line.", "They test.")]
+
+    regraded = json.loads((runs_dir / "run_20260418-220000.json").read_text(encoding="utf-8"))
+    assert regraded["source_run"] == "20260418-210101"
+    assert regraded["summary"] == {"passed": 3, "total": 3}
+    assert [result["output"] for result in regraded["results"]] == ["READY.", "Evals check models.", "They test."]
+
+    report = (runs_dir / "report_20260418-220000.md").read_text(encoding="utf-8")
+    assert "Regraded From: `20260418-210101`" in report
+
+    with RunStore(runs_dir / "index.sqlite") as store:
+        assert store.recent(1)[0]["source_run"] == "20260418-210101"
+
+
+def test_cmd_regrade_is_offline_without_changed_judge_inputs(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "ready", "type": "exact_match", "prompt": "Reply with exactly: READY", "expected": "READY"},
+                    {"id": "explain", "type": "judge", "prompt": "Explain evals."},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    write_source_run(runs_dir, pack_path)
+
+    def no_client(**kwargs):
+        raise AssertionError("no client should be created")
+
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", no_client)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+
+    cli.cmd_regrade(cli.build_parser().parse_args(["regrade", "--run", "20260418-210101"]))
+
+    out = capsys.readouterr().out
+    assert "(offline)" in out
+    assert "Skipped 1 result(s)" in out
+    regraded = json.loads((runs_dir / "run_20260418-220000.json").read_text(encoding="utf-8"))
+    assert regraded["summary"] == {"passed": 1, "total": 2}
+    assert regraded["cache"] == {"mode": "off"}
+
+
+def test_cmd_regrade_judges_with_the_runs_recorded_judge(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "smoke.json"
+    pack_path.write_text(
+        json.dumps(
+            {
+                "name": "smoke",
+                "tasks": [
+                    {"id": "explain", "type": "judge", "prompt": "Explain evals."},
+                    {"id": "explain_more", "type": "judge", "prompt": "Explain evals in one line."},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    source_file = write_source_run(runs_dir, pack_path)
+    source = json.loads(source_file.read_text(encoding="utf-8"))
+    source["judge"] = {"model": "judge-model", "base_url": "http://judge:8000/v1", "batch_size": 1}
+    source_file.write_text(json.dumps(source), encoding="utf-8")
+
+    clients, judged = [], []
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: clients.append(kwargs["base_url"]) or object())
+    monkeypatch.setattr(cli, "judge", lambda client, model, prompt, answer: judged.append(model) or {"overall": 4})
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+
+    cli.cmd_regrade(cli.build_parser().parse_args(["regrade", "--run", "20260418-210101", "--no-cache"]))
+    # Only the changed prompt is re-judged, by the judge the run recorded.
+    assert (clients, judged) == (["http://judge:8000/v1"], ["judge-model"])
+    regraded = json.loads((runs_dir / "run_20260418-220000.json").read_text(encoding="utf-8"))
+    assert regraded["judge"] == source["judge"]
+
+    clients.clear()
+    judged.clear()
+    argv = ["regrade", "--run", "20260418-210101", "--no-cache", "--model", "other-judge"]
+    cli.cmd_regrade(cli.build_parser().parse_args(argv))
+    assert (clients, judged) == (["http://judge:8000/v1"], ["other-judge", "other-judge"])
@@ -0,0 +1,54 @@
+from harness import cli
+
+
+def _run_data(count, output="o"):
+    results = [
+        {
+            "task_id": f"t{n}",
+            "type": "exact_match",
+            "prompt": f"prompt {n}",
+            "output": output,
+            "pass": n % 3 != 0,
+            "detail": {"expected": "o"},
+        }
+        for n in range(count)
+    ]
+    return {
+        "run_id": "r1",
+        "model": "m",
+        "base_url": "u",
+        "pack": {"name": "p", "path": "p.json"},
+        "summary": {"passed": sum(result["pass"] for result in results), "total": count},
+        "results": results,
+    }
+
+
+def test_report_elides_long_blocks_and_can_show_failures_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "RUNS_DIR", tmp_path)
+    long_output = "a" * 50 + "b" * 50
+    report = cli.write_markdown_report(_run_data(4, long_output), {**cli.DEFAULT_REPORT, "max_chars": 20})
+    text = report.read_text(encoding="utf-8")
+    assert "aaaaaaaaaa\n... [80 chars elided] ...\nbbbbbbbbbb" in text
+    assert "### t1 [PASS]" in text
+
+    settings = cli.report_settings(
+        cli.build_parser().parse_args(["run", "--report-details", "failures", "--report-max-chars", "0"])
+    )
+    text = cli.write_markdown_report(_run_data(4, long_output), settings).read_text(encoding="utf-8")
+    assert "- Task Details: failing tasks only" in text
+    assert "| `t1` | `exact_match` | **PASS** |" in text
+    assert [line for line in text.splitlines() if line.startswith("### ")] == ["### t0 [FAIL]", "### t3 [FAIL]"]
+    assert long_output in text
+
+
+def test_report_pages_task_details(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "RUNS_DIR", tmp_path)
+    report = cli.write_markdown_report(_run_data(5), {**cli.DEFAULT_REPORT, "page_size": 2})
+    text = report.read_text(encoding="utf-8")
+    assert "### t0" not in text
+    assert "- [Page 1](report_r1_p001.md): `t0` to `t1` (2 task(s), 1 failing)" in text
+    assert "- [Page 3](report_r1_p003.md): `t4` to `t4` (1 task(s), 0 failing)" in text
+    page = (tmp_path / "report_r1_p002.md").read_text(encoding="utf-8")
+    assert page.startswith("# Task Details: `r1`, page 2\n\n[Back to the report](report_r1.md)\n")
+    assert "### t2 [PASS]" in page and "### t3 [FAIL]" in page
+    assert not (tmp_path / "report_r1_p004.md").exists()
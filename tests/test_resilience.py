@@ -0,0 +1,182 @@
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli, resilience
+from harness.resilience import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RequestFailed,
+    ResilientClient,
+    error_kind,
+    task_scope,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+class FlakyClient:
+    """Raises the scripted errors in order, then answers every call."""
+
+    def __init__(self, errors, answer="READY"):
+        self.errors = list(errors)
+        self.answer = answer
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream=False, stream_options=None, **params):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        delta = SimpleNamespace(content=self.answer)
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)])
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+
+
+def _create(client, **params):
+    return list(client.chat.completions.create(model="m", messages=[], stream=True, **params))
+
+
+def test_error_kind_separates_retryable_failures():
+    assert error_kind(StatusError(429)) == "overload"
+    assert error_kind(StatusError(503)) == "overload"
+    assert error_kind(StatusError(500)) == "server"
+    assert error_kind(StatusError(400)) is None
+    assert error_kind(APITimeoutError()) == "timeout"
+    assert error_kind(ConnectionResetError()) == "connection"
+    assert error_kind(KeyError("x")) is None
+
+
+def test_retries_transient_errors_and_records_events():
+    flaky = FlakyClient([StatusError(503), APITimeoutError()])
+    client = ResilientClient(flaky, "http://gpu", rng=random.Random(0))
+    with task_scope("task_1"):
+        chunks = _create(client)
+
+    assert chunks[0].choices[0].delta.content == "READY"
+    stats = client.stats()
+    assert (stats["calls"], stats["retries"], stats["gave_up"]) == (1, 2, 0)
+    assert [(event["event"], event["task_id"], event["kind"]) for event in stats["events"]] == [
+        ("retry", "task_1", "overload"),
+        ("retry", "task_1", "timeout"),
+    ]
+
+
+def test_client_errors_are_not_retried_and_retry_budget_is_bounded():
+    flaky = FlakyClient([StatusError(400)])
+    client = ResilientClient(flaky, "http://gpu", limiter=AdaptiveLimiter(8))
+    client.limiter.limit = 2.0
+    with pytest.raises(StatusError):
+        _create(client)
+    assert flaky.calls == 1
+    # A rejected request is no sign of spare capacity.
+    assert (client.limiter.limit, client.limiter.in_flight) == (2, 0)
+
+    flaky = FlakyClient([StatusError(500)] * 3)
+    client = ResilientClient(flaky, "http://gpu", max_retries=2, breaker=CircuitBreaker(threshold=10))
+    with pytest.raises(RequestFailed, match="after 3 attempt"):
+        _create(client)
+    assert client.stats()["gave_up"] == 1
+
+
+def _broken_stream(chunks_before_error):
+    delta = SimpleNamespace(content="RE")
+    for _ in range(chunks_before_error):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+    raise ConnectionResetError("peer closed connection without sending complete message body")
+
+
+def test_stream_failures_retry_before_first_chunk_and_fail_the_task_after():
+    streams = [_broken_stream(0), _broken_stream(1)]
+    flaky = FlakyClient([])
+    flaky.create = lambda **params: streams.pop(0)
+    flaky.chat.completions.create = flaky.create
+    breaker = CircuitBreaker(threshold=10)
+    client = ResilientClient(flaky, "http://gpu", breaker=breaker, limiter=AdaptiveLimiter(2))
+
+    task = {"id": "t1", "type": "exact_match", "prompt": "Say READY", "expected": "READY"}
+    result = cli.run_task(task, client, "m")
+
+    assert result["pass"] is False
+    assert result["detail"]["error"].startswith("connection error while the response was streaming")
+    stats = client.stats()
+    assert (stats["retries"], stats["gave_up"]) == (1, 1)
+    assert [event["event"] for event in stats["events"]] == ["retry", "stream_failed"]
+    assert breaker.failures == 1
+    assert client.limiter.in_flight == 0
+
+
+def test_circuit_breaker_opens_and_fails_fast():
+    flaky = FlakyClient([ConnectionResetError()] * 10)
+    client = ResilientClient(flaky, "http://gpu", max_retries=10, breaker=CircuitBreaker(threshold=3, cooldown=60))
+    with pytest.raises(CircuitOpenError):
+        _create(client)
+    assert flaky.calls == 3
+
+    with pytest.raises(CircuitOpenError):
+        _create(client)
+    assert flaky.calls == 3
+    assert client.stats()["circuit_opens"] == 1
+
+
+def test_task_deadline_stops_retries():
+    flaky = FlakyClient([StatusError(503)] * 5)
+    client = ResilientClient(flaky, "http://gpu", base_delay=10.0, max_delay=10.0, rng=random.Random(1))
+    with task_scope("slow_task", deadline_s=0.5), pytest.raises(DeadlineExceeded):
+        _create(client)
+    assert client.stats()["deadlines"] == 1
+
+
+def test_adaptive_limiter_halves_on_overload_and_grows_back():
+    limiter = AdaptiveLimiter(8, interval=60)
+    for _ in range(2):
+        limiter.acquire()
+    assert limiter.release(overloaded=True)
+    assert not limiter.release(overloaded=True)
+    assert limiter.limit == 4.0
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release()
+    assert 4.0 < limiter.limit <= 8
+    assert limiter.lowest == 4.0
+
+
+def test_cmd_run_survives_a_blip_and_stops_resumably_when_the_server_is_down(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": f"t{n}", "type": "exact_match", "prompt": "Reply READY", "expected": "READY"} for n in range(3)]
+    pack_path.write_text(json.dumps({"name": "flaky", "tasks": tasks}), encoding="utf-8")
+
+    flaky = FlakyClient([StatusError(503)])
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: flaky)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+    cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache", "--concurrency", "2"]))
+
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["summary"]["passed"] == 3
+    guard = run_data["resilience"][0]
+    assert (guard["retries"], guard["throttles"], guard["limit"]["lowest"]) == (1, 1, 1.0)
+    assert "1 retries, 1 throttle(s)" in (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+
+    flaky.errors = [ConnectionResetError()] * 20
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210202")
+    with pytest.raises(SystemExit, match="resume with: harness run --resume 20260418-210202"):
+        cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--no-cache"]))
@@ -1,7 +1,9 @@
-import argparse
 import json
+import threading
+import time
 
 from harness import cli
+from harness.store import RunStore
 
 
 class DummyClient:
@@ -45,11 +47,18 @@ def test_cmd_run_writes_json_report_and_index(tmp_path, monkeypatch, capsys):
     monkeypatch.setattr(cli, "chat", lambda client, model, prompt: responses[prompt])
     monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
 
-    args = argparse.Namespace(
-        base_url="http://localhost:1234/v1",
-        model="test-model",
-        api_key="lm-studio",
-        pack=str(pack_path),
+    args = cli.build_parser().parse_args(
+        [
+            "run",
+            "--base-url",
+            "http://localhost:1234/v1",
+            "--model",
+            "test-model",
+            "--api-key",
+            "lm-studio",
+            "--pack",
+            str(pack_path),
+        ]
     )
 
     cli.cmd_run(args)
@@ -61,7 +70,7 @@ def test_cmd_run_writes_json_report_and_index(tmp_path, monkeypatch, capsys):
 
     run_path = runs_dir / "run_20260418-210101.json"
     report_path = runs_dir / "report_20260418-210101.md"
-    index_path = runs_dir / "index.json"
+    index_path = runs_dir / "index.sqlite"
 
     assert run_path.exists()
     assert report_path.exists()
@@ -76,6 +85,74 @@ def test_cmd_run_writes_json_report_and_index(tmp_path, monkeypatch, capsys):
     assert "| `reply_exactly_ready` | `exact_match` | **PASS** |" in report
     assert "Pack Description: Small deterministic smoke pack." in report
 
-    index = json.loads(index_path.read_text(encoding="utf-8"))
-    assert index["runs"][0]["pack_name"] == "smoke"
-    assert index["runs"][0]["score"] == 1.0
+    with RunStore(index_path) as store:
+        entry = store.get("20260418-210101")
+    assert entry["pack_name"] == "smoke"
+    assert entry["score"] == 1.0
+
+
+def test_cmd_run_concurrent_keeps_pack_order(tmp_path, monkeypatch, capsys):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "wide.json"
+    tasks = [
+        {"id": f"task_{i}", "type": "exact_match", "prompt": f"Reply with exactly: {i}", "expected": str(i)}
+        for i in range(8)
+    ]
+    pack_path.write_text(json.dumps({"name": "wide", "tasks": tasks}), encoding="utf-8")
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_chat(client, model, prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later tasks answer first so completion order differs from pack order.
+        number = int(prompt.rsplit(" ", 1)[1])
+        time.sleep(0.01 * (8 - number))
+        with lock:
+            in_flight -= 1
+        return str(number)
+
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: DummyClient())
+    monkeypatch.setattr(cli, "chat", fake_chat)
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+
+    args = cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--concurrency", "4"])
+    cli.cmd_run(args)
+
+    out = capsys.readouterr().out
+    assert "(concurrency 4)" in out
+    assert out.index("task_3: PASS") < out.index("task_0: PASS")
+    assert 1 < peak <= 4
+
+    run_data = json.loads((runs_dir / "run_20260418-220000.json").read_text(encoding="utf-8"))
+    assert [result["task_id"] for result in run_data["results"]] == [task["id"] for task in tasks]
+    assert run_data["summary"] == {"passed": 8, "total": 8}
+
+
+def test_cmd_run_streams_selected_slice_of_jsonl_pack(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "big.jsonl"
+    lines = [json.dumps({"name": "big"})]
+    lines.extend(
+        json.dumps({"id": f"t{i}", "type": "exact_match", "prompt": f"Say {i}", "expected": str(i)}) for i in range(100)
+    )
+    pack_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    asked = []
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: DummyClient())
+    monkeypatch.setattr(cli, "chat", lambda client, model, prompt: asked.append(prompt) or prompt.split()[-1])
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-230000")
+
+    args = cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--offset", "90", "--limit", "5"])
+    cli.cmd_run(args)
+
+    assert asked == [f"Say {i}" for i in range(90, 95)]
+    run_data = json.loads((runs_dir / "run_20260418-230000.json").read_text(encoding="utf-8"))
+    assert run_data["selection"] == {"offset": 90, "limit": 5, "sample": None, "seed": 0, "shard": 0, "shards": 1}
+    assert run_data["summary"] == {"passed": 5, "total": 5}
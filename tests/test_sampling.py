@@ -0,0 +1,139 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from harness import cli
+from harness.metrics import record_calls
+from harness.sampling import Sampler, SamplingStats, pass_at_k, wilson_interval
+
+
+def test_pass_at_k_matches_closed_form():
+    assert pass_at_k(5, 0, 1) == 0.0
+    assert pass_at_k(5, 5, 3) == 1.0
+    assert pass_at_k(5, 1, 1) == pytest.approx(0.2)
+    assert pass_at_k(5, 1, 5) == 1.0
+    assert pass_at_k(4, 2, 2) == pytest.approx(1 - 1 / 6)
+
+
+def test_wilson_interval_brackets_rate():
+    low, high = wilson_interval(3, 4)
+    assert 0.3 < low < 0.75 < high < 1.0
+    assert wilson_interval(0, 10)[0] == 0.0
+
+
+def test_sampling_stats_aggregates_pass_rates():
+    stats = SamplingStats()
+    for passes in ([True] * 4, [False] * 4, [True, False, False, False]):
+        stats.add({"samples": [{"pass": ok} for ok in passes]})
+    stats.add({"pass": True})
+
+    summary = stats.summary()
+    assert summary["tasks"] == 3
+    assert summary["samples"] == 4
+    assert summary["pass@1"] == pytest.approx((1 + 0 + 0.25) / 3, abs=1e-4)
+    assert summary["pass@4"] == pytest.approx(2 / 3, abs=1e-4)
+    assert summary["pass@1_ci95"][0] < summary["pass@1"] < summary["pass@1_ci95"][1]
+    assert (summary["always_pass"], summary["never_pass"], summary["flaky"]) == (1, 1, 1)
+    assert SamplingStats().summary() is None
+
+
+class ChoicesClient:
+    """Answers with ``served`` choices per request, whatever ``n`` asks for."""
+
+    def __init__(self, served):
+        self.served = served
+        self.requests = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream, stream_options, n=1, **params):
+        with self.lock:
+            self.requests.append({"n": n, **params})
+            count = len(self.requests)
+        choices = [
+            SimpleNamespace(index=i, delta=SimpleNamespace(content=f"answer {count}.{i}"))
+            for i in range(min(n, self.served))
+        ]
+        return iter([SimpleNamespace(choices=choices, usage=None)])
+
+
+def test_sampler_uses_n_and_falls_back_to_parallel_requests():
+    client = ChoicesClient(served=3)
+    sampler = Sampler(client, "m", samples=3, temperature=0.7)
+    assert sampler.outputs("hi") == ["answer 1.0", "answer 1.1", "answer 1.2"]
+    assert sampler.supports_n
+
+    client = ChoicesClient(served=1)
+    sampler = Sampler(client, "m", samples=3, temperature=0.7)
+    with record_calls() as calls:
+        outputs = sampler.outputs("hi")
+    assert len(outputs) == 3
+    assert sampler.supports_n is False
+    assert len(calls) == 3
+    assert all(request["temperature"] == 0.7 for request in client.requests)
+
+    sampler.outputs("again")
+    assert [request["n"] for request in client.requests[3:]] == [1, 1, 1]
+
+
+def test_cmd_run_with_samples_reports_pass_at_k(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [
+        {"id": "stable", "type": "contains", "prompt": "stable", "expected_contains": ["answer"]},
+        {"id": "flaky", "type": "contains", "prompt": "flaky", "expected_contains": [".1"]},
+    ]
+    pack_path.write_text(json.dumps({"name": "sampled", "tasks": tasks}), encoding="utf-8")
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: ChoicesClient(served=4))
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-210101")
+
+    args = cli.build_parser().parse_args(
+        ["run", "--pack", str(pack_path), "--no-cache", "--samples", "4", "--temperature", "0.8"]
+    )
+    cli.cmd_run(args)
+
+    run_data = json.loads((runs_dir / "run_20260418-210101.json").read_text(encoding="utf-8"))
+    assert run_data["sampling"] == {"samples": 4, "temperature": 0.8}
+    flaky = run_data["results"][1]
+    assert flaky["sampling"]["passed"] == 1
+    assert flaky["pass"] is False
+    assert len(flaky["samples"]) == 4
+    sampling = run_data["summary"]["sampling"]
+    assert sampling["pass@1"] == pytest.approx(0.625)
+    assert sampling["pass@4"] == 1.0
+    assert sampling["flaky"] == 1
+
+    report = (runs_dir / "report_20260418-210101.md").read_text(encoding="utf-8")
+    assert "## Sampling" in report
+    assert "| `flaky` | `contains` | **FAIL** (1/4) |" in report
+    assert "| `flaky` | 1/4 | 25.0% |" in report
+
+    monkeypatch.setattr(cli.time, "strftime", lambda fmt: "20260418-220000")
+    cli.cmd_regrade(cli.build_parser().parse_args(["regrade", "--run", "20260418-210101"]))
+    regraded = json.loads((runs_dir / "run_20260418-220000.json").read_text(encoding="utf-8"))
+    assert regraded["results"][1]["sampling"] == flaky["sampling"]
+    assert regraded["summary"]["sampling"]["pass@1"] == sampling["pass@1"]
+
+
+def test_cmd_run_samples_skip_the_response_cache(tmp_path, monkeypatch):
+    runs_dir = tmp_path / "runs"
+    pack_path = tmp_path / "pack.json"
+    tasks = [{"id": "t1", "type": "contains", "prompt": "go", "expected_contains": ["answer"]}]
+    pack_path.write_text(json.dumps({"name": "sampled", "tasks": tasks}), encoding="utf-8")
+    server = ChoicesClient(served=1)
+    monkeypatch.setattr(cli, "RUNS_DIR", runs_dir)
+    monkeypatch.setattr(cli, "OpenAI", lambda **kwargs: server)
+
+    outputs = []
+    for run_id in ("20260418-210101", "20260418-210102"):
+        monkeypatch.setattr(cli.time, "strftime", lambda fmt, run_id=run_id: run_id)
+        cli.cmd_run(cli.build_parser().parse_args(["run", "--pack", str(pack_path), "--samples", "3"]))
+        run = json.loads((runs_dir / f"run_{run_id}.json").read_text(encoding="utf-8"))
+        outputs.append(sorted(sample["output"] for sample in run["results"][0]["samples"]))
+
+    # Temperature 0 by default: every sample is still a fresh request, on the rerun too.
+    assert len(server.requests) == 6
+    assert len(set(outputs[0] + outputs[1])) == 6
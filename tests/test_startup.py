@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from harness import cli
+
+SRC_DIR = Path(cli.__file__).resolve().parents[1]
+BASIC_PACK = SRC_DIR.parent / "evals" / "basic.json"
+# Modules only the commands that call a model may import: the OpenAI SDK and its HTTP/validation stack.
+CLIENT_MODULES = ("openai", "httpx", "pydantic")
+# Import time of the whole CLI under ``-X importtime``; importing the client stack alone costs several times this.
+STARTUP_BUDGET_S = 0.5
+
+
+def _subcommands() -> list[str]:
+    actions = [action for action in cli.build_parser()._actions if action.dest == "cmd"]
+    return sorted(actions[0].choices)
+
+
+def _imports(args: list[str], cwd: Path) -> tuple[set[str], float]:
+    """Run ``python -X importtime -m harness ARGS``; return the top-level packages imported and total import seconds."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "harness", *args], cwd=cwd, env=env, capture_output=True, text=True
+    )
+    packages = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        total_us += int(self_us)
+        packages.add(name.strip().split(".")[0])
+    return packages, total_us / 1e6
+
+
+@pytest.mark.parametrize("command", _subcommands())
+def test_subcommand_help_starts_without_the_client_stack(command, tmp_path):
+    packages, seconds = _imports([command, "--help"], tmp_path)
+    assert not packages & set(CLIENT_MODULES), f"harness {command} --help imports {packages & set(CLIENT_MODULES)}"
+    assert seconds < STARTUP_BUDGET_S, f"harness {command} --help spent {seconds:.3f}s importing modules"
+
+
+@pytest.mark.parametrize("args", [["packs"], ["validate", "--pack", str(BASIC_PACK)], ["summary"]])
+def test_offline_subcommands_never_import_the_client_stack(args, tmp_path):
+    packages, seconds = _imports(args, tmp_path)
+    assert not packages & set(CLIENT_MODULES)
+    assert seconds < STARTUP_BUDGET_S
@@ -0,0 +1,76 @@
+import json
+import multiprocessing
+
+import pytest
+
+from harness import summary
+from harness.store import RunStore
+
+
+def _entry(run_id, model="m", pack_name="basic", passed=1, total=2):
+    return {"run_id": run_id, "model": model, "pack_name": pack_name, "passed": passed, "total": total}
+
+
+def test_insert_is_idempotent_and_recent_filters_newest_window(tmp_path):
+    with RunStore(tmp_path / "index.sqlite") as store:
+        assert store.insert(_entry("20260418-210101"))
+        assert not store.insert(_entry("20260418-210101", passed=2))
+        store.insert(_entry("20260418-210103", model="other"))
+        store.insert(_entry("20260418-210102", pack_name="release_gate"))
+        store.insert(_entry("20260418-210104"))
+
+        assert store.count() == 4
+        assert store.get("20260418-210101")["passed"] == 1
+        assert [run["run_id"] for run in store.recent(2)] == ["20260418-210103", "20260418-210104"]
+        assert [run["run_id"] for run in store.recent(5, model="m", pack_name="basic")] == [
+            "20260418-210101",
+            "20260418-210104",
+        ]
+
+
+def test_legacy_index_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "index.json"
+    legacy.write_text(json.dumps({"runs": [_entry("20260418-210101"), _entry("20260418-210102")]}), encoding="utf-8")
+
+    with RunStore(tmp_path / "index.sqlite") as store:
+        assert store.count() == 2
+        store.insert(_entry("20260418-210103"))
+
+    legacy.write_text(json.dumps({"runs": [_entry("20260418-210199")]}), encoding="utf-8")
+    with RunStore(tmp_path / "index.sqlite") as store:
+        assert store.count() == 3
+        assert store.import_index_json(legacy) == 1
+
+
+def _insert_many(path, worker):
+    with RunStore(path) as store:
+        for n in range(25):
+            store.insert(_entry(f"20260418-{worker:02d}{n:04d}"))
+
+
+def test_concurrent_processes_never_lose_entries(tmp_path):
+    path = tmp_path / "index.sqlite"
+    RunStore(path).close()
+    workers = [multiprocessing.Process(target=_insert_many, args=(path, worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    with RunStore(path) as store:
+        assert store.count() == 100
+
+
+def test_summary_main_reads_filtered_window(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit, match="No runs/index.sqlite found"):
+        summary.main()
+
+    with RunStore(tmp_path / "runs" / "index.sqlite") as store:
+        for n in range(6):
+            store.insert(_entry(f"20260418-21010{n}", model="a" if n % 2 else "b"))
+    summary.main(limit=2, model="a")
+
+    out = capsys.readouterr().out
+    assert "20260418-210105" in out and "20260418-210103" in out
+    assert "20260418-210101" not in out and "model=b" not in out
@@ -28,3 +28,21 @@ def test_render_summary_includes_latest_best_and_average():
     assert "Latest: 20260418-210422  score=4/5 (80.0%)" in output
     assert "Best (last 2): 20260418-210101  score=5/5 (100.0%)" in output
     assert "Avg (last 2): 0.900" in output
+
+
+def test_render_summary_shows_latency_headlines_when_recorded():
+    runs = [
+        {
+            "run_id": "20260418-210101",
+            "model": "model-a",
+            "passed": 5,
+            "total": 5,
+            "latency_p50_s": 1.234,
+            "ttft_p50_s": 0.2,
+            "tokens_per_s_p50": 48.25,
+        }
+    ]
+
+    output = render_summary(runs)
+
+    assert "model=model-a  p50=1.23s  ttft=0.20s  tok/s=48.2" in output